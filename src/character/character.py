@@ -6,7 +6,7 @@ Fowlerのリファクタリング手法を適用:
 - Replace Data Value with Object: 複雑なデータ構造をオブジェクト化
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 import uuid
@@ -107,6 +107,10 @@ class Character:
     # コンポーネントシステム
     _component_manager: Optional[ComponentManager] = field(default=None, init=False)
     
+    # 実効能力値キャッシュ（キーが変化した時のみ再計算）
+    _combat_values_cache: Optional[Tuple[BaseStats, int, int]] = field(default=None, init=False, repr=False, compare=False)
+    _combat_values_cache_key: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     # メタ情報
     created_at: datetime = field(default_factory=datetime.now)
     
@@ -402,6 +406,46 @@ class Character:
     
     def get_effective_stats(self) -> BaseStats:
         """装備ボーナスとステータス効果を含む実効能力値を取得"""
+        effective_stats, _, _ = self._get_cached_combat_values()
+        return replace(effective_stats)
+    
+    def get_attack_power(self) -> int:
+        """攻撃力を取得（装備ボーナス・ステータス効果含む）"""
+        _, attack_power, _ = self._get_cached_combat_values()
+        return attack_power
+    
+    def get_defense(self) -> int:
+        """防御力を取得（装備ボーナス・ステータス効果含む）"""
+        _, _, defense = self._get_cached_combat_values()
+        return defense
+    
+    def _get_cached_combat_values(self) -> Tuple[BaseStats, int, int]:
+        """実効能力値・攻撃力・防御力をキャッシュから取得
+        
+        基本能力値・レベル・職業・装備と状態効果のバージョンをキーとし、
+        いずれかが変化した場合のみ再計算する。
+        """
+        equipment = self.get_equipment() if self._equipment_initialized else None
+        status_effects = self.get_status_effects() if self._status_effects_initialized else None
+        stats = self.base_stats
+        cache_key = (
+            stats.strength, stats.agility, stats.intelligence, stats.faith, stats.luck,
+            self.experience.level, self.character_class,
+            equipment, equipment.version if equipment else None,
+            status_effects, status_effects.version if status_effects else None
+        )
+        
+        if self._combat_values_cache is None or self._combat_values_cache_key != cache_key:
+            self._combat_values_cache = self._calculate_combat_values(equipment, status_effects)
+            self._combat_values_cache_key = cache_key
+        
+        return self._combat_values_cache
+    
+    def _calculate_combat_values(self, equipment, status_effects) -> Tuple[BaseStats, int, int]:
+        """実効能力値・攻撃力・防御力を計算（キャッシュなし）"""
+        bonus = equipment.total_bonus if equipment else None
+        modifiers = status_effects.get_stat_modifiers() if status_effects else {}
+        
         effective_stats = BaseStats(
             strength=self.base_stats.strength,
             agility=self.base_stats.agility,
@@ -411,67 +455,25 @@ class Character:
         )
         
         # 装備ボーナスを追加
-        if self._equipment_initialized:
-            equipment = self.get_equipment()
-            if equipment:
-                bonus = equipment.calculate_equipment_bonus()
-                effective_stats.strength += bonus.strength
-                effective_stats.agility += bonus.agility
-                effective_stats.intelligence += bonus.intelligence
-                effective_stats.faith += bonus.faith
-                effective_stats.luck += bonus.luck
+        if bonus:
+            effective_stats.strength += bonus.strength
+            effective_stats.agility += bonus.agility
+            effective_stats.intelligence += bonus.intelligence
+            effective_stats.faith += bonus.faith
+            effective_stats.luck += bonus.luck
         
         # ステータス効果による修正値を追加
-        if self._status_effects_initialized:
-            status_effects = self.get_status_effects()
-            modifiers = status_effects.get_stat_modifiers()
-            effective_stats.strength += modifiers.get('strength', 0)
-            effective_stats.agility += modifiers.get('agility', 0)
-            effective_stats.intelligence += modifiers.get('intelligence', 0)
-            effective_stats.faith += modifiers.get('faith', 0)
-            effective_stats.luck += modifiers.get('luck', 0)
+        effective_stats.strength += modifiers.get('strength', 0)
+        effective_stats.agility += modifiers.get('agility', 0)
+        effective_stats.intelligence += modifiers.get('intelligence', 0)
+        effective_stats.faith += modifiers.get('faith', 0)
+        effective_stats.luck += modifiers.get('luck', 0)
         
-        return effective_stats
-    
-    def get_attack_power(self) -> int:
-        """攻撃力を取得（装備ボーナス・ステータス効果含む）"""
-        base_attack = self.base_stats.strength  # 基本攻撃力は力に依存
+        # 基本攻撃力は力に依存、基本防御力は力の半分（Wizardryスタイル）
+        attack_power = self.base_stats.strength + (bonus.attack_power if bonus else 0) + modifiers.get('attack', 0)
+        defense = self.base_stats.strength // 2 + (bonus.defense if bonus else 0) + modifiers.get('defense', 0)
         
-        equipment_bonus = 0
-        if self._equipment_initialized:
-            equipment = self.get_equipment()
-            if equipment:
-                bonus = equipment.calculate_equipment_bonus()
-                equipment_bonus = bonus.attack_power
-        
-        # ステータス効果による攻撃力修正
-        status_bonus = 0
-        if self._status_effects_initialized:
-            status_effects = self.get_status_effects()
-            modifiers = status_effects.get_stat_modifiers()
-            status_bonus = modifiers.get('attack', 0)
-        
-        return base_attack + equipment_bonus + status_bonus
-    
-    def get_defense(self) -> int:
-        """防御力を取得（装備ボーナス・ステータス効果含む）"""
-        base_defense = self.base_stats.strength // 2  # 基本防御力は力の半分（Wizardryスタイル）
-        
-        equipment_bonus = 0
-        if self._equipment_initialized:
-            equipment = self.get_equipment()
-            if equipment:
-                bonus = equipment.calculate_equipment_bonus()
-                equipment_bonus = bonus.defense
-        
-        # ステータス効果による防御力修正
-        status_bonus = 0
-        if self._status_effects_initialized:
-            status_effects = self.get_status_effects()
-            modifiers = status_effects.get_stat_modifiers()
-            status_bonus = modifiers.get('defense', 0)
-        
-        return base_defense + equipment_bonus + status_bonus
+        return effective_stats, attack_power, defense
     
     def take_damage(self, amount: int) -> int:
         """ダメージを受ける"""
@@ -29,6 +29,10 @@ class ComponentData:
     component_type: ComponentType
     initialized: bool = False
     
+    def __post_init__(self):
+        """派生クラスの初期化後処理用フック"""
+        pass
+    
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式にシリアライズ"""
         return {
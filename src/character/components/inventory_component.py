@@ -99,6 +99,29 @@ class InventoryComponent(CharacterComponent):
     def __init__(self, owner):
         super().__init__(owner, ComponentType.INVENTORY)
         self._inventory_data: Optional[InventoryData] = None
+        
+        # アイテムID -> スロットID一覧（追加順）と総数量の索引
+        self._slots_by_item: Dict[str, List[str]] = {}
+        self._item_totals: Dict[str, int] = {}
+    
+    def _rebuild_item_index(self):
+        """インベントリデータから索引を作り直す"""
+        self._slots_by_item = {}
+        self._item_totals = {}
+        if not self._inventory_data:
+            return
+        
+        for slot_id, item in self._inventory_data.items.items():
+            self._slots_by_item.setdefault(item.item_id, []).append(slot_id)
+            self._item_totals[item.item_id] = self._item_totals.get(item.item_id, 0) + item.quantity
+    
+    def _adjust_item_total(self, item_id: str, delta: int):
+        """アイテムの総数量を差分更新"""
+        total = self._item_totals.get(item_id, 0) + delta
+        if total > 0:
+            self._item_totals[item_id] = total
+        else:
+            self._item_totals.pop(item_id, None)
     
     def initialize(self) -> bool:
         """インベントリシステムを初期化"""
@@ -110,11 +133,14 @@ class InventoryComponent(CharacterComponent):
             max_slots = self._get_max_slots_for_class()
             
             self._inventory_data = InventoryData(
+                component_type=ComponentType.INVENTORY,
                 max_slots=max_slots,
                 current_slots=0,
                 initialized=True
             )
             
+            self._rebuild_item_index()
+            
             # 既存のインベントリデータを移行（互換性のため）
             self._migrate_legacy_inventory()
             
@@ -132,6 +158,7 @@ class InventoryComponent(CharacterComponent):
         """インベントリシステムのクリーンアップ"""
         self._inventory_data = None
         self.initialized = False
+        self._rebuild_item_index()
     
     def _get_max_slots_for_class(self) -> int:
         """職業に応じた最大スロット数を取得"""
@@ -175,9 +202,11 @@ class InventoryComponent(CharacterComponent):
         item_name = item_name or item_id
         
         # 既存アイテムとのスタック処理
-        for existing_item in self._inventory_data.items.values():
-            if existing_item.item_id == item_id and existing_item.item_name == item_name:
+        for slot_id in self._slots_by_item.get(item_id, ()):
+            existing_item = self._inventory_data.items[slot_id]
+            if existing_item.item_name == item_name:
                 overflow = existing_item.add_quantity(quantity)
+                self._adjust_item_total(item_id, quantity - overflow)
                 
                 if overflow > 0:
                     # スタック上限を超えた場合、新しいスロットに追加
@@ -196,8 +225,11 @@ class InventoryComponent(CharacterComponent):
         if self._inventory_data.current_slots >= self._inventory_data.max_slots:
             return False
         
-        # 一意なスロットIDを生成
-        slot_id = f"{item_id}_{len(self._inventory_data.items)}"
+        # 一意なスロットIDを生成（削除後の再利用で既存スロットを上書きしないようにする）
+        slot_number = len(self._inventory_data.items)
+        while f"{item_id}_{slot_number}" in self._inventory_data.items:
+            slot_number += 1
+        slot_id = f"{item_id}_{slot_number}"
         
         from datetime import datetime
         new_item = InventoryItem(
@@ -210,6 +242,8 @@ class InventoryComponent(CharacterComponent):
         
         self._inventory_data.items[slot_id] = new_item
         self._inventory_data.current_slots += 1
+        self._slots_by_item.setdefault(item_id, []).append(slot_id)
+        self._adjust_item_total(item_id, quantity)
         
         self._publish_item_acquired_event(item_id, item_name, quantity)
         
@@ -224,19 +258,25 @@ class InventoryComponent(CharacterComponent):
         removed_total = 0
         items_to_remove = []
         
-        for slot_id, item in self._inventory_data.items.items():
-            if item.item_id == item_id and removed_total < quantity:
-                need_to_remove = quantity - removed_total
-                removed = item.remove_quantity(need_to_remove)
-                removed_total += removed
-                
-                if item.quantity <= 0:
-                    items_to_remove.append(slot_id)
+        for slot_id in self._slots_by_item.get(item_id, ()):
+            if removed_total >= quantity:
+                break
+            item = self._inventory_data.items[slot_id]
+            need_to_remove = quantity - removed_total
+            removed = item.remove_quantity(need_to_remove)
+            removed_total += removed
+            
+            if item.quantity <= 0:
+                items_to_remove.append(slot_id)
         
         # 空になったスロットを削除
         for slot_id in items_to_remove:
             del self._inventory_data.items[slot_id]
             self._inventory_data.current_slots -= 1
+            self._slots_by_item[item_id].remove(slot_id)
+        if not self._slots_by_item.get(item_id, True):
+            del self._slots_by_item[item_id]
+        self._adjust_item_total(item_id, -removed_total)
         
         if removed_total > 0:
             self._publish_item_used_event(item_id, removed_total)
@@ -249,12 +289,7 @@ class InventoryComponent(CharacterComponent):
         if not self.ensure_initialized():
             return 0
         
-        total = 0
-        for item in self._inventory_data.items.values():
-            if item.item_id == item_id:
-                total += item.quantity
-        
-        return total
+        return self._item_totals.get(item_id, 0)
     
     def has_item(self, item_id: str, quantity: int = 1) -> bool:
         """指定数のアイテムを持っているかチェック"""
@@ -286,7 +321,7 @@ class InventoryComponent(CharacterComponent):
             'current_slots': self._inventory_data.current_slots,
             'max_slots': self._inventory_data.max_slots,
             'usage_rate': usage_rate,
-            'total_items': sum(item.quantity for item in self._inventory_data.items.values())
+            'total_items': sum(self._item_totals.values())
         }
     
     def is_full(self) -> bool:
@@ -344,6 +379,7 @@ class InventoryComponent(CharacterComponent):
         """辞書からデシリアライズ"""
         try:
             self._inventory_data = InventoryData.from_dict(data)
+            self._rebuild_item_index()
             self.initialized = self._inventory_data.initialized
             self.set_data(self._inventory_data)
             return True
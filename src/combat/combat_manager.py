@@ -1,16 +1,24 @@
 """戦闘管理システム"""
 
-from typing import Dict, List, Tuple, Optional, Any, Union
-from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Optional, Any, Union, Iterator, IO, Deque
+from dataclasses import dataclass, field, asdict
 from enum import Enum
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
 import random
 import math
+import json
+import itertools
+from bisect import bisect_left, insort
 
 from src.character.character import Character
 from src.character.party import Party
 from src.monsters.monster import Monster
 from src.dungeon.dungeon_generator import DungeonAttribute
 from src.magic.spells import spell_manager
+from src.core.config_manager import config_manager
 from src.items.item_usage import item_usage_manager
 from src.utils.logger import logger
 
@@ -28,6 +36,17 @@ FLEE_CHANCE_MAX = 0.9
 NEGOTIATE_CHANCE_MIN = 0.05
 NEGOTIATE_CHANCE_MAX = 0.6
 
+# 戦闘ログ（直近の行動のみメモリに保持し、溢れた分と終了した戦闘はファイルへ書き出す）
+COMBAT_LOG_CAPACITY = 256
+COMBAT_LOG_DIR = Path("logs") / "combat"
+COMBAT_LOG_ENCODING = "utf-8"
+# 戦闘ID（セッション内で一意。戦闘ごとにCombatManagerを作っても同じファイル内の戦闘を区別できる）
+_BATTLE_IDS = itertools.count(1)
+
+# 行動順の同速時の優先度（パーティ→モンスターの順）
+SIDE_PARTY = 0
+SIDE_MONSTERS = 1
+
 
 class CombatState(Enum):
     """戦闘状態"""
@@ -72,6 +91,62 @@ class CombatTurn:
     damage_taken: int = 0
 
 
+@dataclass(frozen=True, slots=True)
+class CombatLogRecord:
+    """戦闘ログの1行動分の記録（参加者オブジェクトを保持しない軽量な形式）"""
+    battle_id: int
+    turn_number: int
+    actor: str
+    action: str
+    target: Optional[str]
+    result: str
+    damage_dealt: int = 0
+    damage_taken: int = 0
+    
+    @classmethod
+    def from_turn(cls, battle_id: int, turn: CombatTurn) -> 'CombatLogRecord':
+        """ターン情報から記録を作成"""
+        return cls(
+            battle_id=battle_id,
+            turn_number=turn.turn_number,
+            actor=turn.actor.name,
+            action=turn.action.value,
+            target=turn.target.name if turn.target is not None else None,
+            result=turn.result,
+            damage_dealt=turn.damage_dealt,
+            damage_taken=turn.damage_taken
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CombatLogRecord':
+        """辞書から復元"""
+        return cls(**data)
+
+
+@lru_cache(maxsize=None)
+def get_default_combat_log_path() -> Path:
+    """セッションごとの戦闘ログファイルパスを取得（同じセッションの戦闘は同じファイルに追記する）"""
+    return COMBAT_LOG_DIR / f"combat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+
+def get_configured_combat_log_path() -> Optional[Path]:
+    """設定（game_config.yaml の debug.combat_log_file）で有効なら戦闘ログの書き出し先を取得"""
+    debug_config = config_manager.load_config("game_config").get("debug", {})
+    return get_default_combat_log_path() if debug_config.get("combat_log_file", False) else None
+
+
+def read_combat_log(path: Union[str, Path]) -> Iterator[CombatLogRecord]:
+    """書き出した戦闘ログを先頭から1件ずつ読み込む"""
+    with open(path, 'r', encoding=COMBAT_LOG_ENCODING) as f:
+        for line in f:
+            if line.strip():
+                yield CombatLogRecord.from_dict(json.loads(line))
+
+
 @dataclass
 class CombatStats:
     """戦闘統計"""
@@ -114,7 +189,8 @@ class CombatStats:
 class CombatManager:
     """戦闘管理システム"""
     
-    def __init__(self):
+    def __init__(self, combat_log_capacity: int = COMBAT_LOG_CAPACITY,
+                 combat_log_path: Optional[Union[str, Path]] = None):
         self.combat_state = CombatState.PREPARATION
         self.party: Optional[Party] = None
         self.monsters: List[Monster] = []
@@ -123,7 +199,33 @@ class CombatManager:
         self.turn_order: List[Union[Character, Monster]] = []
         self.current_turn_index = 0
         self.turn_number = 1
-        self.combat_log: List[CombatTurn] = []
+        self.battle_id = 0  # 戦闘開始時にセッション内で一意のIDを割り当てる
+        
+        # 戦闘ログ（固定長のリング）。書き出し先が指定されていれば溢れた記録と終了した戦闘を追記する
+        self.combat_log: Deque[CombatLogRecord] = deque(maxlen=combat_log_capacity)
+        self.combat_log_path: Optional[Path] = Path(combat_log_path) if combat_log_path else None
+        self._combat_log_file: Optional[IO[str]] = None
+        self._exported_log_count = 0  # リング先頭から書き出し済みの件数
+        
+        # 行動の実行関数（対象を取らない行動は actor, turn のみ受け取る）
+        self._action_executors = {
+            CombatAction.ATTACK: self._execute_attack,
+            CombatAction.DEFEND: self._execute_defend,
+            CombatAction.CAST_SPELL: self._execute_spell,
+            CombatAction.USE_ITEM: self._execute_item_use,
+            CombatAction.FLEE: self._execute_flee,
+            CombatAction.NEGOTIATE: self._execute_negotiate,
+            CombatAction.SPECIAL_ABILITY: self._execute_special_ability,
+        }
+        self._untargeted_actions = frozenset([CombatAction.DEFEND, CombatAction.FLEE, CombatAction.NEGOTIATE])
+        
+        # 行動順（敏捷性の高い順）を保持し、戦闘不能・離脱・参加・敏捷性変化の時のみ差分更新する
+        # 要素は (-敏捷性, 陣営, 陣営内の順番, 戦闘参加者)
+        self._initiative: List[Tuple[int, int, int, Union[Character, Monster]]] = []
+        self._initiative_keys: Dict[int, Tuple[int, int, int]] = {}
+        self._combatant_ranks: Dict[int, Tuple[int, int]] = {}
+        self._next_ranks = {SIDE_PARTY: 0, SIDE_MONSTERS: 0}
+        self._alive_counts = {SIDE_PARTY: 0, SIDE_MONSTERS: 0}
         
         # 戦闘統計
         self.party_stats = CombatStats()
@@ -164,28 +266,87 @@ class CombatManager:
         self.combat_state = CombatState.IN_PROGRESS
         self.current_turn_index = 0
         self.turn_number = 1
+        self.battle_id = next(_BATTLE_IDS)
         
         logger.info(f"戦闘開始: {len(living_characters)}人 vs {len(living_monsters)}体")
         return True
     
     def _determine_turn_order(self):
         """ターン順序決定"""
-        self.turn_order = []
+        self._clear_initiative()
         
-        # 生存中のキャラクターを追加
-        for character in self.party.get_living_characters():
-            self.turn_order.append(character)
-        
-        # 生存中のモンスターを追加
+        # パーティ・モンスターの並び順で登録（同速時はこの順を維持）
+        for character in self.party.characters.values():
+            self._register_combatant(character)
         for monster in self.monsters:
-            if monster.is_alive:
-                self.turn_order.append(monster)
+            self._register_combatant(monster)
         
-        # 敏捷性でソート（高い順）
-        self.turn_order.sort(key=lambda x: self._get_agility(x), reverse=True)
+        self.turn_order = self._get_initiative_order()
         
         logger.debug(f"ターン順序決定: {len(self.turn_order)}人/体")
     
+    def _clear_initiative(self):
+        """行動順と生存数をクリア"""
+        self._initiative = []
+        self._initiative_keys = {}
+        self._combatant_ranks = {}
+        self._next_ranks = {SIDE_PARTY: 0, SIDE_MONSTERS: 0}
+        self._alive_counts = {SIDE_PARTY: 0, SIDE_MONSTERS: 0}
+    
+    def _get_side(self, actor: Union[Character, Monster]) -> int:
+        """戦闘参加者の陣営を取得"""
+        return SIDE_PARTY if isinstance(actor, Character) else SIDE_MONSTERS
+    
+    def _is_combatant_alive(self, actor: Union[Character, Monster]) -> bool:
+        """戦闘参加者が生存しているか"""
+        if isinstance(actor, Character):
+            return actor.is_alive()
+        return actor.is_alive
+    
+    def _register_combatant(self, actor: Union[Character, Monster]):
+        """戦闘参加者を登録（生存していれば行動順に加える）"""
+        side = self._get_side(actor)
+        self._combatant_ranks[id(actor)] = (side, self._next_ranks[side])
+        self._next_ranks[side] += 1
+        self.update_combatant(actor)
+    
+    def _get_initiative_order(self) -> List[Union[Character, Monster]]:
+        """現在の行動順を取得"""
+        return [entry[-1] for entry in self._initiative]
+    
+    def update_combatant(self, actor: Union[Character, Monster]):
+        """参加者の生存状態・敏捷性の変化を行動順と生存数に反映
+        
+        ダメージ・回復・蘇生・状態付与・ターン効果など、マネージャー内でHP・状態・敏捷性が
+        変わる箇所からはその参加者について呼び出す。戦闘マネージャーを通さずに戦闘中の
+        HP・状態・敏捷性を変えた場合は、呼び出し側でこのメソッドを呼び出す。
+        """
+        rank = self._combatant_ranks.get(id(actor))
+        if rank is None:
+            return
+        
+        current_key = self._initiative_keys.get(id(actor))
+        if not self._is_combatant_alive(actor):
+            self._remove_from_initiative(actor)
+            return
+        
+        key = (-self._get_agility(actor),) + rank
+        if key == current_key:
+            return
+        if current_key is not None:
+            self._remove_from_initiative(actor)
+        insort(self._initiative, key + (actor,))
+        self._initiative_keys[id(actor)] = key
+        self._alive_counts[rank[0]] += 1
+    
+    def _remove_from_initiative(self, actor: Union[Character, Monster]):
+        """行動順から取り除き、生存数を減らす"""
+        key = self._initiative_keys.pop(id(actor), None)
+        if key is None:
+            return
+        del self._initiative[bisect_left(self._initiative, key)]
+        self._alive_counts[key[1]] -= 1
+    
     def _get_agility(self, actor: Union[Character, Monster]) -> int:
         """敏捷性取得"""
         if isinstance(actor, Character):
@@ -230,34 +391,65 @@ class CombatManager:
         )
         
         # 行動実行
-        result = self._execute_specific_action(turn)
+        turn.result = self._execute_specific_action(turn)
         
         # ターン記録
-        self.combat_log.append(turn)
+        self._record_turn(turn)
         
         # 次のターンへ
         self._advance_turn()
         
         # 戦闘終了条件チェック
         combat_result = self._check_combat_end()
+        if combat_result != CombatResult.CONTINUE:
+            self.flush_combat_log()
         
         return combat_result
     
+    def _record_turn(self, turn: CombatTurn):
+        """行動をリングに記録（溢れる最古の記録は未書き出しなら書き出す）"""
+        log = self.combat_log
+        if len(log) == log.maxlen:
+            if self._exported_log_count > 0:
+                self._exported_log_count -= 1
+            else:
+                self._write_combat_log_records([log[0]])
+        log.append(CombatLogRecord.from_turn(self.battle_id, turn))
+    
+    def flush_combat_log(self):
+        """リング内の未書き出しの記録を書き出す"""
+        pending = list(self.combat_log)[self._exported_log_count:]
+        if pending:
+            self._write_combat_log_records(pending)
+        self._exported_log_count = len(self.combat_log)
+        if self._combat_log_file is not None:
+            self._combat_log_file.flush()
+    
+    def _write_combat_log_records(self, records: List[CombatLogRecord]):
+        """記録を戦闘ログファイルに追記（書き出し先未指定なら何もしない）"""
+        if self.combat_log_path is None:
+            return
+        try:
+            if self._combat_log_file is None:
+                self.combat_log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._combat_log_file = open(self.combat_log_path, 'a', encoding=COMBAT_LOG_ENCODING)
+            for record in records:
+                self._combat_log_file.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"戦闘ログの書き出しに失敗: {e}")
+    
+    def close_combat_log(self):
+        """リング内の未書き出しの記録を書き出して戦闘ログファイルを閉じる"""
+        self.flush_combat_log()
+        if self._combat_log_file is not None:
+            self._combat_log_file.close()
+            self._combat_log_file = None
+    
     def _execute_specific_action(self, turn: CombatTurn) -> str:
         """具体的な行動実行"""
-        action_map = {
-            CombatAction.ATTACK: self._execute_attack,
-            CombatAction.DEFEND: self._execute_defend,
-            CombatAction.CAST_SPELL: self._execute_spell,
-            CombatAction.USE_ITEM: self._execute_item_use,
-            CombatAction.FLEE: self._execute_flee,
-            CombatAction.NEGOTIATE: self._execute_negotiate,
-            CombatAction.SPECIAL_ABILITY: self._execute_special_ability,
-        }
-        
-        executor = action_map.get(turn.action)
+        executor = self._action_executors.get(turn.action)
         if executor:
-            if turn.action in [CombatAction.DEFEND, CombatAction.FLEE, CombatAction.NEGOTIATE]:
+            if turn.action in self._untargeted_actions:
                 return executor(turn.actor, turn)
             else:
                 return executor(turn.actor, turn.target, turn)
@@ -346,10 +538,12 @@ class CombatManager:
         if not item_instance:
             return f"{self._get_actor_name(actor)}のアイテム使用に失敗しました"
         
-        # アイテム使用
+        # アイテム使用（効果は対象にのみ及ぶ）
         result, message, results = item_usage_manager.use_item(
-            item_instance, actor, target, self.party
+            item_instance, actor, target, self.party, slot=turn.action_data.get('slot')
         )
+        if target is not None:
+            self.update_combatant(target)
         
         # 統計更新
         self.party_stats.add_item_used()
@@ -459,6 +653,7 @@ class CombatManager:
         else:
             actual_damage = target.take_damage(damage)
         
+        self.update_combatant(target)
         return actual_damage
     
     def _calculate_spell_value(self, caster: Character, effect: Any) -> int:
@@ -474,6 +669,7 @@ class CombatManager:
         if target and isinstance(target, Monster):
             damage = self._calculate_spell_value(caster, spell.effect)
             actual_damage = target.take_damage(damage)
+            self.update_combatant(target)
             return f"{caster.name}の{spell.name}！{target.name}に{actual_damage}ダメージ！"
         else:
             return f"{caster.name}の{spell.name}は失敗した"
@@ -483,6 +679,7 @@ class CombatManager:
         if target and isinstance(target, Character):
             heal_amount = self._calculate_spell_value(caster, spell.effect)
             actual_heal = target.heal(heal_amount)
+            self.update_combatant(target)
             return f"{caster.name}の{spell.name}！{target.name}が{actual_heal}回復！"
         else:
             return f"{caster.name}の{spell.name}は失敗した"
@@ -492,6 +689,7 @@ class CombatManager:
         if target:
             effect_name = spell.effect.effect_type
             target.add_status_effect(effect_name)
+            self.update_combatant(target)
             return f"{caster.name}の{spell.name}！{target.name}に{effect_name}効果が付与された！"
         else:
             return f"{caster.name}の{spell.name}は失敗した"
@@ -500,6 +698,7 @@ class CombatManager:
         """蘇生系魔法適用"""
         if target and isinstance(target, Character) and not target.is_alive():
             target.revive()
+            self.update_combatant(target)
             return f"{caster.name}の{spell.name}！{target.name}が蘇生した！"
         else:
             return f"{caster.name}の{spell.name}は失敗した"
@@ -566,23 +765,11 @@ class CombatManager:
     
     def _update_turn_order(self):
         """ターン順序更新（生存者のみ）"""
-        old_order = self.turn_order.copy()
-        self.turn_order = []
-        
-        # 生存中のキャラクター
-        for character in self.party.get_living_characters():
-            self.turn_order.append(character)
+        old_count = len(self.turn_order)
+        self.turn_order = self._get_initiative_order()
         
-        # 生存中のモンスター
-        for monster in self.monsters:
-            if monster.is_alive:
-                self.turn_order.append(monster)
-        
-        # 敏捷性でソート
-        self.turn_order.sort(key=lambda x: self._get_agility(x), reverse=True)
-        
-        if len(self.turn_order) != len(old_order):
-            logger.debug(f"ターン順序更新: {len(old_order)} -> {len(self.turn_order)}")
+        if len(self.turn_order) != old_count:
+            logger.debug(f"ターン順序更新: {old_count} -> {len(self.turn_order)}")
     
     def _process_turn_effects(self):
         """ターン効果処理"""
@@ -590,6 +777,8 @@ class CombatManager:
         for character in self.party.get_living_characters():
             if hasattr(character, 'process_turn_effects'):
                 character.process_turn_effects()
+                # 継続ダメージ・効果切れによる戦闘不能・敏捷性変化を反映
+                self.update_combatant(character)
         
         # モンスターの状態効果処理
         for monster in self.monsters:
@@ -603,14 +792,12 @@ class CombatManager:
             return CombatResult.FLED if self.combat_state == CombatState.FLED else CombatResult.NEGOTIATED
         
         # 全キャラクター死亡チェック
-        living_characters = self.party.get_living_characters()
-        if not living_characters:
+        if not self._alive_counts[SIDE_PARTY]:
             self.combat_state = CombatState.DEFEAT
             return CombatResult.DEFEAT
         
         # 全モンスター死亡チェック
-        living_monsters = [m for m in self.monsters if m.is_alive]
-        if not living_monsters:
+        if not self._alive_counts[SIDE_MONSTERS]:
             self.combat_state = CombatState.VICTORY
             return CombatResult.VICTORY
         
@@ -627,8 +814,8 @@ class CombatManager:
             'turn_number': self.turn_number,
             'current_actor': self._get_actor_name(self.get_current_actor()) if self.get_current_actor() else None,
             'is_player_turn': self.is_player_turn(),
-            'party_members': len(self.party.get_living_characters()) if self.party else 0,
-            'monsters_alive': len([m for m in self.monsters if m.is_alive]),
+            'party_members': self._alive_counts[SIDE_PARTY],
+            'monsters_alive': self._alive_counts[SIDE_MONSTERS],
             'party_stats': self.party_stats,
             'combat_log_size': len(self.combat_log)
         }
@@ -658,9 +845,12 @@ class CombatManager:
         self.party = None
         self.monsters = []
         self.turn_order = []
+        self._clear_initiative()
         self.current_turn_index = 0
         self.turn_number = 1
-        self.combat_log = []
+        self.flush_combat_log()
+        self.combat_log.clear()
+        self._exported_log_count = 0
         self.party_stats = CombatStats()
         self.monster_stats = CombatStats()
         
@@ -675,6 +865,7 @@ class CombatManager:
             # 追加のクリーンアップ
             self.turn_order.clear()
             self.combat_log.clear()
+            self.close_combat_log()
             
             logger.info("CombatManager リソースをクリーンアップしました")
         except Exception as e:
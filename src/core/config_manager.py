@@ -1,8 +1,9 @@
 """設定管理システム"""
 
 import yaml
+import weakref
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List
 from src.utils.logger import logger
 
 # デフォルト設定
@@ -21,6 +22,8 @@ class ConfigManager:
         self._configs: Dict[str, Dict[str, Any]] = {}
         self._text_data: Dict[str, Dict[str, str]] = {}
         self.current_language = DEFAULT_LANGUAGE
+        # 再読み込み時に呼ぶ処理（WeakMethodで保持してメモリリークを防ぐ）
+        self._reload_listeners: List[weakref.WeakMethod] = []
         
     def load_config(self, config_name: str) -> Dict[str, Any]:
         """設定ファイルの読み込み"""
@@ -113,10 +116,26 @@ class ConfigManager:
                 MISSING_TEXT_SUFFIX in text and 
                 text.startswith(MISSING_TEXT_PREFIX))
     
+    def reload_config(self, config_name: str) -> Dict[str, Any]:
+        """設定ファイルをキャッシュを使わずに読み込み直す"""
+        self._configs.pop(config_name, None)
+        return self.load_config(config_name)
+    
+    def add_reload_listener(self, listener: Callable[[], None]):
+        """全設定の再読み込み時に呼ぶメソッドを登録（設定から派生データを作るマネージャー用）"""
+        self._reload_listeners.append(weakref.WeakMethod(listener))
+    
     def reload_all(self):
         """全設定の再読み込み"""
         self._configs.clear()
         self._text_data.clear()
+        
+        # 登録済みの派生データを作り直す（破棄されたオブジェクトの登録は除去）
+        self._reload_listeners = [ref for ref in self._reload_listeners if ref() is not None]
+        for listener_ref in list(self._reload_listeners):
+            listener = listener_ref()
+            if listener is not None:
+                listener()
         logger.info("全設定を再読み込みしました")
 
 
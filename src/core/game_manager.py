@@ -18,10 +18,11 @@ from src.core.scene_manager import SceneManager, SceneType
 from src.core.event_bus import EventBus, EventType, GameEvent, EventHandler, publish_event
 from src.overworld.overworld_manager import OverworldManager
 from src.dungeon.dungeon_manager import DungeonManager
-from src.combat.combat_manager import CombatManager
+from src.combat.combat_manager import CombatManager, get_configured_combat_log_path
 from src.encounter.encounter_manager import EncounterManager
 from src.character.party import Party
 from src.rendering.dungeon_renderer_pygame import DungeonRendererPygame
+from src.rendering.renderer_config import RendererConfig, ScreenConfig, RENDER_MODE_RAYCAST
 from src.ui.dungeon_ui_pygame import create_pygame_dungeon_ui
 from src.utils.logger import logger
 from src.utils.constants import *
@@ -656,14 +657,19 @@ class GameManager(EventHandler):
         self.dungeon_manager.set_force_retreat_callback(self._handle_force_retreat)
         
         # 戦闘・エンカウンターマネージャーの初期化
-        self.combat_manager = CombatManager()
+        self.combat_manager = CombatManager(combat_log_path=get_configured_combat_log_path())
         self.encounter_manager = EncounterManager()
         
         logger.debug("戦闘・エンカウンターシステム初期化完了")
         
         # ダンジョンレンダラーの初期化
         try:
-            self.dungeon_renderer = DungeonRendererPygame(screen=self.screen)
+            graphics_config = self.game_config.load_config("game_config").get("graphics", {})
+            renderer_config = RendererConfig(
+                render_mode=graphics_config.get("dungeon_render_mode", RENDER_MODE_RAYCAST),
+                screen=ScreenConfig(render_scale=graphics_config.get("dungeon_render_scale", 1.0))
+            )
+            self.dungeon_renderer = DungeonRendererPygame(screen=self.screen, config=renderer_config)
             # ダンジョンマネージャーを設定
             self.dungeon_renderer.set_dungeon_manager(self.dungeon_manager)
             
@@ -30,6 +30,9 @@ class MainLoopManager(ManagedComponent):
         self._event_handlers: List[Callable[[pygame.event.Event], bool]] = []
         self._update_handlers: List[Callable[[float], None]] = []
         self._render_handlers: List[Callable[[pygame.Surface], None]] = []
+        
+        # 前フレームで描画したシーン（切り替わり時は全画面更新）
+        self._last_presented_scene = None
     
     def _do_initialize(self, context: Dict[str, Any]) -> bool:
         """MainLoopManagerの初期化"""
@@ -320,7 +323,29 @@ class MainLoopManager(ManagedComponent):
             self._render_debug_info()
         
         # 画面更新
-        pygame.display.flip()
+        self._present_frame()
+    
+    def _present_frame(self) -> None:
+        """画面更新
+        
+        メニュー表示中でシーンが静的な場合はWindowManagerのダーティ矩形のみを転送し、
+        シーン遷移・動的なシーン・デバッグ表示中は全画面をflipする。
+        """
+        try:
+            from src.ui.window_system import WindowManager
+            window_manager = WindowManager.get_instance()
+            
+            scene = self.scene_manager.current_scene if self.scene_manager else None
+            if (scene is not self._last_presented_scene or self.debug_enabled or
+                    not window_manager.get_active_window() or
+                    (scene is not None and not scene.static_background)):
+                window_manager.request_full_redraw()
+            self._last_presented_scene = scene
+            
+            window_manager.present()
+        except Exception as e:
+            logger.error(f"Present error: {e}")
+            pygame.display.flip()
     
     def _render_persistent_elements(self) -> None:
         """永続要素の描画
@@ -23,6 +23,10 @@ class SceneType(Enum):
 class GameScene(ABC):
     """ゲームシーンの基底クラス"""
     
+    # シーン自身の描画内容がウィンドウ操作以外で変化しないか
+    # （Trueの場合、メニュー表示中は差分転送で画面更新できる）
+    static_background = True
+    
     def __init__(self, scene_type: SceneType, scene_manager: 'SceneManager'):
         self.scene_type = scene_type
         self.scene_manager = scene_manager
@@ -136,6 +140,9 @@ class OverworldScene(GameScene):
 class DungeonScene(GameScene):
     """ダンジョンシーン"""
     
+    # 3Dビューとオーバーレイを毎フレーム描画するため常に全画面更新
+    static_background = False
+    
     def __init__(self, scene_manager: 'SceneManager'):
         super().__init__(SceneType.DUNGEON, scene_manager)
         self.dungeon_manager = None
@@ -1,13 +1,21 @@
 """ダンジョン生成システム"""
 
-from typing import Dict, List, Tuple, Optional, Any
+from typing import AbstractSet, Dict, FrozenSet, List, Mapping, Set, Tuple, Optional, Any
+from collections import deque
 from enum import Enum
 from dataclasses import dataclass, field
+from types import MappingProxyType
 import hashlib
+import heapq
+import itertools
 import random
 import math
+import time
+
+from .field_of_view import compute_field_of_view
 
 from src.utils.logger import logger
+from src.utils.union_find import UnionFind
 
 # ダンジョン生成定数
 DEFAULT_WIDTH = 20
@@ -21,6 +29,7 @@ MAX_LEVEL_SIZE = 30
 LEVEL_SIZE_VARIANCE = 3
 ROOM_GENERATION_ATTEMPTS = 100
 ROOM_BUFFER_SIZE = 1
+MAX_GENERATION_ATTEMPTS = 3     # 連結性を修復できない場合の再生成を含む生成回数の上限
 BASE_ENCOUNTER_RATE = 0.05
 BASE_TRAP_RATE = 0.02
 BASE_TREASURE_RATE = 0.01
@@ -31,6 +40,9 @@ ENCOUNTER_RATE_INCREASE = 0.01
 TRAP_RATE_INCREASE = 0.005
 TREASURE_RATE_INCREASE = 0.002
 
+# オートマップの版番号の系列の識別子（階層オブジェクトごとに一意）
+_MAP_EPOCHS = itertools.count(1)
+
 
 class CellType(Enum):
     """セルタイプ"""
@@ -63,6 +75,48 @@ class Direction(Enum):
     WEST = "west"
 
 
+# 方向ごとの座標の変化量
+DIRECTION_DELTAS = {
+    Direction.NORTH: (0, -1),
+    Direction.SOUTH: (0, 1),
+    Direction.EAST: (1, 0),
+    Direction.WEST: (-1, 0)
+}
+
+# 逆方向
+OPPOSITE_DIRECTIONS = {
+    Direction.NORTH: Direction.SOUTH,
+    Direction.SOUTH: Direction.NORTH,
+    Direction.EAST: Direction.WEST,
+    Direction.WEST: Direction.EAST
+}
+
+
+class CellFeature(Enum):
+    """索引するセルの特徴"""
+    STAIRS_UP = "stairs_up"
+    STAIRS_DOWN = "stairs_down"
+    TREASURE = "treasure"
+    TRAP = "trap"
+    BOSS = "boss"
+    SPECIAL = "special"
+    SECRET_PASSAGE = "secret_passage"   # 発見済みの隠し通路の両端
+
+
+# セルタイプ -> 特徴（宝箱・トラップはフラグでも判定する）
+CELL_TYPE_FEATURES = {
+    CellType.STAIRS_UP: CellFeature.STAIRS_UP,
+    CellType.STAIRS_DOWN: CellFeature.STAIRS_DOWN,
+    CellType.TREASURE: CellFeature.TREASURE,
+    CellType.TRAP: CellFeature.TRAP,
+    CellType.BOSS: CellFeature.BOSS,
+    CellType.SPECIAL: CellFeature.SPECIAL
+}
+
+# 範囲検索用のバケットの一辺のセル数
+FEATURE_BUCKET_SIZE = 8
+
+
 @dataclass
 class DungeonCell:
     """ダンジョンセル"""
@@ -147,6 +201,37 @@ class DungeonLevel:
     trap_rate: float = 0.05
     treasure_rate: float = 0.03
     
+    # 発見済みの隠し通路（壁があっても通行できる隣接セルの組）
+    secret_passages: Set[FrozenSet[Tuple[int, int]]] = field(default_factory=set)
+    
+    # 目標セル -> 各セルから目標までの最短歩数（構造が変わると破棄）
+    _distance_fields: Dict[Tuple[int, int], Mapping[Tuple[int, int], int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # (x, y, 向き, 範囲) -> 視界内のセル座標（構造が変わると破棄）
+    _visibility_cache: Dict[Tuple[int, int, Optional[Direction], int], FrozenSet[Tuple[int, int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # 特徴 -> セル座標、特徴 -> バケット座標 -> セル座標（未構築ならNone）
+    _feature_index: Optional[Dict[CellFeature, Set[Tuple[int, int]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _feature_buckets: Dict[CellFeature, Dict[Tuple[int, int], Set[Tuple[int, int]]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _cell_features: Dict[Tuple[int, int], FrozenSet[CellFeature]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # オートマップの版番号（セルの変化ごとに増える）、セル -> 最後に変化した版（古い順）
+    map_version: int = field(default=0, init=False, compare=False)
+    _cell_versions: Dict[Tuple[int, int], int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # この版より前からの差分は取得できない（構造全体が変わった版）
+    _map_reset_version: int = field(default=0, init=False, repr=False, compare=False)
+    # 版番号の系列の識別子（セーブから復元した階層は版番号が0から始まるため別の系列になる）
+    map_epoch: int = field(default_factory=lambda: next(_MAP_EPOCHS), init=False, compare=False)
+    
     def get_cell(self, x: int, y: int) -> Optional[DungeonCell]:
         """指定座標のセルを取得"""
         return self.cells.get((x, y))
@@ -154,6 +239,328 @@ class DungeonLevel:
     def set_cell(self, cell: DungeonCell):
         """セルを設定"""
         self.cells[(cell.x, cell.y)] = cell
+        self.invalidate_layout()
+    
+    def invalidate_layout(self):
+        """構造の変更を通知（セルの種類や壁を直接書き換えた後に呼ぶ）"""
+        self._distance_fields.clear()
+        self._visibility_cache.clear()
+        self._feature_index = None
+        self.map_version += 1
+        self._map_reset_version = self.map_version
+        self._cell_versions.clear()
+    
+    def mark_cell_changed(self, x: int, y: int) -> int:
+        """セルの表示内容（発見・訪問・宝箱・トラップ）の変化を記録して新しい版番号を返す"""
+        self.map_version += 1
+        # 古い順を保つため一度削除してから末尾に追加する
+        self._cell_versions.pop((x, y), None)
+        self._cell_versions[(x, y)] = self.map_version
+        return self.map_version
+    
+    def get_changed_cells(self, since_version: int) -> Optional[List[Tuple[int, int]]]:
+        """指定した版より後に変化したセル座標（差分を取得できない場合はNone）
+        
+        新しい順にたどって指定した版に達したら止めるので、変化したセル数にのみ比例する。
+        """
+        if since_version < self._map_reset_version or since_version > self.map_version:
+            return None
+        
+        changed = []
+        for position in reversed(self._cell_versions):
+            if self._cell_versions[position] <= since_version:
+                break
+            changed.append(position)
+        changed.reverse()
+        return changed
+    
+    def add_secret_passage(self, position1: Tuple[int, int], position2: Tuple[int, int]):
+        """発見した隠し通路を登録"""
+        self.secret_passages.add(frozenset((tuple(position1), tuple(position2))))
+        self.invalidate_layout()
+    
+    def has_secret_passage(self, position1: Tuple[int, int], position2: Tuple[int, int]) -> bool:
+        """2つの隣接セルの間に発見済みの隠し通路があるか"""
+        return frozenset((tuple(position1), tuple(position2))) in self.secret_passages
+    
+    def can_move(self, x: int, y: int, direction: Direction) -> bool:
+        """指定方向の隣接セルへ移動できるか（壁・隠し通路・移動先の歩行可否を考慮）"""
+        cell = self.get_cell(x, y)
+        if not cell:
+            return False
+        
+        dx, dy = DIRECTION_DELTAS[direction]
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < self.width and 0 <= ny < self.height):
+            return False
+        if cell.walls.get(direction, True) and not self.has_secret_passage((x, y), (nx, ny)):
+            return False
+        return self.is_walkable(nx, ny)
+    
+    def get_passable_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """移動可能な隣接セルの座標リストを取得"""
+        neighbors = []
+        for direction, (dx, dy) in DIRECTION_DELTAS.items():
+            if self.can_move(x, y, direction):
+                neighbors.append((x + dx, y + dy))
+        return neighbors
+    
+    def get_distance_field(self, target: Tuple[int, int]) -> Mapping[Tuple[int, int], int]:
+        """各セルから目標セルまでの最短歩数（到達できないセルは含まない）
+        
+        目標から移動の向きを逆にたどる幅優先探索で求め、構造が変わるまで目標ごとにキャッシュする。
+        """
+        target = tuple(target)
+        distance_field = self._distance_fields.get(target)
+        if distance_field is not None:
+            return distance_field
+        
+        distances = {target: 0}
+        queue = deque([target])
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[(x, y)] + 1
+            for direction, (dx, dy) in DIRECTION_DELTAS.items():
+                # (x, y) へ入ってこられる隣接セル
+                px, py = x - dx, y - dy
+                if (px, py) not in distances and self.can_move(px, py, direction):
+                    distances[(px, py)] = distance
+                    queue.append((px, py))
+        
+        distance_field = MappingProxyType(distances)
+        self._distance_fields[target] = distance_field
+        return distance_field
+    
+    def get_distance(self, start: Tuple[int, int], target: Tuple[int, int]) -> Optional[int]:
+        """開始セルから目標セルまでの最短歩数（到達できなければNone）"""
+        return self.get_distance_field(target).get(tuple(start))
+    
+    def get_path(self, start: Tuple[int, int], target: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """開始セルから目標セルまでの最短経路（開始セルを含まず目標セルを含む）"""
+        distance_field = self.get_distance_field(target)
+        position = tuple(start)
+        distance = distance_field.get(position)
+        if distance is None:
+            return None
+        
+        path = []
+        while distance > 0:
+            for direction, (dx, dy) in DIRECTION_DELTAS.items():
+                next_position = (position[0] + dx, position[1] + dy)
+                if (distance_field.get(next_position) == distance - 1
+                        and self.can_move(position[0], position[1], direction)):
+                    position = next_position
+                    break
+            distance -= 1
+            path.append(position)
+        return path
+    
+    def find_path(self, start: Tuple[int, int], target: Tuple[int, int],
+                  allowed_cells: AbstractSet[Tuple[int, int]]) -> Optional[List[Tuple[int, int]]]:
+        """指定したセルだけを通る最短経路（開始セルを含まず目標セルを含む）
+        
+        A*探索のヒューリスティックには制限なしの距離場を使う。制限付きの距離は
+        制限なしの距離以上なので許容的であり、既知のセルだけで最短経路があれば探索はほぼ一直線になる。
+        """
+        start, target = tuple(start), tuple(target)
+        if target not in allowed_cells:
+            return None
+        
+        distance_field = self.get_distance_field(target)
+        if start not in distance_field:
+            return None
+        
+        costs = {start: 0}
+        parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        open_list = [(distance_field[start], 0, start)]
+        while open_list:
+            _, cost, position = heapq.heappop(open_list)
+            if position == target:
+                path = []
+                while position != start:
+                    path.append(position)
+                    position = parents[position]
+                path.reverse()
+                return path
+            if cost > costs[position]:
+                continue
+            
+            for neighbor in self.get_passable_neighbors(*position):
+                if neighbor not in allowed_cells or neighbor not in distance_field:
+                    continue
+                next_cost = cost + 1
+                if next_cost < costs.get(neighbor, next_cost + 1):
+                    costs[neighbor] = next_cost
+                    parents[neighbor] = position
+                    heapq.heappush(open_list, (next_cost + distance_field[neighbor], next_cost, neighbor))
+        return None
+    
+    def is_opaque(self, x: int, y: int) -> bool:
+        """視線を遮るセルか（壁・扉・セルなし）"""
+        cell = self.get_cell(x, y)
+        return not cell or cell.cell_type in (CellType.WALL, CellType.DOOR)
+    
+    def get_visible_positions(self, x: int, y: int, vision_range: int,
+                              facing: Optional[Direction] = None) -> FrozenSet[Tuple[int, int]]:
+        """視点から見えるセル座標（壁の向こうは含まない）
+        
+        向きを指定した場合は背後（向きと逆側の半平面）を除く。位置・向き・範囲ごとにキャッシュする。
+        """
+        key = (x, y, facing, vision_range)
+        visible = self._visibility_cache.get(key)
+        if visible is not None:
+            return visible
+        
+        visible = compute_field_of_view(
+            (x, y), vision_range,
+            lambda cx, cy: 0 <= cx < self.width and 0 <= cy < self.height,
+            self.is_opaque
+        )
+        if facing is not None:
+            fx, fy = DIRECTION_DELTAS[facing]
+            visible = frozenset(
+                (vx, vy) for vx, vy in visible if (vx - x) * fx + (vy - y) * fy >= 0
+            )
+        
+        self._visibility_cache[key] = visible
+        return visible
+    
+    def rebuild_feature_index(self):
+        """特徴の索引を全セルから構築"""
+        self._feature_index = {feature: set() for feature in CellFeature}
+        self._feature_buckets = {feature: {} for feature in CellFeature}
+        self._cell_features = {}
+        
+        secret_cells = self._get_secret_passage_cells()
+        for position in set(self.cells) | secret_cells:
+            self._set_cell_features(position, self._compute_cell_features(position, secret_cells))
+    
+    def update_cell_features(self, x: int, y: int):
+        """1セルの特徴を索引に反映（宝箱の開封やトラップの解除の後に呼ぶ）"""
+        if self._feature_index is None:
+            return
+        self._set_cell_features((x, y), self._compute_cell_features((x, y), self._get_secret_passage_cells()))
+    
+    def _get_secret_passage_cells(self) -> Set[Tuple[int, int]]:
+        """隠し通路の両端のセル座標"""
+        return {position for passage in self.secret_passages for position in passage}
+    
+    def _compute_cell_features(self, position: Tuple[int, int],
+                               secret_cells: AbstractSet[Tuple[int, int]]) -> FrozenSet[CellFeature]:
+        """セルの特徴を判定"""
+        features = set()
+        cell = self.cells.get(position)
+        if cell:
+            if cell.cell_type in CELL_TYPE_FEATURES:
+                features.add(CELL_TYPE_FEATURES[cell.cell_type])
+            if cell.has_treasure:
+                features.add(CellFeature.TREASURE)
+            if cell.has_trap:
+                features.add(CellFeature.TRAP)
+        if position in secret_cells:
+            features.add(CellFeature.SECRET_PASSAGE)
+        return frozenset(features)
+    
+    def _set_cell_features(self, position: Tuple[int, int], features: FrozenSet[CellFeature]):
+        """セルの特徴を差分で索引とバケットに反映"""
+        old_features = self._cell_features.get(position, frozenset())
+        if features == old_features:
+            return
+        
+        bucket = (position[0] // FEATURE_BUCKET_SIZE, position[1] // FEATURE_BUCKET_SIZE)
+        for feature in old_features - features:
+            self._feature_index[feature].discard(position)
+            bucket_cells = self._feature_buckets[feature][bucket]
+            bucket_cells.discard(position)
+            if not bucket_cells:
+                del self._feature_buckets[feature][bucket]
+        for feature in features - old_features:
+            self._feature_index[feature].add(position)
+            self._feature_buckets[feature].setdefault(bucket, set()).add(position)
+        
+        if features:
+            self._cell_features[position] = features
+        else:
+            self._cell_features.pop(position, None)
+    
+    def _ensure_feature_index(self):
+        """索引が未構築なら構築"""
+        if self._feature_index is None:
+            self.rebuild_feature_index()
+    
+    def get_feature_positions(self, feature: CellFeature) -> AbstractSet[Tuple[int, int]]:
+        """特徴を持つセル座標の集合（読み取り専用として扱う）"""
+        self._ensure_feature_index()
+        return self._feature_index[feature]
+    
+    def get_special_locations(self, features: Optional[List[CellFeature]] = None) -> Dict[str, List[Tuple[int, int]]]:
+        """特徴ごとのセル座標の一覧（省略時は全特徴）"""
+        self._ensure_feature_index()
+        return {
+            feature.value: sorted(self._feature_index[feature])
+            for feature in (features or list(CellFeature))
+        }
+    
+    def find_features_in_range(self, feature: CellFeature, x: int, y: int, radius: int) -> List[Tuple[int, int]]:
+        """指定座標からチェビシェフ距離 radius 以内にある特徴のセル座標
+        
+        範囲に重なるバケットのみを調べるため、階層全体の大きさには依存しない。
+        """
+        self._ensure_feature_index()
+        buckets = self._feature_buckets[feature]
+        found = []
+        for bucket_x in range((x - radius) // FEATURE_BUCKET_SIZE, (x + radius) // FEATURE_BUCKET_SIZE + 1):
+            for bucket_y in range((y - radius) // FEATURE_BUCKET_SIZE, (y + radius) // FEATURE_BUCKET_SIZE + 1):
+                for cx, cy in buckets.get((bucket_x, bucket_y), ()):
+                    if abs(cx - x) <= radius and abs(cy - y) <= radius:
+                        found.append((cx, cy))
+        found.sort()
+        return found
+    
+    def find_nearest_feature(self, feature: CellFeature, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """指定座標から最も近い（マンハッタン距離）特徴のセル座標
+        
+        自分のバケットから外側へ1周ずつ調べ、それより外のバケットに近いセルがありえなくなった時点で打ち切る。
+        """
+        self._ensure_feature_index()
+        buckets = self._feature_buckets[feature]
+        if not buckets:
+            return None
+        
+        origin_x, origin_y = x // FEATURE_BUCKET_SIZE, y // FEATURE_BUCKET_SIZE
+        max_ring = max(abs(bx - origin_x) for bx, _ in buckets)
+        max_ring = max(max_ring, max(abs(by - origin_y) for _, by in buckets))
+        best = None
+        for ring in range(max_ring + 1):
+            # ring 周目のバケットのセルはチェビシェフ距離（≦マンハッタン距離）が下限以上
+            if best is not None and best[0] < (ring - 1) * FEATURE_BUCKET_SIZE + 1:
+                break
+            for bucket in self._iter_bucket_ring(origin_x, origin_y, ring):
+                for cx, cy in buckets.get(bucket, ()):
+                    candidate = (abs(cx - x) + abs(cy - y), (cx, cy))
+                    if best is None or candidate < best:
+                        best = candidate
+        return best[1] if best else None
+    
+    @staticmethod
+    def _iter_bucket_ring(origin_x: int, origin_y: int, ring: int):
+        """中心のバケットからチェビシェフ距離がちょうど ring のバケット座標を列挙"""
+        if ring == 0:
+            yield (origin_x, origin_y)
+            return
+        for bucket_x in range(origin_x - ring, origin_x + ring + 1):
+            yield (bucket_x, origin_y - ring)
+            yield (bucket_x, origin_y + ring)
+        for bucket_y in range(origin_y - ring + 1, origin_y + ring):
+            yield (origin_x - ring, bucket_y)
+            yield (origin_x + ring, bucket_y)
+    
+    def is_stairs_connected(self) -> bool:
+        """入口（上り階段、なければ開始位置）から下り階段へ到達できるか"""
+        entrance = self.stairs_up_position or self.start_position
+        if not entrance or not self.stairs_down_position:
+            return True
+        return self.get_distance(entrance, self.stairs_down_position) is not None
     
     def is_walkable(self, x: int, y: int) -> bool:
         """歩行可能かチェック"""
@@ -193,7 +600,8 @@ class DungeonLevel:
             'boss_position': self.boss_position,
             'encounter_rate': self.encounter_rate,
             'trap_rate': self.trap_rate,
-            'treasure_rate': self.treasure_rate
+            'treasure_rate': self.treasure_rate,
+            'secret_passages': [sorted(passage) for passage in self.secret_passages]
         }
     
     @classmethod
@@ -210,17 +618,36 @@ class DungeonLevel:
         for pos_str, cell_data in data.get('cells', {}).items():
             level.cells[tuple(map(int, pos_str.split(',')))] = DungeonCell.from_dict(cell_data)
         
-        level.start_position = data.get('start_position')
-        level.stairs_up_position = data.get('stairs_up_position')
-        level.stairs_down_position = data.get('stairs_down_position')
-        level.boss_position = data.get('boss_position')
+        # JSON経由ではリストになるため座標はタプルに戻す
+        for name in ('start_position', 'stairs_up_position', 'stairs_down_position', 'boss_position'):
+            position = data.get(name)
+            setattr(level, name, tuple(position) if position is not None else None)
         level.encounter_rate = data.get('encounter_rate', 0.1)
         level.trap_rate = data.get('trap_rate', 0.05)
         level.treasure_rate = data.get('treasure_rate', 0.03)
+        level.secret_passages = {
+            frozenset(tuple(position) for position in passage) for passage in data.get('secret_passages', [])
+        }
         
         return level
 
 
+@dataclass
+class ConnectivityReport:
+    """生成時の連結性検証の結果"""
+    level: int
+    valid: bool                                 # 最終的に全ての重要セルへ到達できるか
+    unreachable: List[Tuple[int, int]] = field(default_factory=list)  # 最初の検証で到達できなかった重要セル
+    carved_cells: int = 0                       # 修復で通路にした壁セル数
+    attempts: int = 1                           # 生成回数（再生成した場合は2以上）
+    validation_time: float = 0.0                # 検証と修復にかかった時間（秒）
+    
+    @property
+    def repaired(self) -> bool:
+        """修復または再生成が行われたか"""
+        return bool(self.unreachable) or self.attempts > 1
+
+
 class DungeonGenerator:
     """ダンジョン生成器"""
     
@@ -235,14 +662,52 @@ class DungeonGenerator:
         self.max_room_size = MAX_ROOM_SIZE
         self.max_rooms = MAX_ROOMS
         
+        # 直近に生成したレベルの連結性検証の結果
+        self.last_connectivity_report: Optional[ConnectivityReport] = None
+        
         logger.info(f"DungeonGeneratorを初期化: seed={seed}")
     
     def generate_level(self, level: int, dungeon_id: str = "main_dungeon") -> DungeonLevel:
-        """指定レベルのダンジョン階層を生成"""
+        """指定レベルのダンジョン階層を生成
+        
+        生成後に重要セル（入口・階段・宝箱・ボス）の連結性を検証し、到達できないセルがあれば
+        最小限の通路を掘って修復する。修復できなければ派生シードで再生成する。
+        """
         # レベル固有のシードを生成
         level_seed = hashlib.md5(f"{self.hash_seed}_{level}".encode()).hexdigest()
-        rng = random.Random(int(level_seed[:8], 16))
         
+        unreachable: List[Tuple[int, int]] = []
+        carved_cells = 0
+        validation_time = 0.0
+        for attempt in range(1, MAX_GENERATION_ATTEMPTS + 1):
+            seed = level_seed if attempt == 1 else hashlib.md5(f"{level_seed}_{attempt}".encode()).hexdigest()
+            rng = random.Random(int(seed[:8], 16))
+            dungeon_level = self._build_level(level, dungeon_id, rng)
+            
+            started = time.perf_counter()
+            missing = self.find_unreachable_cells(dungeon_level)
+            if missing:
+                unreachable = unreachable or missing
+                carved_cells += self.repair_connectivity(dungeon_level)
+                missing = self.find_unreachable_cells(dungeon_level)
+            validation_time += time.perf_counter() - started
+            if not missing:
+                break
+            logger.warning(f"ダンジョンレベル{level}の連結性を修復できないため再生成します（{attempt}回目）")
+        
+        self.last_connectivity_report = ConnectivityReport(
+            level=level, valid=not missing, unreachable=unreachable, carved_cells=carved_cells,
+            attempts=attempt, validation_time=validation_time
+        )
+        if unreachable:
+            logger.info(f"ダンジョンレベル{level}の連結性を修復: 到達不能{len(unreachable)}セル, 掘削{carved_cells}セル")
+        
+        logger.info(f"ダンジョンレベル{level}を生成: {dungeon_level.attribute.value}, "
+                    f"{dungeon_level.width}x{dungeon_level.height}")
+        return dungeon_level
+    
+    def _build_level(self, level: int, dungeon_id: str, rng: random.Random) -> DungeonLevel:
+        """乱数生成器から階層を1つ組み立てる"""
         # レベル特性を決定
         attribute = self._determine_level_attribute(level, rng)
         width, height = self._determine_level_size(level, rng)
@@ -265,10 +730,180 @@ class DungeonGenerator:
         
         # 特殊要素配置
         self._place_special_elements(dungeon_level, rng, dungeon_id)
-        
-        logger.info(f"ダンジョンレベル{level}を生成: {attribute.value}, {width}x{height}")
+        dungeon_level.invalidate_layout()
+        dungeon_level.rebuild_feature_index()
         return dungeon_level
     
+    # === 連結性の検証と修復 ===
+    
+    def _build_cell_components(self, dungeon_level: DungeonLevel) -> UnionFind:
+        """歩行できるセルを移動可能な隣接関係（DungeonLevel.can_move）で併合した素集合"""
+        components = UnionFind()
+        for (x, y) in dungeon_level.cells:
+            if not dungeon_level.is_walkable(x, y):
+                continue
+            components.add((x, y))
+            # 右と下の隣接セルのみ見れば全ての辺を1回ずつ調べられる
+            for direction in (Direction.EAST, Direction.SOUTH):
+                if dungeon_level.can_move(x, y, direction):
+                    dx, dy = DIRECTION_DELTAS[direction]
+                    components.union((x, y), (x + dx, y + dy))
+        return components
+    
+    def _get_approach_roots(self, dungeon_level: DungeonLevel, components: UnionFind,
+                            position: Tuple[int, int]) -> Set[Tuple[int, int]]:
+        """セルに到達できる連結成分の代表元
+        
+        歩行できるセルはそのセルの成分。ボスのセルのように歩行できないセルは、
+        壁なしで（または隠し通路で）隣接する歩行可能なセルの成分から到達できるとみなす。
+        """
+        if position in components:
+            return {components.find(position)}
+        
+        x, y = position
+        roots = set()
+        for direction, (dx, dy) in DIRECTION_DELTAS.items():
+            neighbor = (x + dx, y + dy)
+            neighbor_cell = dungeon_level.get_cell(*neighbor)
+            if neighbor not in components or not neighbor_cell:
+                continue
+            if not neighbor_cell.walls.get(OPPOSITE_DIRECTIONS[direction], True) or dungeon_level.has_secret_passage(neighbor, position):
+                roots.add(components.find(neighbor))
+        return roots
+    
+    def _get_key_cells(self, dungeon_level: DungeonLevel) -> List[Tuple[int, int]]:
+        """到達できなければならないセル（入口以外）"""
+        key_cells = [dungeon_level.stairs_up_position, dungeon_level.start_position,
+                     dungeon_level.stairs_down_position, dungeon_level.boss_position]
+        key_cells.extend(sorted(dungeon_level.get_feature_positions(CellFeature.TREASURE)))
+        entrance = self._get_entrance(dungeon_level)
+        return [tuple(position) for position in key_cells if position and tuple(position) != entrance]
+    
+    def _get_entrance(self, dungeon_level: DungeonLevel) -> Optional[Tuple[int, int]]:
+        """階層の入口（上り階段、なければ開始位置）"""
+        entrance = dungeon_level.stairs_up_position or dungeon_level.start_position
+        return tuple(entrance) if entrance else None
+    
+    def find_unreachable_cells(self, dungeon_level: DungeonLevel) -> List[Tuple[int, int]]:
+        """入口から到達できない重要セル（階段・開始位置・宝箱・ボス）"""
+        entrance = self._get_entrance(dungeon_level)
+        if not entrance:
+            return []
+        
+        components = self._build_cell_components(dungeon_level)
+        entrance_root = components.find(entrance)
+        return [position for position in self._get_key_cells(dungeon_level)
+                if entrance_root not in self._get_approach_roots(dungeon_level, components, position)]
+    
+    def repair_connectivity(self, dungeon_level: DungeonLevel) -> int:
+        """到達できない重要セルを入口側へ通路でつなぐ（掘った壁セル数を返す）
+        
+        入口の連結成分から、壁を通るときだけコストのかかる0-1 BFSで対象の成分までの
+        最少掘削経路を求め、その経路上の壁を床にする。到達できない成分ごとに繰り返す。
+        """
+        entrance = self._get_entrance(dungeon_level)
+        carved_cells = 0
+        while True:
+            components = self._build_cell_components(dungeon_level)
+            entrance_root = components.find(entrance)
+            target_roots: Set[Tuple[int, int]] = set()
+            target_cells: Set[Tuple[int, int]] = set()
+            for position in self._get_key_cells(dungeon_level):
+                if position in components:
+                    target_roots.add(components.find(position))
+                elif entrance_root not in self._get_approach_roots(dungeon_level, components, position):
+                    # 歩行できない重要セル（ボス）はセル自体を目標にし、手前までを掘る
+                    target_cells.add(position)
+            target_roots.discard(entrance_root)
+            if not target_roots and not target_cells:
+                break
+            
+            path = self._find_cheapest_corridor(dungeon_level, components, entrance_root, target_roots, target_cells)
+            if not path:
+                break
+            for x, y in path:
+                cell = dungeon_level.get_cell(x, y)
+                if cell.cell_type == CellType.WALL:
+                    cell.cell_type = CellType.FLOOR
+                    carved_cells += 1
+            # 掘った通路を次の判定に反映する
+            self._update_wall_info(dungeon_level)
+            dungeon_level.invalidate_layout()
+        
+        if carved_cells:
+            dungeon_level.rebuild_feature_index()
+        return carved_cells
+    
+    def _find_cheapest_corridor(self, dungeon_level: DungeonLevel, components: UnionFind, source_root: Tuple[int, int],
+                                target_roots: Set[Tuple[int, int]],
+                                target_cells: Set[Tuple[int, int]] = frozenset()) -> Optional[List[Tuple[int, int]]]:
+        """入口の成分から対象の成分またはセルまで、掘る壁が最少の経路（外周の壁は掘らない）
+        
+        歩行できるセルは費用0、壁は費用1で通り、ボスなど歩行できない壁以外のセルは目標としてのみ入る。
+        """
+        costs: Dict[Tuple[int, int], int] = {}
+        parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        queue = deque()
+        for position in dungeon_level.cells:
+            if position in components and components.find(position) == source_root:
+                costs[position] = 0
+                queue.append(position)
+        
+        while queue:
+            position = queue.popleft()
+            if position in target_cells or (position in components and components.find(position) in target_roots):
+                path = []
+                while position in parents:
+                    path.append(position)
+                    position = parents[position]
+                return path
+            
+            for dx, dy in DIRECTION_DELTAS.values():
+                nx, ny = position[0] + dx, position[1] + dy
+                if not (1 <= nx < dungeon_level.width - 1 and 1 <= ny < dungeon_level.height - 1):
+                    continue
+                cell = dungeon_level.get_cell(nx, ny)
+                if cell is None:
+                    continue
+                if cell.cell_type == CellType.WALL:
+                    step_cost = 1
+                elif dungeon_level.is_walkable(nx, ny) or (nx, ny) in target_cells:
+                    step_cost = 0
+                else:
+                    continue
+                cost = costs[position] + step_cost
+                if cost < costs.get((nx, ny), cost + 1):
+                    costs[(nx, ny)] = cost
+                    parents[(nx, ny)] = position
+                    if step_cost:
+                        queue.append((nx, ny))
+                    else:
+                        queue.appendleft((nx, ny))
+        return None
+    
+    def sweep_connectivity(self, seeds: List[str], levels: List[int],
+                           dungeon_id: str = "main_dungeon") -> Dict[str, Any]:
+        """複数のシードと階層で生成し、連結性の修復率と検証時間を集計"""
+        reports: List[ConnectivityReport] = []
+        for seed in seeds:
+            generator = DungeonGenerator(seed)
+            for level in levels:
+                generator.generate_level(level, dungeon_id)
+                reports.append(generator.last_connectivity_report)
+        
+        count = len(reports)
+        times = [report.validation_time for report in reports]
+        return {
+            'levels_generated': count,
+            'repaired': sum(1 for report in reports if report.unreachable),
+            'regenerated': sum(1 for report in reports if report.attempts > 1),
+            'invalid': sum(1 for report in reports if not report.valid),
+            'repair_rate': sum(1 for report in reports if report.repaired) / count if count else 0.0,
+            'carved_cells': sum(report.carved_cells for report in reports),
+            'mean_validation_time': sum(times) / count if count else 0.0,
+            'max_validation_time': max(times, default=0.0)
+        }
+    
     def _get_max_floors_for_dungeon(self, dungeon_id: str) -> int:
         """ダンジョンの最大フロア数を取得"""
         try:
@@ -373,30 +1008,27 @@ class DungeonGenerator:
         if len(rooms) < 2:
             return
         
-        # 最小スパニングツリーで部屋を接続
-        connected = [0]  # 最初の部屋から開始
-        unconnected = list(range(1, len(rooms)))
+        # 最小スパニングツリーで部屋を接続（Prim法）
+        # 未接続の部屋ごとに接続済みの部屋への最短距離を保持し、部屋を追加するたびに更新する
+        # 同距離の場合は先に接続された部屋、番号の小さい部屋を優先する
+        best_links = {
+            index: (self._room_distance(rooms[0], rooms[index]), 0, 0) for index in range(1, len(rooms))
+        }
+        connected_count = 1
         
-        while unconnected:
-            # 接続済みの部屋から最も近い未接続の部屋を見つける
-            min_distance = float('inf')
-            best_connected = 0
-            best_unconnected = 0
-            
-            for conn_idx in connected:
-                for unconn_idx in unconnected:
-                    distance = self._room_distance(rooms[conn_idx], rooms[unconn_idx])
-                    if distance < min_distance:
-                        min_distance = distance
-                        best_connected = conn_idx
-                        best_unconnected = unconn_idx
+        while best_links:
+            best_unconnected = min(best_links, key=lambda index: (best_links[index][0], best_links[index][1], index))
+            _, _, best_connected = best_links.pop(best_unconnected)
             
             # 通路を作成
             self._create_corridor(dungeon_level, rooms[best_connected], rooms[best_unconnected], rng)
             
-            # 接続リストを更新
-            connected.append(best_unconnected)
-            unconnected.remove(best_unconnected)
+            # 新しく接続した部屋からの距離で更新
+            for index, (distance, _, _) in best_links.items():
+                new_distance = self._room_distance(rooms[best_unconnected], rooms[index])
+                if new_distance < distance:
+                    best_links[index] = (new_distance, connected_count, best_unconnected)
+            connected_count += 1
         
         # 追加の接続を作成（サイクルを作るため）
         extra_connections = rng.randint(1, max(1, len(rooms) // 3))
@@ -471,13 +1103,7 @@ class DungeonGenerator:
     
     def _direction_to_delta(self, direction: Direction) -> Tuple[int, int]:
         """方向をデルタ座標に変換"""
-        direction_map = {
-            Direction.NORTH: (0, -1),
-            Direction.SOUTH: (0, 1),
-            Direction.EAST: (1, 0),
-            Direction.WEST: (-1, 0)
-        }
-        return direction_map[direction]
+        return DIRECTION_DELTAS[direction]
     
     def _place_stairs(self, dungeon_level: DungeonLevel, floor_cells: List, rng: random.Random, dungeon_id: str):
         """階段を配置"""
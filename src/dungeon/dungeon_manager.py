@@ -143,8 +143,14 @@ class DungeonManager:
         self.return_to_overworld_callback = callback
         logger.debug("地上部帰還コールバックを設定しました")
     
-    def create_dungeon(self, dungeon_id: str, seed: str = "default") -> DungeonState:
-        """新しいダンジョンを作成"""
+    def create_dungeon(self, dungeon_id: str, seed: str = "default", pregenerate: bool = False,
+                       max_workers: Optional[int] = None) -> DungeonState:
+        """新しいダンジョンを作成
+        
+        Args:
+            pregenerate: Trueなら全階層を並列に事前生成する（生成済みデータがあれば再利用）
+            max_workers: 事前生成のワーカープロセス数
+        """
         # 既存のダンジョンチェック
         if dungeon_id in self.active_dungeons:
             logger.warning(f"ダンジョン{dungeon_id}は既に存在します")
@@ -159,9 +165,18 @@ class DungeonManager:
         # ジェネレーターの初期化
         self.generator = DungeonGenerator(seed)
         
-        # 最初のレベルを生成
-        first_level = self.generator.generate_level(1, dungeon_id)
-        dungeon_state.levels[1] = first_level
+        if pregenerate:
+            # 全階層を生成（結果は階層ごとの生成と同一）
+            from .pregeneration import pregenerate_dungeon
+            result = pregenerate_dungeon(
+                dungeon_id, seed, max_workers=max_workers,
+                cache_dir=os.path.join(self.save_directory, "pregenerated")
+            )
+            dungeon_state.levels.update(result.levels)
+        else:
+            # 最初のレベルを生成
+            dungeon_state.levels[1] = self.generator.generate_level(1, dungeon_id)
+        first_level = dungeon_state.levels[1]
         
         # プレイヤー位置を設定
         if first_level.start_position:
@@ -174,6 +189,7 @@ class DungeonManager:
         # 開始位置を発見済みにする
         if first_level.start_position:
             dungeon_state.discovered_cells[1] = [first_level.start_position]
+            first_level.get_cell(*first_level.start_position).discovered = True
         
         self.active_dungeons[dungeon_id] = dungeon_state
         logger.info(f"ダンジョン{dungeon_id}を作成しました")
@@ -261,7 +277,8 @@ class DungeonManager:
         
         # 現在のセルから移動可能かチェック
         current_cell = current_level.get_cell(pos.x, pos.y)
-        if not current_cell or current_cell.walls.get(direction, True):
+        if not current_cell or (current_cell.walls.get(direction, True)
+                                and not current_level.has_secret_passage((pos.x, pos.y), (new_x, new_y))):
             return False, "壁があり移動できません"
         
         # 移動先セルが歩行可能かチェック
@@ -280,8 +297,11 @@ class DungeonManager:
         if (new_x, new_y) not in self.current_dungeon.discovered_cells[pos.level]:
             self.current_dungeon.discovered_cells[pos.level].append((new_x, new_y))
             target_cell.discovered = True
+            current_level.mark_cell_changed(new_x, new_y)
         
-        target_cell.visited = True
+        if not target_cell.visited:
+            target_cell.visited = True
+            current_level.mark_cell_changed(new_x, new_y)
         
         logger.debug(f"プレイヤーが移動: ({pos.x}, {pos.y}) レベル{pos.level}")
         return True, f"移動しました"
@@ -407,19 +427,9 @@ class DungeonManager:
         if not current_level:
             return []
         
-        visible_cells = []
-        
-        # 視界範囲内のセルを取得
-        for dx in range(-vision_range, vision_range + 1):
-            for dy in range(-vision_range, vision_range + 1):
-                x, y = pos.x + dx, pos.y + dy
-                
-                if 0 <= x < current_level.width and 0 <= y < current_level.height:
-                    cell = current_level.get_cell(x, y)
-                    if cell:
-                        visible_cells.append((x, y, cell))
-        
-        return visible_cells
+        # 壁に遮られないセルのみ（背後は除く）
+        visible_positions = current_level.get_visible_positions(pos.x, pos.y, vision_range, pos.facing)
+        return [(x, y, current_level.cells[(x, y)]) for x, y in sorted(visible_positions)]
     
     def save_dungeon(self, dungeon_id: str) -> bool:
         """ダンジョン状態を保存"""
@@ -436,7 +446,7 @@ class DungeonManager:
             
             logger.info(f"ダンジョン{dungeon_id}を保存しました: {save_path}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"ダンジョン保存に失敗: {e}")
             return False
@@ -467,7 +477,7 @@ class DungeonManager:
             
             logger.info(f"ダンジョン{dungeon_id}を読み込みました")
             return dungeon_state
-            
+        
         except Exception as e:
             logger.error(f"ダンジョン読み込みに失敗: {e}")
             return None
@@ -613,6 +623,7 @@ class DungeonManager:
                 logger.info(f"{detector.name}がトラップを解除しました")
                 cell.has_trap = False
                 cell.trap_type = None
+                self._update_cell_features(cell)
                 return {
                     "type": "trap", 
                     "success": True, 
@@ -670,9 +681,17 @@ class DungeonManager:
             cell.treasure_id = None
             if hasattr(cell, 'treasure_type'):
                 delattr(cell, 'treasure_type')
+            self._update_cell_features(cell)
         
         return treasure_result
     
+    def _update_cell_features(self, cell: DungeonCell):
+        """現在の階層の特徴索引とオートマップの版にセルの変化を反映"""
+        current_level = self.current_dungeon.levels.get(self.current_dungeon.player_position.level)
+        if current_level:
+            current_level.update_cell_features(cell.x, cell.y)
+            current_level.mark_cell_changed(cell.x, cell.y)
+    
     def _handle_boss_interaction(self, cell: DungeonCell, party: Party) -> Dict[str, Any]:
         """ボス戦とのインタラクション"""
         dungeon_level = self.current_dungeon.player_position.level
@@ -805,8 +824,8 @@ class DungeonManager:
                     logger.info(f"特別アイテム「{item_name}」を獲得しました")
         
         return result
-
-
+    
+    
     def cleanup(self):
         """リソースのクリーンアップ"""
         try:
@@ -0,0 +1,75 @@
+"""視界計算（再帰シャドウキャスティング）
+
+プレイヤー位置から8つの八分円ごとに光線の範囲（傾きの区間）を追跡し、
+不透明なセルが作る影の中にあるセルを除外する。視界範囲内の各セルは高々1回しか調べない。
+範囲は従来の視界と同じ正方形（チェビシェフ距離）とする。
+"""
+
+from typing import Callable, FrozenSet, Set, Tuple
+
+Position = Tuple[int, int]
+
+# 八分円ごとの座標変換 (xx, xy, yx, yy)
+OCTANT_TRANSFORMS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)
+)
+
+
+def compute_field_of_view(origin: Position, radius: int,
+                          in_bounds: Callable[[int, int], bool],
+                          is_opaque: Callable[[int, int], bool]) -> FrozenSet[Position]:
+    """視界内のセル座標を計算
+    
+    Args:
+        origin: 視点の座標
+        radius: 視界範囲（チェビシェフ距離）
+        in_bounds: 座標がマップ内か
+        is_opaque: 視線を遮るセルか（遮るセル自体は見える）
+    """
+    visible: Set[Position] = {tuple(origin)}
+    for transform in OCTANT_TRANSFORMS:
+        _cast_light(origin, 1, 1.0, 0.0, radius, transform, in_bounds, is_opaque, visible)
+    return frozenset(visible)
+
+
+def _cast_light(origin: Position, row: int, start_slope: float, end_slope: float, radius: int,
+                transform: Tuple[int, int, int, int], in_bounds: Callable[[int, int], bool],
+                is_opaque: Callable[[int, int], bool], visible: Set[Position]):
+    """1つの八分円で row 行目以降の [end_slope, start_slope] の範囲を照らす"""
+    if start_slope < end_slope:
+        return
+    
+    ox, oy = origin
+    xx, xy, yx, yy = transform
+    for distance in range(row, radius + 1):
+        blocked = False
+        next_start_slope = start_slope
+        for dx in range(-distance, 1):
+            dy = -distance
+            left_slope = (dx - 0.5) / (dy + 0.5)
+            right_slope = (dx + 0.5) / (dy - 0.5)
+            if start_slope < right_slope:
+                continue
+            if end_slope > left_slope:
+                break
+            
+            x, y = ox + dx * xx + dy * xy, oy + dx * yx + dy * yy
+            opaque = not in_bounds(x, y) or is_opaque(x, y)
+            if in_bounds(x, y):
+                visible.add((x, y))
+            
+            if blocked:
+                if opaque:
+                    next_start_slope = right_slope
+                    continue
+                blocked = False
+                start_slope = next_start_slope
+            elif opaque and distance < radius:
+                # 影の始まり：手前の開いた区間を次の行から再帰的に照らす
+                blocked = True
+                _cast_light(origin, distance + 1, start_slope, left_slope, radius,
+                            transform, in_bounds, is_opaque, visible)
+                next_start_slope = right_slope
+        if blocked:
+            break
@@ -0,0 +1,216 @@
+"""ダンジョン全階層の事前生成
+
+各階層は (シード, 階層, ダンジョンID) だけで決まり互いに独立しているため、
+ProcessPoolExecutor で並列に生成できる。結果は逐次生成と同一で、
+生成済みの全階層をファイルに保存して次回以降のセッションで再利用する。
+
+コマンドラインからも実行できる:
+    python -m src.dungeon.pregeneration beginners_cave --workers 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import time
+
+from .dungeon_generator import DungeonGenerator, DungeonLevel
+from src.utils.logger import logger
+from src.utils.union_find import UnionFind
+
+# 事前生成データの保存先
+DEFAULT_PREGENERATION_DIR = "saves/dungeons/pregenerated"
+# 保存形式の版（形式を変えたら上げて古いデータを無効にする）
+PREGENERATION_FORMAT_VERSION = 1
+# 生成結果を左右するクラス（定義元モジュールのソースが変われば保存データを使わない）
+GENERATOR_CLASSES = (DungeonGenerator, UnionFind)
+# ワーカープロセスの開始方式（スレッドを持つゲームプロセスから fork するとデッドロックし得る）
+WORKER_START_METHOD = "spawn"
+
+
+@dataclass
+class PregenerationResult:
+    """事前生成の結果"""
+    dungeon_id: str
+    seed: str
+    levels: Dict[int, DungeonLevel] = field(default_factory=dict)
+    floor_timings: Dict[int, float] = field(default_factory=dict)  # 階層 -> 生成時間（秒）
+    total_time: float = 0.0                                      # 全体の所要時間（秒）
+    from_cache: bool = False                                     # 保存データから読み込んだか
+    
+    def format_timings(self) -> List[str]:
+        """階層ごとの生成時間の表示用文字列"""
+        source = "キャッシュ" if self.from_cache else "生成"
+        lines = [f"レベル{level:>3}: {seconds * 1000:8.1f} ms" for level, seconds in sorted(self.floor_timings.items())]
+        lines.append(f"合計({source}): {self.total_time * 1000:.1f} ms / {len(self.levels)}階層")
+        return lines
+
+
+def _generate_floor(seed: str, level: int, dungeon_id: str) -> Tuple[int, Dict[str, Any], float]:
+    """1階層を生成（ワーカープロセスで実行するためモジュールの関数にする）"""
+    started = time.perf_counter()
+    generator = DungeonGenerator(seed)
+    dungeon_level = generator.generate_level(level, dungeon_id)
+    return level, dungeon_level.to_dict(), time.perf_counter() - started
+
+
+@lru_cache(maxsize=None)
+def get_generator_fingerprint() -> str:
+    """生成器のソースのハッシュ（生成アルゴリズムの変更を検出する）"""
+    digest = hashlib.md5()
+    for generator_class in GENERATOR_CLASSES:
+        with open(inspect.getfile(generator_class), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def get_pregeneration_path(dungeon_id: str, seed: str, cache_dir: str = DEFAULT_PREGENERATION_DIR) -> str:
+    """事前生成データのファイルパス"""
+    seed_hash = hashlib.md5(seed.encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{dungeon_id}_{seed_hash}.json")
+
+
+def _load_artifact(path: str, dungeon_id: str, seed: str, floors: int) -> Optional[PregenerationResult]:
+    """保存データを読み込み（条件が一致しなければNone）"""
+    if not os.path.exists(path):
+        return None
+    
+    started = time.perf_counter()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"事前生成データの読み込みに失敗: {path}: {e}")
+        return None
+    
+    if (data.get('format_version') != PREGENERATION_FORMAT_VERSION
+            or data.get('generator_fingerprint') != get_generator_fingerprint()
+            or data.get('dungeon_id') != dungeon_id or data.get('seed') != seed or data.get('floors') != floors):
+        return None
+    
+    levels = {int(level): DungeonLevel.from_dict(level_data) for level, level_data in data['levels'].items()}
+    return PregenerationResult(
+        dungeon_id=dungeon_id,
+        seed=seed,
+        levels=levels,
+        floor_timings={int(level): seconds for level, seconds in data.get('floor_timings', {}).items()},
+        total_time=time.perf_counter() - started,
+        from_cache=True
+    )
+
+
+def _save_artifact(path: str, result: PregenerationResult, level_data: Dict[int, Dict[str, Any]]):
+    """生成結果を保存（書き込み途中のファイルを残さないよう一時ファイルから置き換える）"""
+    data = {
+        'format_version': PREGENERATION_FORMAT_VERSION,
+        'generator_fingerprint': get_generator_fingerprint(),
+        'dungeon_id': result.dungeon_id,
+        'seed': result.seed,
+        'floors': len(level_data),
+        'floor_timings': {str(level): seconds for level, seconds in result.floor_timings.items()},
+        'levels': {str(level): data for level, data in sorted(level_data.items())}
+    }
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"事前生成データの保存に失敗: {path}: {e}")
+
+
+def pregenerate_dungeon(dungeon_id: str, seed: str, floors: Optional[int] = None,
+                        max_workers: Optional[int] = None, parallel: bool = True,
+                        cache_dir: Optional[str] = DEFAULT_PREGENERATION_DIR) -> PregenerationResult:
+    """ダンジョンの全階層を生成
+    
+    Args:
+        dungeon_id: ダンジョンID（階層数の既定値とボス配置に使用）
+        seed: ダンジョンのシード
+        floors: 階層数（省略時は config/dungeons.yaml の floors）
+        max_workers: ワーカープロセス数（省略時はCPU数）
+        parallel: Falseなら逐次生成する
+        cache_dir: 保存先ディレクトリ（Noneなら保存・再利用しない）
+    """
+    if floors is None:
+        floors = DungeonGenerator(seed)._get_max_floors_for_dungeon(dungeon_id)
+    
+    path = get_pregeneration_path(dungeon_id, seed, cache_dir) if cache_dir else None
+    if path:
+        cached = _load_artifact(path, dungeon_id, seed, floors)
+        if cached:
+            logger.info(f"ダンジョン{dungeon_id}の事前生成データを再利用: {path}")
+            return cached
+    
+    started = time.perf_counter()
+    levels = range(1, floors + 1)
+    generated: List[Tuple[int, Dict[str, Any], float]] = []
+    if parallel and floors > 1:
+        try:
+            context = multiprocessing.get_context(WORKER_START_METHOD)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                generated = list(executor.map(_generate_floor, [seed] * floors, levels, [dungeon_id] * floors))
+        except (OSError, RuntimeError) as e:
+            # プロセスを作れない環境では逐次生成にフォールバック
+            logger.warning(f"並列生成に失敗したため逐次生成します: {e}")
+            generated = []
+    if not generated:
+        generated = [_generate_floor(seed, level, dungeon_id) for level in levels]
+    
+    level_data = {level: data for level, data, _ in generated}
+    result = PregenerationResult(
+        dungeon_id=dungeon_id,
+        seed=seed,
+        levels={level: DungeonLevel.from_dict(data) for level, data in level_data.items()},
+        floor_timings={level: seconds for level, _, seconds in generated},
+        total_time=time.perf_counter() - started
+    )
+    if path:
+        _save_artifact(path, result, level_data)
+    
+    logger.info(f"ダンジョン{dungeon_id}の全{floors}階層を事前生成: {result.total_time * 1000:.1f} ms")
+    return result
+
+
+def get_default_seed(dungeon_id: str) -> str:
+    """設定ファイルの seed_base からゲームと同じ規則でシードを決定"""
+    try:
+        import yaml
+        with open("config/dungeons.yaml", 'r', encoding='utf-8') as f:
+            dungeons_config = yaml.safe_load(f)
+        dungeon_info = dungeons_config.get("dungeons", {}).get(dungeon_id, {})
+        return f"{dungeon_info.get('seed_base', dungeon_id)}_seed"
+    except Exception:
+        return f"{dungeon_id}_default_seed"
+
+
+def main():
+    """コマンドライン実行"""
+    parser = argparse.ArgumentParser(description="ダンジョン全階層の事前生成")
+    parser.add_argument("dungeon_id", help="ダンジョンID（config/dungeons.yaml）")
+    parser.add_argument("--seed", help="シード（省略時は seed_base から決定）")
+    parser.add_argument("--floors", type=int, help="階層数（省略時は設定ファイルの floors）")
+    parser.add_argument("--workers", type=int, help="ワーカープロセス数")
+    parser.add_argument("--sequential", action="store_true", help="逐次生成する")
+    parser.add_argument("--cache-dir", default=DEFAULT_PREGENERATION_DIR, help="保存先ディレクトリ")
+    parser.add_argument("--no-cache", action="store_true", help="保存データを使わずに生成する")
+    args = parser.parse_args()
+    
+    seed = args.seed or get_default_seed(args.dungeon_id)
+    result = pregenerate_dungeon(
+        args.dungeon_id, seed, floors=args.floors, max_workers=args.workers,
+        parallel=not args.sequential, cache_dir=None if args.no_cache else args.cache_dir
+    )
+    for line in result.format_timings():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
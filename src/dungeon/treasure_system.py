@@ -6,9 +6,19 @@ from dataclasses import dataclass
 import random
 
 from src.character.party import Party
-from src.items.item import Item, ItemType, ItemRarity
+from src.items.item import Item, ItemManager, ItemRarity
+from src.items.item import item_manager as default_item_manager
+from src.utils.alias_table import AliasTable
 from src.utils.logger import logger
 
+# 戦利品テーブル関連定数
+LOOT_LEVEL_BAND_SIZE = 4            # 何階層ごとに戦利品テーブルを分けるか
+MAX_LOOT_LEVEL_BAND = 4             # 最深の階層帯（17階以降）
+LOOT_LEVEL_RARITY_BONUS = 0.25      # 階層帯・希少度の段階ごとの重み増加率
+# 希少度が未定義のアイテムは価格帯（ItemManager.get_price_band）から希少度を決める
+PRICE_BAND_RARITIES = (ItemRarity.COMMON, ItemRarity.UNCOMMON, ItemRarity.RARE, ItemRarity.EPIC)
+RARITY_ORDER = (ItemRarity.COMMON, ItemRarity.UNCOMMON, ItemRarity.RARE, ItemRarity.EPIC, ItemRarity.LEGENDARY)
+
 
 class TreasureType(Enum):
     """宝箱タイプ"""
@@ -43,12 +53,30 @@ class TreasureData:
             }
 
 
+@dataclass(frozen=True)
+class LootDrop:
+    """戦利品の抽選結果（カタログのアイテムIDと希少度）"""
+    item_id: str
+    rarity: ItemRarity
+
+
+def get_loot_level_band(dungeon_level: int) -> int:
+    """ダンジョンレベルから戦利品テーブルの階層帯を取得"""
+    return min(MAX_LOOT_LEVEL_BAND, max(0, dungeon_level - 1) // LOOT_LEVEL_BAND_SIZE)
+
+
 class TreasureSystem:
     """宝箱システム管理"""
     
-    def __init__(self):
+    def __init__(self, item_manager: Optional[ItemManager] = None):
+        self.item_manager = item_manager or default_item_manager
         self.treasure_definitions = self._initialize_treasure_definitions()
         self.opened_treasures: Dict[str, bool] = {}  # 開封済み宝箱の記録
+        
+        # (階層帯, 宝箱タイプ) -> 戦利品テーブル（アイテム定義から構築）
+        # ボスやモンスターのドロップも宝箱タイプを指定して共有できる
+        self.loot_tables: Dict[Tuple[int, TreasureType], AliasTable] = {}
+        self._loot_tables_version: Optional[int] = None
         logger.info("TreasureSystem初期化完了")
     
     def _initialize_treasure_definitions(self) -> Dict[TreasureType, TreasureData]:
@@ -130,7 +158,7 @@ class TreasureSystem:
             )
         }
     
-    def generate_treasure_type(self, dungeon_level: int) -> TreasureType:
+    def generate_treasure_type(self, dungeon_level: int, rng: Optional[random.Random] = None) -> TreasureType:
         """ダンジョンレベルに応じた宝箱タイプを生成"""
         if dungeon_level <= 3:
             # 浅い階層: 木製が多い
@@ -169,11 +197,13 @@ class TreasureSystem:
         # 重み付きランダム選択
         treasure_types = list(weights.keys())
         weights_list = list(weights.values())
-        return random.choices(treasure_types, weights=weights_list)[0]
+        return (rng or random).choices(treasure_types, weights=weights_list)[0]
     
     def open_treasure(self, treasure_id: str, treasure_type: TreasureType, party: Party, 
-                     dungeon_level: int = 1, opener_character = None) -> Dict[str, Any]:
-        """宝箱を開封"""
+                     dungeon_level: int = 1, opener_character = None,
+                     rng: Optional[random.Random] = None) -> Dict[str, Any]:
+        """宝箱を開封（rng 未指定時は random モジュールを使用）"""
+        rng = rng or random
         # 既に開封済みかチェック
         if self.opened_treasures.get(treasure_id, False):
             return {
@@ -196,12 +226,13 @@ class TreasureSystem:
             "contents": [],
             "gold": 0,
             "items": [],
+            "loot": [],
             "mimic": False,
             "trapped": False
         }
         
         # ミミック判定
-        if random.random() < treasure_data.mimic_chance:
+        if rng.random() < treasure_data.mimic_chance:
             result["mimic"] = True
             result["message"] = "宝箱だと思ったらミミックだった！"
             result["success"] = False
@@ -209,20 +240,20 @@ class TreasureSystem:
         
         # 鍵開け判定
         if treasure_data.lock_difficulty > 0:
-            lock_success = self._attempt_lock_picking(treasure_data.lock_difficulty, opener_character)
+            lock_success = self._attempt_lock_picking(treasure_data.lock_difficulty, opener_character, rng)
             if not lock_success:
                 result["success"] = False
                 result["message"] = f"{treasure_data.name}の鍵を開けられなかった"
                 return result
         
         # トラップ判定
-        if random.random() < treasure_data.trap_chance:
+        if rng.random() < treasure_data.trap_chance:
             result["trapped"] = True
-            trap_result = self._trigger_treasure_trap(party, dungeon_level)
+            trap_result = self._trigger_treasure_trap(party, dungeon_level, rng)
             result["message"] += f"\n{trap_result}"
         
         # 内容物生成
-        contents = self._generate_treasure_contents(treasure_data, dungeon_level)
+        contents = self._generate_treasure_contents(treasure_data, dungeon_level, rng)
         
         # 金貨
         if contents["gold"] > 0:
@@ -231,11 +262,15 @@ class TreasureSystem:
             result["contents"].append(f"金貨 {contents['gold']} を獲得")
         
         # アイテム
-        for item in contents["items"]:
+        for drop in contents["loot"]:
+            item = self.item_manager.get_item(drop.item_id)
+            if not item:
+                continue
             # パーティの共有インベントリに追加
             if hasattr(party, 'shared_inventory'):
                 party.shared_inventory.add_item(item)
             result["items"].append(item)
+            result["loot"].append(drop)
             result["contents"].append(f"アイテム「{item.get_name()}」を獲得")
         
         # 開封済みマーク
@@ -243,7 +278,8 @@ class TreasureSystem:
         
         return result
     
-    def _attempt_lock_picking(self, lock_difficulty: int, opener_character = None) -> bool:
+    def _attempt_lock_picking(self, lock_difficulty: int, opener_character = None,
+                              rng: Optional[random.Random] = None) -> bool:
         """鍵開け試行"""
         base_success = max(0.1, 1.0 - (lock_difficulty / 100.0))
         
@@ -265,47 +301,50 @@ class TreasureSystem:
                 level_bonus = opener_character.experience.level * 0.01
                 base_success += level_bonus
         
-        return random.random() < min(0.95, max(0.05, base_success))
+        return (rng or random).random() < min(0.95, max(0.05, base_success))
     
-    def _trigger_treasure_trap(self, party: Party, dungeon_level: int) -> str:
+    def _trigger_treasure_trap(self, party: Party, dungeon_level: int, rng: Optional[random.Random] = None) -> str:
         """宝箱のトラップ発動"""
+        rng = rng or random
         # 簡易的なトラップ処理
         trap_types = ["needle", "gas", "explosion", "curse"]
-        trap_type = random.choice(trap_types)
+        trap_type = rng.choice(trap_types)
         
         living_members = party.get_living_characters()
         if not living_members:
             return "トラップが発動したが対象がいない"
         
-        target = random.choice(living_members)
+        target = rng.choice(living_members)
         
         if trap_type == "needle":
-            damage = random.randint(3, 8) + dungeon_level
+            damage = rng.randint(3, 8) + dungeon_level
             target.take_damage(damage)
             return f"毒針が飛び出し、{target.name}が{damage}ダメージを受けた！"
-            
+        
         elif trap_type == "gas":
-            damage = random.randint(1, 4) + dungeon_level // 2
+            damage = rng.randint(1, 4) + dungeon_level // 2
             target.take_damage(damage)
             target.add_status_effect("poison")
             return f"毒ガスが噴出し、{target.name}が{damage}ダメージを受け毒状態になった！"
-            
+        
         elif trap_type == "explosion":
-            damage = random.randint(5, 12) + dungeon_level
+            damage = rng.randint(5, 12) + dungeon_level
             # 全員にダメージ
             for member in living_members:
                 member.take_damage(damage // 2)
             return f"爆発が起こり、パーティ全員が{damage // 2}ダメージを受けた！"
-            
+        
         elif trap_type == "curse":
             target.add_status_effect("stat_drain_all")
             return f"呪いがかかり、{target.name}の全能力値が一時的に減少した！"
         
         return "不明なトラップが発動した"
     
-    def _generate_treasure_contents(self, treasure_data: TreasureData, dungeon_level: int) -> Dict[str, Any]:
+    def _generate_treasure_contents(self, treasure_data: TreasureData, dungeon_level: int,
+                                    rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """宝箱の内容物を生成"""
-        contents = {"gold": 0, "items": []}
+        rng = rng or random
+        contents = {"gold": 0, "loot": []}
         
         # 金貨生成
         if treasure_data.gold_range[1] > 0:
@@ -313,97 +352,75 @@ class TreasureSystem:
             level_modifier = 1 + (dungeon_level - 1) * 0.2
             min_gold = int(min_gold * level_modifier)
             max_gold = int(max_gold * level_modifier)
-            contents["gold"] = random.randint(min_gold, max_gold)
+            contents["gold"] = rng.randint(min_gold, max_gold)
         
         # アイテム生成
         min_items, max_items = treasure_data.item_count_range
-        item_count = random.randint(min_items, max_items)
+        item_count = rng.randint(min_items, max_items)
         
         for _ in range(item_count):
-            item = self._generate_random_item(treasure_data.rarity_weights, dungeon_level)
-            if item:
-                contents["items"].append(item)
+            drop = self.roll_loot(dungeon_level, treasure_data.treasure_type, rng)
+            if drop:
+                contents["loot"].append(drop)
         
         return contents
     
-    def _generate_random_item(self, rarity_weights: Dict[ItemRarity, float], dungeon_level: int) -> Optional[Item]:
-        """ランダムアイテムを生成"""
-        # レアリティ決定
-        rarities = list(rarity_weights.keys())
-        weights = list(rarity_weights.values())
-        rarity = random.choices(rarities, weights=weights)[0]
-        
-        # アイテムタイプ決定
-        item_types = [ItemType.WEAPON, ItemType.ARMOR, ItemType.CONSUMABLE, ItemType.TREASURE]
-        item_type = random.choice(item_types)
-        
-        # 基本アイテム生成（簡略版）
-        item_names = {
-            ItemType.WEAPON: {
-                ItemRarity.COMMON: ["鉄の剣", "木の杖", "短剣"],
-                ItemRarity.UNCOMMON: ["鋼の剣", "魔法の杖", "エルフの短剣"],
-                ItemRarity.RARE: ["ミスリルの剣", "賢者の杖", "影の短剣"],
-                ItemRarity.EPIC: ["ドラゴンスレイヤー", "大魔法使いの杖", "暗殺者の短剣"],
-                ItemRarity.LEGENDARY: ["エクスカリバー", "創世の杖", "神速の短剣"]
-            },
-            ItemType.ARMOR: {
-                ItemRarity.COMMON: ["革の鎧", "布の服", "鉄の兜"],
-                ItemRarity.UNCOMMON: ["鎖かたびら", "法衣", "鋼の兜"],
-                ItemRarity.RARE: ["プレートメイル", "魔法のローブ", "ミスリルの兜"],
-                ItemRarity.EPIC: ["ドラゴンメイル", "大賢者のローブ", "王者の兜"],
-                ItemRarity.LEGENDARY: ["神聖な鎧", "時の織り手のローブ", "不滅の兜"]
-            },
-            ItemType.CONSUMABLE: {
-                ItemRarity.COMMON: ["回復ポーション", "MPポーション", "解毒剤"],
-                ItemRarity.UNCOMMON: ["中回復ポーション", "中MPポーション", "万能薬"],
-                ItemRarity.RARE: ["大回復ポーション", "賢者の薬", "蘇生の薬"],
-                ItemRarity.EPIC: ["完全回復薬", "魔力回復薬", "不死の薬"],
-                ItemRarity.LEGENDARY: ["神の恵み", "永遠の命薬", "全能の薬"]
-            },
-            ItemType.TREASURE: {
-                ItemRarity.COMMON: ["銅貨", "ガラス玉", "古い本"],
-                ItemRarity.UNCOMMON: ["銀貨", "綺麗な石", "魔法の本"],
-                ItemRarity.RARE: ["金貨", "宝石", "古代の巻物"],
-                ItemRarity.EPIC: ["プラチナ貨", "魔法の宝石", "失われた知識"],
-                ItemRarity.LEGENDARY: ["ダイヤモンド", "伝説の宝石", "神の知識"]
-            }
-        }
-        
-        if item_type not in item_names or rarity not in item_names[item_type]:
+    def roll_loot(self, dungeon_level: int, treasure_type: TreasureType,
+                  rng: Optional[random.Random] = None) -> Optional[LootDrop]:
+        """戦利品テーブルから1件抽選（該当アイテムがなければNone）"""
+        table = self.get_loot_table(dungeon_level, treasure_type)
+        if table is None:
             return None
+        return table.sample(rng or random)
+    
+    def get_loot_table(self, dungeon_level: int, treasure_type: TreasureType) -> Optional[AliasTable]:
+        """階層帯と宝箱タイプの戦利品テーブルを取得（アイテム定義の再読み込み時は再構築）"""
+        if self._loot_tables_version != self.item_manager.items_version:
+            self.rebuild_loot_tables()
+        return self.loot_tables.get((get_loot_level_band(dungeon_level), treasure_type))
+    
+    def rebuild_loot_tables(self):
+        """アイテム定義と宝箱定義から戦利品テーブルを構築
         
-        names = item_names[item_type][rarity]
-        item_name = random.choice(names)
-        
-        # 基本的なアイテム作成
-        item_id = f"treasure_{item_name.replace(' ', '_').lower()}_{random.randint(1000, 9999)}"
-        item_data = {
-            'names': {'ja': item_name},
-            'descriptions': {'ja': f"宝箱から見つかった{item_name}"},
-            'type': item_type.value,
-            'rarity': rarity.value,
-            'price': self._calculate_item_value(rarity, dungeon_level),
-            'weight': 1
-        }
+        希少度ごとの重み（宝箱タイプの rarity_weights を階層帯に応じて上位の希少度ほど増やしたもの）を
+        その希少度のアイテムに均等に配分する。該当アイテムのない希少度は除き、残りで正規化される。
+        """
+        items_by_rarity: Dict[ItemRarity, List[LootDrop]] = {}
+        for item in self.item_manager.get_all_items():
+            rarity = self.get_loot_rarity(item)
+            items_by_rarity.setdefault(rarity, []).append(LootDrop(item.item_id, rarity))
         
-        item = Item(item_id, item_data)
+        self.loot_tables = {}
+        for band in range(MAX_LOOT_LEVEL_BAND + 1):
+            for treasure_type, treasure_data in self.treasure_definitions.items():
+                drops: List[LootDrop] = []
+                weights: List[float] = []
+                for rarity, rarity_weight in self.get_loot_rarity_weights(treasure_data, band).items():
+                    candidates = items_by_rarity.get(rarity, [])
+                    for drop in candidates:
+                        drops.append(drop)
+                        weights.append(rarity_weight / len(candidates))
+                if drops and sum(weights) > 0:
+                    self.loot_tables[(band, treasure_type)] = AliasTable(drops, weights)
         
-        return item
+        self._loot_tables_version = self.item_manager.items_version
+        logger.debug(f"戦利品テーブルを構築しました: {len(self.loot_tables)}件")
+    
+    def get_loot_rarity(self, item: Item) -> ItemRarity:
+        """戦利品としての希少度（定義がなければ価格帯から決める）"""
+        if 'rarity' in item.item_data:
+            return item.rarity
+        band = self.item_manager.get_price_band(item.price)
+        return PRICE_BAND_RARITIES[min(band, len(PRICE_BAND_RARITIES) - 1)]
     
-    def _calculate_item_value(self, rarity: ItemRarity, dungeon_level: int) -> int:
-        """アイテム価値の計算"""
-        base_values = {
-            ItemRarity.COMMON: 10,
-            ItemRarity.UNCOMMON: 50,
-            ItemRarity.RARE: 200,
-            ItemRarity.EPIC: 1000,
-            ItemRarity.LEGENDARY: 5000
+    @staticmethod
+    def get_loot_rarity_weights(treasure_data: TreasureData, band: int) -> Dict[ItemRarity, float]:
+        """階層帯を考慮した希少度ごとの重み"""
+        return {
+            rarity: weight * (1 + LOOT_LEVEL_RARITY_BONUS * band * RARITY_ORDER.index(rarity))
+            for rarity, weight in treasure_data.rarity_weights.items()
+            if weight > 0
         }
-        
-        base_value = base_values.get(rarity, 10)
-        level_modifier = 1 + (dungeon_level - 1) * 0.1
-        
-        return int(base_value * level_modifier)
     
     def is_treasure_opened(self, treasure_id: str) -> bool:
         """宝箱が開封済みかチェック"""
@@ -5,8 +5,15 @@ from enum import Enum
 from dataclasses import dataclass
 import time
 
+from src.dungeon.dungeon_generator import CellFeature, DungeonLevel
 from src.utils.logger import logger
 
+# ミニマップに表示する特徴（トラップは隠し要素のため表示しない）
+MINIMAP_FEATURES = [
+    CellFeature.STAIRS_UP, CellFeature.STAIRS_DOWN, CellFeature.TREASURE,
+    CellFeature.BOSS, CellFeature.SPECIAL, CellFeature.SECRET_PASSAGE
+]
+
 
 class NotificationType(Enum):
     """通知タイプ"""
@@ -125,17 +132,17 @@ class DungeonUIEnhancer:
             monster_name = details.get("monster_name", "モンスター")
             message = f"⚔️ {monster_name}との戦闘開始！"
             self.add_notification(message, NotificationType.COMBAT, 3.0)
-            
+        
         elif event_type == "combat_victory":
             exp_gained = details.get("experience", 0)
             gold_gained = details.get("gold", 0)
             message = f"🎉 勝利！ 経験値+{exp_gained}, 金貨+{gold_gained}"
             self.add_notification(message, NotificationType.SUCCESS, 5.0)
-            
+        
         elif event_type == "combat_defeat":
             message = "💀 敗北... パーティが全滅しました"
             self.add_notification(message, NotificationType.DANGER, 6.0)
-            
+        
         elif event_type == "level_up":
             character_name = details.get("character_name", "キャラクター")
             new_level = details.get("new_level", 1)
@@ -156,16 +163,16 @@ class DungeonUIEnhancer:
             hp_percent = int((current_hp / max_hp) * 100)
             message = f"❤️ {character_name}のHPが低下（{hp_percent}%）"
             self.add_notification(message, NotificationType.WARNING, 4.0)
-            
+        
         elif alert_type == "status_effect":
             effect = details.get("effect", "状態異常")
             message = f"🔮 {character_name}が{effect}状態になりました"
             self.add_notification(message, NotificationType.INFO, 3.0)
-            
+        
         elif alert_type == "character_death":
             message = f"💀 {character_name}が倒れました！"
             self.add_notification(message, NotificationType.DANGER, 6.0)
-            
+        
         elif alert_type == "character_revived":
             message = f"✨ {character_name}が蘇生されました"
             self.add_notification(message, NotificationType.SUCCESS, 4.0)
@@ -179,17 +186,17 @@ class DungeonUIEnhancer:
         if discovery_type == "secret_passage":
             message = "🔍 隠し通路を発見しました！"
             self.add_notification(message, NotificationType.SUCCESS, 5.0)
-            
+        
         elif discovery_type == "hidden_treasure":
             message = "💎 隠された宝物を発見しました！"
             self.add_notification(message, NotificationType.LOOT, 5.0)
-            
+        
         elif discovery_type == "floor_change":
             new_floor = details.get("floor", 1)
             direction = details.get("direction", "下")
             message = f"🏰 {direction}の階（{new_floor}階）へ移動しました"
             self.add_notification(message, NotificationType.INFO, 3.0)
-            
+        
         elif discovery_type == "boss_chamber":
             message = "👑 ボス部屋を発見しました！"
             self.add_notification(message, NotificationType.WARNING, 6.0)
@@ -234,17 +241,22 @@ class DungeonUIEnhancer:
         icon = damage_icons.get(damage_type, "💥")
         return f"{icon} {damage}"
     
-    def create_minimap_data(self, dungeon_data: Dict[str, Any]) -> Dict[str, Any]:
-        """ミニマップデータ作成"""
+    def create_minimap_data(self, dungeon_data: Dict[str, Any],
+                            dungeon_level: Optional[DungeonLevel] = None) -> Dict[str, Any]:
+        """ミニマップデータ作成（階層を渡すと特殊地点は階層の特徴索引から取得）"""
         if not self.ui_settings.get("show_minimap", True):
             return {}
         
+        special_locations = dungeon_data.get("special_locations")
+        if special_locations is None:
+            special_locations = dungeon_level.get_special_locations(MINIMAP_FEATURES) if dungeon_level else {}
+        
         return {
             "current_position": dungeon_data.get("player_position", (0, 0)),
             "visited_cells": dungeon_data.get("visited_cells", []),
             "known_walls": dungeon_data.get("known_walls", []),
             "known_doors": dungeon_data.get("known_doors", []),
-            "special_locations": dungeon_data.get("special_locations", {}),
+            "special_locations": special_locations,
             "floor_size": dungeon_data.get("floor_size", (10, 10))
         }
     
@@ -3,6 +3,8 @@
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
+import heapq
+import itertools
 import time
 
 from src.utils.logger import logger
@@ -42,14 +44,34 @@ class StatusEffectType(Enum):
 class StatusEffect(ABC):
     """ステータス効果の基底クラス"""
     
+    # ターン毎の処理（継続ダメージ・回復など）を持つ効果か
+    has_turn_effect = False
+    
     def __init__(self, effect_type: StatusEffectType, duration: int, 
                  strength: int = 1, source: str = "unknown"):
         self.effect_type = effect_type
+        # 管理クラスに登録中は終了ターンから残りターン数を求める
+        self._scheduler: Optional['StatusEffectManager'] = None
+        self._expires_at = 0
         self.duration = duration  # ターン数
         self.strength = strength  # 効果の強さ
         self.source = source      # 効果の発生源
         self.applied_time = time.time()
-        
+    
+    @property
+    def duration(self) -> int:
+        """残りターン数"""
+        if self._scheduler is not None:
+            return self._expires_at - self._scheduler.current_turn
+        return self._duration
+    
+    @duration.setter
+    def duration(self, value: int):
+        if self._scheduler is not None:
+            self._scheduler._schedule_expiry(self, value)
+        else:
+            self._duration = value
+    
     @abstractmethod
     def apply_effect(self, character) -> Dict[str, Any]:
         """効果を適用"""
@@ -107,6 +129,8 @@ class StatusEffect(ABC):
 class PoisonEffect(StatusEffect):
     """毒効果"""
     
+    has_turn_effect = True
+    
     def __init__(self, duration: int = DEFAULT_POISON_DURATION, strength: int = DEFAULT_EFFECT_STRENGTH, source: str = "poison"):
         super().__init__(StatusEffectType.POISON, duration, strength, source)
     
@@ -189,6 +213,8 @@ class SleepEffect(StatusEffect):
 class RegenEffect(StatusEffect):
     """再生効果"""
     
+    has_turn_effect = True
+    
     def __init__(self, duration: int = DEFAULT_REGEN_DURATION, strength: int = DEFAULT_EFFECT_STRENGTH, source: str = "regen"):
         super().__init__(StatusEffectType.REGEN, duration, strength, source)
     
@@ -273,12 +299,31 @@ class DefenseUpEffect(StatusEffect):
 
 
 class StatusEffectManager:
-    """ステータス効果管理クラス"""
+    """ステータス効果管理クラス
+    
+    効果は終了ターン順のヒープで管理し、ターン毎の処理を持つ効果（毒・再生）だけを
+    別に保持する。ターン処理のコストは全効果数ではなく、毎ターン処理する効果と
+    そのターンに終了する効果の数に比例する。
+    """
     
     def __init__(self, character_id: str):
         self.character_id = character_id
         self.active_effects: Dict[StatusEffectType, StatusEffect] = {}
         
+        # 効果の付与・除去のたびに進むバージョン（派生値キャッシュの無効化判定用）
+        self.version = 0
+        
+        # 経過ターン数（登録中の効果の残りターン数はこれを基準に求める）
+        self.current_turn = 0
+        # (終了ターン, 登録順, 効果) のヒープ。差し替え・除去済みの項目は取り出し時に読み捨てる
+        self._expiry_heap: List[Tuple[int, int, StatusEffect]] = []
+        self._expiry_counter = itertools.count()
+        # ターン毎の処理を持つ効果（付与順）
+        self._turn_effects: Dict[StatusEffectType, StatusEffect] = {}
+        # ステータス修正値の合計と、効果ごとの寄与分
+        self._stat_modifiers = self._create_default_modifiers()
+        self._effect_modifiers: Dict[StatusEffectType, Dict[str, int]] = {}
+    
     def add_effect(self, effect: StatusEffect, character=None) -> Tuple[bool, Dict[str, Any]]:
         """ステータス効果を追加"""
         if not character:
@@ -290,9 +335,14 @@ class StatusEffectManager:
         if not self._should_apply_effect(effect, effect_type):
             return False, {'message': f'より強い{effect_type.value}効果が既にかかっています'}
         
-        # 効果を適用
+        # 効果を適用（同種の既存効果は置き換える）
         result = effect.apply_effect(character)
+        existing = self.active_effects.get(effect_type)
+        if existing is not None:
+            self._unregister_effect(existing)
         self.active_effects[effect_type] = effect
+        self._register_effect(effect)
+        self.version += 1
         
         logger.info(f"ステータス効果追加: {self.character_id} - {effect_type.value}")
         return True, result
@@ -317,6 +367,8 @@ class StatusEffectManager:
         
         result = effect.remove_effect(character)
         del self.active_effects[effect_type]
+        self._unregister_effect(effect)
+        self.version += 1
         
         logger.info(f"ステータス効果除去: {self.character_id} - {effect_type.value}")
         return True, result
@@ -334,38 +386,73 @@ class StatusEffectManager:
         if not character:
             return []
         
+        # ターンを進めることで登録中の全効果の残りターン数が1減る
+        self.current_turn += 1
         results = []
-        effects_to_remove = []
         
-        # 各効果の処理
-        for effect_type, effect in self.active_effects.items():
-            result = self._process_single_effect(effect, character)
-            if result['result']:
-                results.append(result['result'])
-            
-            if not result['continues']:
-                remove_result = effect.remove_effect(character)
-                results.append(remove_result)
-                effects_to_remove.append(effect_type)
+        # 継続ダメージ・回復などターン毎の処理を持つ効果のみ処理
+        for effect in list(self._turn_effects.values()):
+            result = effect._process_turn_effect(character)
+            if result:
+                results.append(result)
         
-        # 終了した効果を除去
-        self._remove_expired_effects(effects_to_remove)
+        # このターンで終了する効果を除去
+        for effect in self._pop_expired_effects():
+            results.append(effect.remove_effect(character))
+            del self.active_effects[effect.effect_type]
+            self._unregister_effect(effect)
+            self.version += 1
+            logger.info(f"ステータス効果終了: {self.character_id} - {effect.effect_type.value}")
         
         return results
     
-    def _process_single_effect(self, effect: StatusEffect, character) -> Dict[str, Any]:
-        """単一効果の処理"""
-        continues, result = effect.tick(character)
-        return {
-            'continues': continues,
-            'result': result
-        }
+    def _pop_expired_effects(self) -> List[StatusEffect]:
+        """終了ターンに達した効果をヒープから取り出す"""
+        expired = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= self.current_turn:
+            expires_at, _, effect = heapq.heappop(heap)
+            # 除去・差し替え・残りターン変更で無効になった項目は読み捨てる
+            if effect._scheduler is not self or effect._expires_at != expires_at:
+                continue
+            expired.append(effect)
+        return expired
+    
+    def _register_effect(self, effect: StatusEffect):
+        """効果を終了ヒープ・ターン処理一覧・修正値合計に登録"""
+        duration = effect.duration
+        effect._scheduler = self
+        self._schedule_expiry(effect, duration)
+        
+        if effect.has_turn_effect:
+            self._turn_effects[effect.effect_type] = effect
+        
+        deltas = self._get_effect_modifiers(effect)
+        if deltas:
+            self._effect_modifiers[effect.effect_type] = deltas
+            for stat, value in deltas.items():
+                self._stat_modifiers[stat] += value
+    
+    def _unregister_effect(self, effect: StatusEffect):
+        """効果の登録を解除（残りターン数は効果側に固定して残す）"""
+        if effect._scheduler is not self:
+            return
+        duration = effect.duration
+        effect._scheduler = None
+        effect.duration = duration
+        
+        if self._turn_effects.get(effect.effect_type) is effect:
+            del self._turn_effects[effect.effect_type]
+        
+        deltas = self._effect_modifiers.pop(effect.effect_type, None)
+        if deltas:
+            for stat, value in deltas.items():
+                self._stat_modifiers[stat] -= value
     
-    def _remove_expired_effects(self, effects_to_remove: List[StatusEffectType]):
-        """期限切れ効果の除去"""
-        for effect_type in effects_to_remove:
-            del self.active_effects[effect_type]
-            logger.info(f"ステータス効果終了: {self.character_id} - {effect_type.value}")
+    def _schedule_expiry(self, effect: StatusEffect, duration: int):
+        """残りターン数から終了ターンを設定してヒープに積む"""
+        effect._expires_at = self.current_turn + duration
+        heapq.heappush(self._expiry_heap, (effect._expires_at, next(self._expiry_counter), effect))
     
     def cure_negative_effects(self, character=None) -> List[Dict[str, Any]]:
         """負の効果を全て治療"""
@@ -396,13 +483,8 @@ class StatusEffectManager:
         return [effect.get_description() for effect in self.active_effects.values()]
     
     def get_stat_modifiers(self) -> Dict[str, int]:
-        """ステータス修正値を取得"""
-        modifiers = self._create_default_modifiers()
-        
-        for effect in self.active_effects.values():
-            self._apply_effect_modifiers(effect, modifiers)
-        
-        return modifiers
+        """ステータス修正値を取得（付与・除去時に更新している合計のコピー）"""
+        return dict(self._stat_modifiers)
     
     def _create_default_modifiers(self) -> Dict[str, int]:
         """デフォルトのステータス修正値を作成"""
@@ -416,13 +498,13 @@ class StatusEffectManager:
             'defense': STAT_MODIFIER_INITIAL_VALUE
         }
     
-    def _apply_effect_modifiers(self, effect: StatusEffect, modifiers: Dict[str, int]):
-        """効果のステータス修正を適用"""
+    def _get_effect_modifiers(self, effect: StatusEffect) -> Dict[str, int]:
+        """効果によるステータス修正の寄与分を取得"""
         if effect.effect_type == StatusEffectType.STRENGTH_UP:
-            modifiers['strength'] += effect.strength
-            modifiers['attack'] += effect.strength
+            return {'strength': effect.strength, 'attack': effect.strength}
         elif effect.effect_type == StatusEffectType.DEFENSE_UP:
-            modifiers['defense'] += effect.strength
+            return {'defense': effect.strength}
+        return {}
     
     def can_act(self) -> Tuple[bool, str]:
         """行動可能かチェック"""
@@ -454,7 +536,9 @@ class StatusEffectManager:
             effect_type = StatusEffectType(effect_type_str)
             effect = StatusEffect.from_dict(effect_data)
             manager.active_effects[effect_type] = effect
+            manager._register_effect(effect)
         
+        manager.version += 1
         return manager
 
 
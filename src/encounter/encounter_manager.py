@@ -3,18 +3,20 @@
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum
+import bisect
 import random
-import hashlib
 
 from src.dungeon.dungeon_manager import DungeonState
 from src.dungeon.dungeon_generator import DungeonAttribute, DungeonLevel
 from src.character.party import Party
+from src.monsters.monster import MonsterManager, MonsterResistance, MonsterTemplate
+from src.monsters.monster import monster_manager as default_monster_manager
+from src.utils.alias_table import AliasTable
 from src.utils.logger import logger
 
 # エンカウンター定数
 MAX_DUNGEON_LEVEL = 20
-BASE_LEVELS_PER_TIER = 4
-MAX_TIER_LEVEL = 5
+UNKNOWN_MONSTER_ID = "unknown"
 ATTRIBUTE_ABILITY_CHANCE = 0.3
 AMBUSH_ABILITY_CHANCE = 0.5
 TREASURE_GUARDIAN_ABILITY_CHANCE = 0.7
@@ -34,6 +36,11 @@ MAX_FLEE_CHANCE = 0.95
 MIN_NEGOTIATION_CHANCE = 0.01
 MAX_NEGOTIATION_CHANCE = 0.8
 
+# 出現テーブル関連定数（モンスターのレベル - 階層 でランクを分類）
+WEAK_LEVEL_DIFF = -2                # これ以下は弱い
+STRONG_LEVEL_DIFF = 1               # これ以上は強い
+ELITE_LEVEL_DIFF = 3                # これ以上はエリート
+
 
 class EncounterType(Enum):
     """エンカウンタータイプ"""
@@ -63,6 +70,18 @@ class MonsterRank(Enum):
     BOSS = "boss"           # ボス
 
 
+# ダンジョン属性に耐性を持つモンスターほど出現しやすくする重み倍率
+ATTRIBUTE_AFFINITY_WEIGHTS = {
+    MonsterResistance.IMMUNE: 3.0,
+    MonsterResistance.RESISTANT: 2.0,
+    MonsterResistance.NORMAL: 1.0,
+    MonsterResistance.VULNERABLE: 0.5
+}
+
+# (階層, 属性, ランク) -> 出現テーブル。ランクNoneは全ランクをまとめたテーブル
+EncounterTableKey = Tuple[int, DungeonAttribute, Optional[MonsterRank]]
+
+
 @dataclass
 class MonsterGroup:
     """モンスターグループ"""
@@ -91,12 +110,18 @@ class EncounterEvent:
 class EncounterManager:
     """エンカウンター管理システム"""
     
-    def __init__(self):
+    def __init__(self, monster_manager: Optional[MonsterManager] = None):
         self.current_party: Optional[Party] = None
         self.current_dungeon: Optional[DungeonState] = None
         
-        # エンカウンターテーブル（属性別）
+        self.monster_manager = monster_manager or default_monster_manager
+        
+        # エンカウンターテーブル（属性 -> 階層 -> 出現候補のモンスターID）
         self.encounter_tables: Dict[DungeonAttribute, Dict[int, List[str]]] = {}
+        # 重み付き抽選用のエイリアステーブル（monsters.yamlから構築）
+        self._alias_tables: Dict[EncounterTableKey, AliasTable] = {}
+        self._tables_version: Optional[int] = None
+        self._encounter_rng = random.Random()
         self._initialize_encounter_tables()
         
         # エンカウンター統計
@@ -114,7 +139,7 @@ class EncounterManager:
         # 循環参照防止：既に同じパーティが設定されている場合はスキップ
         if self.current_party is party:
             return
-            
+        
         self.current_party = party
         if party is not None:
             logger.info(f"パーティ{party.name}を設定しました")
@@ -156,44 +181,103 @@ class EncounterManager:
         self.encounter_statistics['total_encounters'] += 1
     
     def _initialize_encounter_tables(self):
-        """エンカウンターテーブル初期化"""
-        # 各属性・レベル別のモンスターテーブル
-        # 実際の実装では外部ファイル（YAML）から読み込み
-        
-        base_monsters = {
-            1: ["goblin", "rat", "skeleton"],
-            2: ["orc", "spider", "zombie"],
-            3: ["hobgoblin", "dire_wolf", "wraith"],
-            4: ["ogre", "troll", "vampire"],
-            5: ["dragon", "lich", "demon"]
-        }
-        
-        for attribute in DungeonAttribute:
-            self.encounter_tables[attribute] = {}
+        """エンカウンターテーブル初期化
+        
+        monsters.yaml の encounter_weight と floors から、(階層, 属性, ランク) ごとの
+        エイリアステーブルを構築する。重みは出現重みにダンジョン属性への耐性倍率を掛けたもの。
+        設定のない階層は最も近い設定済み階層のモンスターを使う。
+        """
+        templates = self.monster_manager.templates
+        configured_floors = sorted({
+            floor for template in templates.values()
+            if not template.is_boss and template.encounter_weight > 0
+            for floor in template.floors
+        })
+        
+        self.encounter_tables = {attribute: {} for attribute in DungeonAttribute}
+        self._alias_tables = {}
+        
+        for level in range(1, MAX_DUNGEON_LEVEL + 1):
+            floor = self._resolve_configured_floor(level, configured_floors)
+            candidates = [
+                templates[monster_id] for monster_id in self.monster_manager.get_monsters_for_floor(floor)
+                if templates[monster_id].encounter_weight > 0
+            ] if floor is not None else []
             
-            for level in range(1, MAX_DUNGEON_LEVEL + 1):  # レベル1-20
-                # 基本レベルを計算
-                base_level = min(MAX_TIER_LEVEL, (level - 1) // BASE_LEVELS_PER_TIER + 1)
-                monsters = base_monsters.get(base_level, ["unknown"])
+            for attribute in DungeonAttribute:
+                self.encounter_tables[attribute][level] = (
+                    [template.monster_id for template in candidates] or [UNKNOWN_MONSTER_ID]
+                )
+                if not candidates:
+                    continue
                 
-                # 属性による変更
-                attribute_monsters = self._apply_attribute_variation(monsters, attribute)
-                self.encounter_tables[attribute][level] = attribute_monsters
+                weights = [self._get_encounter_weight(template, attribute) for template in candidates]
+                self._alias_tables[(level, attribute, None)] = AliasTable(
+                    [template.monster_id for template in candidates], weights
+                )
+                
+                by_rank: Dict[MonsterRank, Tuple[List[str], List[float]]] = {}
+                for template, weight in zip(candidates, weights):
+                    rank = self._classify_monster_rank(template.stats.level - floor)
+                    monster_ids, rank_weights = by_rank.setdefault(rank, ([], []))
+                    monster_ids.append(template.monster_id)
+                    rank_weights.append(weight)
+                for rank, (monster_ids, rank_weights) in by_rank.items():
+                    self._alias_tables[(level, attribute, rank)] = AliasTable(monster_ids, rank_weights)
+        
+        self._tables_version = self.monster_manager.templates_version
+        logger.debug(f"エンカウンターテーブルを構築しました: {len(self._alias_tables)}件")
     
-    def _apply_attribute_variation(self, base_monsters: List[str], attribute: DungeonAttribute) -> List[str]:
-        """属性によるモンスター変化"""
-        attribute_prefixes = {
-            DungeonAttribute.FIRE: "flame_",
-            DungeonAttribute.ICE: "frost_",
-            DungeonAttribute.LIGHTNING: "storm_",
-            DungeonAttribute.DARK: "shadow_",
-            DungeonAttribute.LIGHT: "holy_"
-        }
-        
-        prefix = attribute_prefixes.get(attribute, "")
-        if prefix:
-            return [f"{prefix}{monster}" for monster in base_monsters] + base_monsters
-        return base_monsters
+    def _ensure_encounter_tables(self):
+        """モンスター定義が再読み込みされていればテーブルを構築し直す"""
+        if self._tables_version != self.monster_manager.templates_version:
+            self._initialize_encounter_tables()
+    
+    @staticmethod
+    def _resolve_configured_floor(level: int, configured_floors: List[int]) -> Optional[int]:
+        """出現設定のある最も近い階層を取得（同距離なら浅い階層）"""
+        if not configured_floors:
+            return None
+        index = bisect.bisect_left(configured_floors, level)
+        if index < len(configured_floors) and configured_floors[index] == level:
+            return level
+        nearby = configured_floors[max(0, index - 1):index + 1]
+        return min(nearby, key=lambda floor: (abs(floor - level), floor))
+    
+    @staticmethod
+    def _get_encounter_weight(template: MonsterTemplate, attribute: DungeonAttribute) -> float:
+        """ダンジョン属性を考慮した出現重み"""
+        resistance = template.resistances.get(attribute, MonsterResistance.NORMAL)
+        return template.encounter_weight * ATTRIBUTE_AFFINITY_WEIGHTS[resistance]
+    
+    @staticmethod
+    def _classify_monster_rank(level_diff: int) -> MonsterRank:
+        """階層とのレベル差からモンスターのランクを分類"""
+        if level_diff <= WEAK_LEVEL_DIFF:
+            return MonsterRank.WEAK
+        if level_diff >= ELITE_LEVEL_DIFF:
+            return MonsterRank.ELITE
+        if level_diff >= STRONG_LEVEL_DIFF:
+            return MonsterRank.STRONG
+        return MonsterRank.NORMAL
+    
+    def get_encounter_table(self, level: int, attribute: DungeonAttribute,
+                            rank: Optional[MonsterRank] = None) -> Optional[AliasTable]:
+        """出現テーブルを取得（該当ランクのモンスターがいなければ全ランクのテーブル）"""
+        self._ensure_encounter_tables()
+        level = max(1, min(MAX_DUNGEON_LEVEL, level))
+        table = self._alias_tables.get((level, attribute, rank))
+        if table is None:
+            table = self._alias_tables.get((level, attribute, None))
+        return table
+    
+    def get_encounter_weights(self, level: int, attribute: DungeonAttribute,
+                              rank: Optional[MonsterRank] = None) -> Dict[str, float]:
+        """出現テーブルの重みを取得"""
+        table = self.get_encounter_table(level, attribute, rank)
+        if table is None:
+            return {}
+        return dict(zip(table.items, table.weights))
     
     def _parse_encounter_type(self, encounter_type: str) -> EncounterType:
         """エンカウンタータイプ解析"""
@@ -208,9 +292,9 @@ class EncounterManager:
                                attribute: DungeonAttribute, location: Tuple[int, int, int]) -> MonsterGroup:
         """モンスターグループ生成"""
         
-        # 位置ベースのシード生成（一貫性のため）
-        location_seed = hashlib.md5(f"{location[0]}_{location[1]}_{location[2]}".encode()).hexdigest()
-        rng = random.Random(int(location_seed[:8], 16) + level)
+        # 位置ベースのシード（同じ位置・階層では同じグループになる）
+        rng = self._encounter_rng
+        rng.seed(hash((*location, level)))
         
         # エンカウンタータイプによるグループサイズ決定
         group_sizes = {
@@ -224,17 +308,16 @@ class EncounterManager:
         min_size, max_size = group_sizes.get(encounter_type, (1, 3))
         group_size = rng.randint(min_size, max_size)
         
-        # モンスター選択
-        available_monsters = self.encounter_tables.get(attribute, {}).get(level, ["unknown"])
-        
-        monster_ids = []
-        for _ in range(group_size):
-            monster_id = rng.choice(available_monsters)
-            monster_ids.append(monster_id)
-        
         # ランク決定
         rank = self._determine_monster_rank(encounter_type, level, rng)
         
+        # モンスター選択（ランクに合う出現テーブルから重み付き抽選）
+        table = self.get_encounter_table(level, attribute, rank)
+        if table is None:
+            monster_ids = [UNKNOWN_MONSTER_ID] * group_size
+        else:
+            monster_ids = [table.sample(rng) for _ in range(group_size)]
+        
         # 特殊能力
         special_abilities = self._generate_special_abilities(encounter_type, attribute, rng)
         
@@ -548,6 +631,8 @@ class EncounterManager:
             
             # テーブルをクリア
             self.encounter_tables.clear()
+            self._alias_tables.clear()
+            self._tables_version = None
             
             # 統計をリセット
             self.encounter_statistics = {
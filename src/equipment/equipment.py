@@ -5,13 +5,15 @@ from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 import uuid
 
-from src.items.item import ItemInstance, Item, ItemManager, item_manager, ItemType
+from src.items.item import (
+    ItemInstance, Item, ItemManager, item_manager, ItemType,
+    BONUS_VECTOR_FIELDS, CONDITION_SCALED_BONUS_FIELDS, PERFECT_CONDITION
+)
 from src.character.stats import BaseStats, DerivedStats
 from src.utils.logger import logger
 
 # 装備システム定数
 MIN_CONDITION_FOR_EQUIP = 0
-DEFAULT_BONUS_VALUE = 0
 INITIAL_TOTAL_WEIGHT = 0.0
 
 
@@ -93,6 +95,16 @@ class Equipment:
             self.equipped_items[slot] = None
         
         self.item_manager = item_manager
+        
+        # 装備内容が変わるたびに進むバージョン（派生値キャッシュの無効化判定用）
+        self._version = 0
+        
+        # スロットごとのボーナス寄与と、その合計（装備変更時に差分更新）
+        self._slot_bonuses: Dict[EquipmentSlot, Tuple[int, ...]] = {}
+        self._total_bonus = EquipmentBonus()
+        # 寄与を計算したときの (アイテム, 耐久度) とアイテム定義の版数（変化していれば再計算）
+        self._bonus_sources: Dict[EquipmentSlot, Tuple[Optional[ItemInstance], float]] = {}
+        self._bonus_items_version = self.item_manager.items_version
         logger.debug(f"装備システムを初期化: {owner_id}")
     
     def can_equip_item(self, item_instance: ItemInstance, slot: EquipmentSlot, character_class: str) -> Tuple[bool, str]:
@@ -150,6 +162,8 @@ class Equipment:
         
         # 新しいアイテムを装備
         self.equipped_items[slot] = item_instance
+        self._update_slot_bonus(slot, item_instance)
+        self._version += 1
         
         logger.info(f"アイテム '{item_instance.item_id}' を {slot.value} に装備しました")
         
@@ -160,6 +174,8 @@ class Equipment:
         item_instance = self.equipped_items[slot]
         if item_instance:
             self.equipped_items[slot] = None
+            self._update_slot_bonus(slot, None)
+            self._version += 1
             logger.info(f"スロット {slot.value} の装備を解除しました")
             return item_instance
         return None
@@ -172,55 +188,92 @@ class Equipment:
         """全装備アイテムを取得"""
         return self.equipped_items.copy()
     
+    @property
+    def version(self) -> int:
+        """装備のバージョン（耐久度の変化やアイテム定義の再読み込みも反映してから返す）"""
+        self._ensure_bonus_current()
+        return self._version
+    
+    @property
+    def total_bonus(self) -> EquipmentBonus:
+        """装備による総ボーナス（差分更新済みの集計値。読み取り専用として扱うこと）"""
+        self._ensure_bonus_current()
+        return self._total_bonus
+    
     def calculate_equipment_bonus(self) -> EquipmentBonus:
-        """装備による総ボーナスを計算"""
-        total_bonus = EquipmentBonus()
-        
+        """装備による総ボーナスを取得（集計値のコピー）"""
+        total = self.total_bonus
+        return EquipmentBonus(
+            strength=total.strength,
+            agility=total.agility,
+            intelligence=total.intelligence,
+            faith=total.faith,
+            luck=total.luck,
+            attack_power=total.attack_power,
+            defense=total.defense,
+            magic_power=total.magic_power,
+            magic_resistance=total.magic_resistance
+        )
+    
+    def refresh_bonus(self):
+        """全スロットのボーナス寄与を再計算（耐久度変更・アイテム定義再読み込み時用）"""
+        self._slot_bonuses.clear()
+        self._bonus_sources.clear()
+        self._total_bonus = EquipmentBonus()
+        self._bonus_items_version = self.item_manager.items_version
         for slot, item_instance in self.equipped_items.items():
-            if item_instance:
-                item = self.item_manager.get_item(item_instance.item_id)
-                if item:
-                    bonus = self._calculate_item_bonus(item, item_instance)
-                    total_bonus = total_bonus + bonus
+            self._update_slot_bonus(slot, item_instance)
+        self._version += 1
+    
+    def _ensure_bonus_current(self):
+        """計算時から装備アイテム・耐久度・アイテム定義が変わっていれば全スロットを再計算"""
+        if self._bonus_items_version != self.item_manager.items_version:
+            self.refresh_bonus()
+            return
         
-        return total_bonus
+        sources = self._bonus_sources
+        for slot, item_instance in self.equipped_items.items():
+            source = sources.get(slot)
+            if item_instance is None:
+                if source is not None:
+                    self.refresh_bonus()
+                    return
+            elif source is None or source[0] is not item_instance or source[1] != item_instance.condition:
+                self.refresh_bonus()
+                return
     
-    def _calculate_item_bonus(self, item: Item, item_instance: ItemInstance) -> EquipmentBonus:
-        """個別アイテムのボーナスを計算"""
-        bonus = self._get_basic_item_bonus(item)
-        self._apply_additional_bonuses(bonus, item)
-        self._apply_condition_modifier(bonus, item_instance.condition)
+    def _update_slot_bonus(self, slot: EquipmentSlot, item_instance: Optional[ItemInstance]):
+        """スロットのボーナス寄与を入れ替え、合計に差分を反映"""
+        previous = self._slot_bonuses.pop(slot, None)
+        if previous:
+            self._add_bonus_vector(previous, -1)
         
-        return bonus
+        self._bonus_sources.pop(slot, None)
+        if item_instance:
+            self._bonus_sources[slot] = (item_instance, item_instance.condition)
+            vector = self._get_item_bonus_vector(item_instance)
+            if vector:
+                self._slot_bonuses[slot] = vector
+                self._add_bonus_vector(vector, 1)
     
-    def _get_basic_item_bonus(self, item: Item) -> EquipmentBonus:
-        """アイテムの基本ボーナスを取得"""
-        bonus = EquipmentBonus()
+    def _get_item_bonus_vector(self, item_instance: ItemInstance) -> Optional[Tuple[int, ...]]:
+        """個別アイテムのボーナスベクトルを取得（耐久度補正込み）"""
+        vector = self.item_manager.get_bonus_vector(item_instance.item_id)
+        if vector is None or item_instance.condition == PERFECT_CONDITION:
+            return vector
         
-        if item.is_weapon():
-            bonus.attack_power = item.get_attack_power()
-        elif item.is_armor():
-            bonus.defense = item.get_defense()
-            
-        return bonus
-    
-    def _apply_additional_bonuses(self, bonus: EquipmentBonus, item: Item):
-        """追加ボーナスを適用"""
-        item_bonuses = item.item_data.get('bonuses', {})
-        bonus.strength += item_bonuses.get('strength', DEFAULT_BONUS_VALUE)
-        bonus.agility += item_bonuses.get('agility', DEFAULT_BONUS_VALUE)
-        bonus.intelligence += item_bonuses.get('intelligence', DEFAULT_BONUS_VALUE)
-        bonus.faith += item_bonuses.get('faith', DEFAULT_BONUS_VALUE)
-        bonus.luck += item_bonuses.get('luck', DEFAULT_BONUS_VALUE)
-        bonus.magic_power += item_bonuses.get('magic_power', DEFAULT_BONUS_VALUE)
-        bonus.magic_resistance += item_bonuses.get('magic_resistance', DEFAULT_BONUS_VALUE)
-    
-    def _apply_condition_modifier(self, bonus: EquipmentBonus, condition_modifier: float):
-        """状態による補正を適用"""
-        bonus.attack_power = int(bonus.attack_power * condition_modifier)
-        bonus.defense = int(bonus.defense * condition_modifier)
-        bonus.magic_power = int(bonus.magic_power * condition_modifier)
-        bonus.magic_resistance = int(bonus.magic_resistance * condition_modifier)
+        condition = item_instance.condition
+        return tuple(
+            int(value * condition) if name in CONDITION_SCALED_BONUS_FIELDS else value
+            for name, value in zip(BONUS_VECTOR_FIELDS, vector)
+        )
+    
+    def _add_bonus_vector(self, vector: Tuple[int, ...], sign: int):
+        """ボーナスベクトルを合計に加算（sign=-1で減算）"""
+        total = self._total_bonus
+        for name, value in zip(BONUS_VECTOR_FIELDS, vector):
+            if value:
+                setattr(total, name, getattr(total, name) + sign * value)
     
     def get_total_weight(self) -> float:
         """装備の総重量を取得"""
@@ -298,6 +351,7 @@ class Equipment:
             except ValueError:
                 logger.warning(f"無効な装備スロット: {slot_str}")
         
+        equipment.refresh_bonus()
         return equipment
 
 
@@ -14,7 +14,8 @@ from src.character.party import Party
 from src.character.character import Character
 
 # アイテムシステムのインポート
-from src.items.item import item_manager, Item, ItemInstance
+from src.items.item import item_manager, Item, ItemInstance, ItemType
+from src.magic.spells import spell_manager
 
 logger = logging.getLogger(__name__)
 
@@ -197,18 +198,11 @@ class MagicGuildService(FacilityService):
     
     
     def _get_spell_info(self, spell_id: str) -> Optional[Dict[str, Any]]:
-        """魔法情報を取得（仮実装）"""
-        # 実際にはデータベースや設定ファイルから取得
-        spell_db = {
-            "fire_bolt": {"name": "ファイアボルト", "level": 1, "type": "attack"},
-            "heal_light": {"name": "ライトヒール", "level": 1, "type": "healing"},
-            "shield": {"name": "シールド", "level": 1, "type": "defense"},
-            "ice_spike": {"name": "アイススパイク", "level": 2, "type": "attack"},
-            "cure_poison": {"name": "キュアポイズン", "level": 2, "type": "healing"},
-            "detect_magic": {"name": "ディテクトマジック", "level": 2, "type": "utility"}
-        }
-        
-        return spell_db.get(spell_id)
+        """魔法情報を取得（魔法管理システムの定義から）"""
+        spell = spell_manager.get_spell(spell_id)
+        if not spell:
+            return None
+        return {"name": spell.get_name(), "level": spell.level, "type": spell.spell_type.value}
     
     def _get_character_by_id(self, character_id: str) -> Optional[Character]:
         """IDでキャラクターを取得"""
@@ -433,44 +427,43 @@ class MagicGuildService(FacilityService):
             "special": ["special", "mystical", "ancient"]
         }
         
-        # アイテムマネージャーから全アイテムを取得
-        for item_id, item in self.item_manager.items.items():
-            # 魔術書タイプのアイテムのみを処理
-            if item.item_type.value == "spellbook":
-                # カテゴリを決定
-                category = "special"  # デフォルト
-                for cat, keywords in category_mapping.items():
-                    if any(keyword in item_id.lower() for keyword in keywords):
-                        category = cat
-                        break
-                
-                # 在庫数を決定（アイテムの希少度に基づく）
-                if item.rarity.value in ["epic", "legendary"]:
-                    stock = 1
-                elif item.rarity.value == "rare":
-                    stock = 2
-                else:
-                    stock = 3
-                
-                # レベル要求を価格から推定（実際のデータがない場合）
-                required_level = 1
-                if item.price >= 5000:
-                    required_level = 6
-                elif item.price >= 2000:
-                    required_level = 4
-                elif item.price >= 1000:
-                    required_level = 2
-                
-                spellbooks[item_id] = {
-                    "item_id": item_id,
-                    "name": item.get_name(),
-                    "category": category,
-                    "price": item.price,
-                    "stock": stock,
-                    "description": item.get_description(),
-                    "required_level": required_level,
-                    "item_object": item
-                }
+        # 魔術書タイプのアイテムを価格順のインデックスから取得
+        for item in self.item_manager.get_items_by_type(ItemType.SPELLBOOK):
+            item_id = item.item_id
+            # カテゴリを決定
+            category = "special"  # デフォルト
+            for cat, keywords in category_mapping.items():
+                if any(keyword in item_id.lower() for keyword in keywords):
+                    category = cat
+                    break
+            
+            # 在庫数を決定（アイテムの希少度に基づく）
+            if item.rarity.value in ["epic", "legendary"]:
+                stock = 1
+            elif item.rarity.value == "rare":
+                stock = 2
+            else:
+                stock = 3
+            
+            # レベル要求を価格から推定（実際のデータがない場合）
+            required_level = 1
+            if item.price >= 5000:
+                required_level = 6
+            elif item.price >= 2000:
+                required_level = 4
+            elif item.price >= 1000:
+                required_level = 2
+            
+            spellbooks[item_id] = {
+                "item_id": item_id,
+                "name": item.get_name(),
+                "category": category,
+                "price": item.price,
+                "stock": stock,
+                "description": item.get_description(),
+                "required_level": required_level,
+                "item_object": item
+            }
         
         return spellbooks
     
@@ -22,11 +22,14 @@ from src.character.party import Party
 from src.character.character import Character
 
 # アイテム・インベントリシステムのインポート
-from src.items.item import item_manager, Item, ItemInstance
+from src.items.item import item_manager, Item, ItemInstance, ItemRarity
 from src.inventory.inventory import inventory_manager, Inventory
 
 logger = logging.getLogger(__name__)
 
+# 商店で販売する希少度（epic・legendaryの特別なアイテムは販売しない）
+SHOP_RARITIES = (ItemRarity.COMMON, ItemRarity.UNCOMMON, ItemRarity.RARE)
+
 
 class ShopService(FacilityService, ActionExecutorMixin):
     """商店サービス
@@ -201,12 +204,9 @@ class ShopService(FacilityService, ActionExecutorMixin):
             "treasure": {"min": 1, "max": 2}
         }
         
-        # 全アイテムから商店で販売するものを選定
-        for item_id, item in self.item_manager.items.items():
-            # 特別なアイテムは販売しない
-            if item.rarity.value in ["epic", "legendary"]:
-                continue
-                
+        # 販売対象の希少度ごとに、価格順のインデックスから在庫を作成
+        for item in (item for rarity in SHOP_RARITIES for item in self.item_manager.get_items_by_rarity(rarity)):
+            item_id = item.item_id
             category = category_mapping.get(item.item_type.value, "special")
             stock_setting = stock_settings.get(item.item_type.value, {"min": 1, "max": 3})
             
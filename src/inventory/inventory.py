@@ -1,8 +1,9 @@
 """インベントリシステム"""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set
 from enum import Enum
+import heapq
 import uuid
 
 from src.items.item import ItemInstance, Item, ItemManager, item_manager
@@ -30,6 +31,23 @@ class InventorySlot:
     item_instance: Optional[ItemInstance] = None
     slot_type: InventorySlotType = InventorySlotType.CHARACTER
     
+    def __setattr__(self, name: str, value: Any):
+        """アイテムの入れ替えを所属インベントリへ通知"""
+        super().__setattr__(name, value)
+        if name == 'item_instance':
+            self._notify_owner()
+    
+    def attach(self, owner: 'SlotIndexMixin', index: int):
+        """所属インベントリとスロット番号を設定（内容変更時に索引を更新させる）"""
+        self._owner = owner
+        self._index = index
+    
+    def _notify_owner(self):
+        """所属インベントリに内容の変更を通知"""
+        owner = self.__dict__.get('_owner')
+        if owner is not None:
+            owner._sync_slot(self._index)
+    
     def is_empty(self) -> bool:
         """スロットが空かどうか"""
         return self.item_instance is None
@@ -59,7 +77,7 @@ class InventorySlot:
         
         # スタック処理
         if self.can_store_item(item_instance):
-            self.item_instance.quantity += item_instance.quantity
+            self.change_quantity(item_instance.quantity)
             return True
         
         return False
@@ -90,10 +108,17 @@ class InventorySlot:
             )
             
             # 元のアイテムの数量を減らす
-            self.item_instance.quantity -= quantity
+            self.change_quantity(-quantity)
             
             return removed_item
     
+    def change_quantity(self, delta: int):
+        """格納中のアイテムの数量を増減（所属インベントリへ通知する）"""
+        if self.is_empty():
+            return
+        self.item_instance.quantity += delta
+        self._notify_owner()
+    
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式でシリアライズ"""
         return {
@@ -116,7 +141,73 @@ class InventorySlot:
         )
 
 
-class Inventory:
+class SlotIndexMixin:
+    """スロット一覧の索引（アイテムID→スロット番号、空きスロット）を差分更新するミックスイン
+    
+    利用側は slots を持ち、スロットの内容変更時に InventorySlot から _sync_slot が呼ばれる。
+    スロットごとの付加情報は _make_slot_entry と _on_slot_entry_changed で拡張する。
+    """
+    
+    slots: List[InventorySlot]
+    
+    def rebuild_index(self):
+        """スロット一覧から索引を作り直す（スロット一覧の差し替え時用）"""
+        self._slots_by_item: Dict[str, Set[int]] = {}  # アイテムID -> スロット番号
+        self._free_slots: Set[int] = set()
+        self._free_slot_heap: List[int] = []  # 最小の空きスロット番号取得用（遅延削除）
+        self._slot_entries: List[Optional[Tuple]] = [None] * len(self.slots)  # 先頭要素はアイテムID
+        
+        for index, slot in enumerate(self.slots):
+            slot.attach(self, index)
+            self._free_slots.add(index)
+            self._sync_slot(index)
+        self._free_slot_heap = sorted(self._free_slots)
+    
+    def _make_slot_entry(self, item_instance: ItemInstance, previous: Optional[Tuple]) -> Tuple:
+        """スロットの索引エントリを作成（先頭要素はアイテムID）"""
+        return (item_instance.item_id,)
+    
+    def _on_slot_entry_changed(self, previous: Optional[Tuple], entry: Optional[Tuple]):
+        """スロットの索引エントリが変わったときの処理（集計値の更新用）"""
+    
+    def _sync_slot(self, index: int):
+        """スロットの現在の内容を索引に反映（InventorySlotから通知される）"""
+        previous = self._slot_entries[index]
+        item_instance = self.slots[index].item_instance
+        entry = self._make_slot_entry(item_instance, previous) if item_instance is not None else None
+        self._slot_entries[index] = entry
+        self._on_slot_entry_changed(previous, entry)
+        
+        if previous is not None and (entry is None or entry[0] != previous[0]):
+            slot_indices = self._slots_by_item.get(previous[0])
+            if slot_indices is not None:
+                slot_indices.discard(index)
+                if not slot_indices:
+                    del self._slots_by_item[previous[0]]
+        
+        if entry is None:
+            if index not in self._free_slots:
+                self._free_slots.add(index)
+                heapq.heappush(self._free_slot_heap, index)
+            return
+        
+        self._free_slots.discard(index)
+        self._slots_by_item.setdefault(entry[0], set()).add(index)
+    
+    def get_item_slots(self, item_id: str) -> List[int]:
+        """指定アイテムが入っているスロット番号を昇順で取得"""
+        slot_indices = self._slots_by_item.get(item_id)
+        return sorted(slot_indices) if slot_indices else []
+    
+    def find_empty_slot(self) -> Optional[int]:
+        """空きスロットのインデックスを取得（最小の番号）"""
+        heap = self._free_slot_heap
+        while heap and heap[0] not in self._free_slots:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+class Inventory(SlotIndexMixin):
     """インベントリクラス"""
     
     def __init__(self, owner_id: str, inventory_type: InventorySlotType, max_slots: int = DEFAULT_CHARACTER_SLOTS):
@@ -130,33 +221,63 @@ class Inventory:
             self.slots.append(InventorySlot(slot_type=inventory_type))
         
         self.item_manager = item_manager
+        
+        # 索引と合計値（スロットの内容変更時に差分更新）
+        self.rebuild_index()
         logger.debug(f"インベントリを初期化: {owner_id} ({inventory_type.value}, {max_slots}スロット)")
     
+    def rebuild_index(self):
+        """スロット一覧から索引と合計値を作り直す（スロット一覧の差し替え時用）"""
+        self._total_quantity = 0
+        self._total_weight = INITIAL_TOTAL_WEIGHT
+        self._total_value = INITIAL_TOTAL_VALUE
+        super().rebuild_index()
+    
+    def _make_slot_entry(self, item_instance: ItemInstance, previous: Optional[Tuple]) -> Tuple:
+        """スロットの索引エントリ (ID, 数量, 単位重量, 単価) を作成"""
+        if previous is not None and previous[0] == item_instance.item_id:
+            _, _, unit_weight, unit_price = previous
+        else:
+            item = self.item_manager.get_item(item_instance.item_id)
+            unit_weight = item.weight if item else INITIAL_TOTAL_WEIGHT
+            unit_price = item.price if item else INITIAL_TOTAL_VALUE
+        return (item_instance.item_id, item_instance.quantity, unit_weight, unit_price)
+    
+    def _on_slot_entry_changed(self, previous: Optional[Tuple], entry: Optional[Tuple]):
+        """合計数量・総重量・総価値を差分更新"""
+        if previous is not None:
+            _, quantity, unit_weight, unit_price = previous
+            self._total_quantity -= quantity
+            self._total_weight -= unit_weight * quantity
+            self._total_value -= unit_price * quantity
+        if entry is not None:
+            _, quantity, unit_weight, unit_price = entry
+            self._total_quantity += quantity
+            self._total_weight += unit_weight * quantity
+            self._total_value += unit_price * quantity
+    
     def get_empty_slot_count(self) -> int:
         """空きスロット数を取得"""
-        return sum(MINIMUM_REMOVE_QUANTITY for slot in self.slots if slot.is_empty())
+        return len(self._free_slots)
     
     def get_used_slot_count(self) -> int:
         """使用中スロット数を取得"""
-        return sum(MINIMUM_REMOVE_QUANTITY for slot in self.slots if not slot.is_empty())
+        return len(self.slots) - len(self._free_slots)
     
     def is_full(self) -> bool:
         """インベントリが満杯かどうか"""
         return self.get_empty_slot_count() == INITIAL_TOTAL_VALUE
     
-    def find_empty_slot(self) -> Optional[int]:
-        """空きスロットのインデックスを取得"""
-        for i, slot in enumerate(self.slots):
-            if slot.is_empty():
-                return i
-        return None
-    
     def find_stackable_slot(self, item_instance: ItemInstance) -> Optional[int]:
-        """スタック可能なスロットのインデックスを取得"""
-        for i, slot in enumerate(self.slots):
-            if slot.can_store_item(item_instance):
-                return i
-        return None
+        """スタック可能なスロットのインデックスを取得（同じアイテムのスロットを優先）"""
+        for index in self.get_item_slots(item_instance.item_id):
+            if self.slots[index].can_store_item(item_instance):
+                return index
+        return self.find_empty_slot()
+    
+    def can_add_item(self, item_instance: ItemInstance) -> bool:
+        """アイテムを追加できるか（スタック先または空きスロットがあるか）"""
+        return self.find_stackable_slot(item_instance) is not None
     
     def add_item(self, item_instance: ItemInstance) -> bool:
         """アイテムを追加"""
@@ -170,15 +291,7 @@ class Inventory:
         if stackable_slot_index is not None:
             slot = self.slots[stackable_slot_index]
             if slot.add_item(item_instance):
-                logger.info(f"Inventory: アイテムをスタック: {item_instance.item_id} x{item_instance.quantity} in slot {stackable_slot_index} of inventory {self.owner_id}")
-                return True
-        
-        # 空きスロットを探す
-        empty_slot_index = self.find_empty_slot()
-        if empty_slot_index is not None:
-            slot = self.slots[empty_slot_index]
-            if slot.add_item(item_instance):
-                logger.info(f"Inventory: アイテムを追加: {item_instance.item_id} x{item_instance.quantity} to slot {empty_slot_index} in inventory {self.owner_id}")
+                logger.info(f"Inventory: アイテムを追加: {item_instance.item_id} x{item_instance.quantity} in slot {stackable_slot_index} of inventory {self.owner_id}")
                 return True
         
         logger.warning(f"インベントリが満杯のためアイテムを追加できません: {item_instance.item_id} for inventory {self.owner_id}")
@@ -199,31 +312,22 @@ class Inventory:
     
     def remove_item_by_id(self, item_id: str, quantity: int = MINIMUM_REMOVE_QUANTITY) -> Optional[ItemInstance]:
         """アイテムIDで指定してアイテムを削除"""
-        for i, slot in enumerate(self.slots):
-            if (not slot.is_empty() and 
-                slot.item_instance.item_id == item_id and
-                slot.item_instance.quantity >= quantity):
-                return self.remove_item(i, quantity)
+        for index in self.get_item_slots(item_id):
+            if self.slots[index].item_instance.quantity >= quantity:
+                return self.remove_item(index, quantity)
         
         return None
     
     def has_item(self, item_id: str, quantity: int = MINIMUM_REMOVE_QUANTITY) -> bool:
         """指定したアイテムを指定数量持っているかチェック"""
-        total_quantity = 0
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item_instance.item_id == item_id:
-                total_quantity += slot.item_instance.quantity
-                if total_quantity >= quantity:
-                    return True
-        return False
+        return self.get_item_count(item_id) >= quantity
     
     def get_item_count(self, item_id: str) -> int:
         """指定したアイテムの総数量を取得"""
-        total_quantity = 0
-        for slot in self.slots:
-            if not slot.is_empty() and slot.item_instance.item_id == item_id:
-                total_quantity += slot.item_instance.quantity
-        return total_quantity
+        slot_indices = self._slots_by_item.get(item_id)
+        if not slot_indices:
+            return 0
+        return sum(self._slot_entries[index][1] for index in slot_indices)
     
     def get_all_items(self) -> List[Tuple[int, ItemInstance]]:
         """全アイテムを取得（スロットインデックス付き）"""
@@ -285,47 +389,17 @@ class Inventory:
             return (item.item_type.value, item.item_id)
         return (DEFAULT_SORT_ORDER, item_instance.item_id)
     
+    def get_total_quantity(self) -> int:
+        """全アイテムの総数量を取得"""
+        return self._total_quantity
+    
     def get_total_weight(self) -> float:
         """総重量を取得"""
-        total_weight = INITIAL_TOTAL_WEIGHT
-        
-        for slot in self.slots:
-            weight = self._calculate_slot_weight(slot)
-            total_weight += weight
-            
-        return total_weight
-    
-    def _calculate_slot_weight(self, slot: InventorySlot) -> float:
-        """スロットの重量を計算"""
-        if slot.is_empty():
-            return INITIAL_TOTAL_WEIGHT
-            
-        item = self.item_manager.get_item(slot.item_instance.item_id)
-        if not item:
-            return INITIAL_TOTAL_WEIGHT
-            
-        return item.weight * slot.item_instance.quantity
+        return self._total_weight
     
     def get_total_value(self) -> int:
         """総価値を取得"""
-        total_value = INITIAL_TOTAL_VALUE
-        
-        for slot in self.slots:
-            value = self._calculate_slot_value(slot)
-            total_value += value
-            
-        return total_value
-    
-    def _calculate_slot_value(self, slot: InventorySlot) -> int:
-        """スロットの価値を計算"""
-        if slot.is_empty():
-            return INITIAL_TOTAL_VALUE
-            
-        item = self.item_manager.get_item(slot.item_instance.item_id)
-        if not item:
-            return INITIAL_TOTAL_VALUE
-            
-        return item.price * slot.item_instance.quantity
+        return self._total_value
     
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式でシリアライズ"""
@@ -355,6 +429,7 @@ class Inventory:
         while len(inventory.slots) < inventory.max_slots:
             inventory.slots.append(InventorySlot(slot_type=inventory.inventory_type))
         
+        inventory.rebuild_index()
         return inventory
 
 
@@ -403,6 +478,16 @@ class InventoryManager:
     def transfer_item(self, from_inventory: Inventory, from_slot: int, 
                      to_inventory: Inventory, quantity: int = None) -> bool:
         """インベントリ間でアイテムを移動"""
+        if from_slot < 0 or from_slot >= len(from_inventory.slots):
+            return False
+        
+        # 別インベントリへ入らない場合は取り出さずに失敗させる
+        source_item = from_inventory.slots[from_slot].item_instance
+        if not source_item:
+            return False
+        if to_inventory is not from_inventory and not to_inventory.can_add_item(source_item):
+            return False
+        
         # アイテムを取得
         removed_item = from_inventory.remove_item(from_slot, quantity)
         if not removed_item:
@@ -1,8 +1,9 @@
 """アイテムシステム"""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
 from enum import Enum
+from bisect import bisect_right
 import uuid
 
 from src.core.config_manager import config_manager
@@ -21,6 +22,17 @@ CONDITION_DAMAGED = 0.4
 FALLBACK_LANGUAGE = 'ja'
 FIRST_ELEMENT_INDEX = 0
 
+# 装備ボーナスベクトルの要素順（EquipmentBonusのフィールドと対応）
+BONUS_VECTOR_FIELDS = (
+    'strength', 'agility', 'intelligence', 'faith', 'luck',
+    'attack_power', 'defense', 'magic_power', 'magic_resistance'
+)
+# 耐久度による補正を受ける要素
+CONDITION_SCALED_BONUS_FIELDS = ('attack_power', 'defense', 'magic_power', 'magic_resistance')
+
+# 価格帯の境界（帯0: 100未満, 帯1: 100-499, 帯2: 500-1999, 帯3: 2000以上）
+PRICE_BAND_THRESHOLDS = (100, 500, 2000)
+
 
 class ItemType(Enum):
     """アイテムタイプ"""
@@ -187,6 +199,21 @@ class Item:
         """売却価格を取得"""
         return int(self.price * sell_ratio)
     
+    def get_bonus_vector(self) -> Tuple[int, ...]:
+        """装備時のボーナスベクトルを取得（BONUS_VECTOR_FIELDS順、耐久度補正前）"""
+        values = dict.fromkeys(BONUS_VECTOR_FIELDS, 0)
+        
+        if self.is_weapon():
+            values['attack_power'] = self.get_attack_power()
+        elif self.is_armor():
+            values['defense'] = self.get_defense()
+        
+        item_bonuses = self.item_data.get('bonuses', {})
+        for name in ('strength', 'agility', 'intelligence', 'faith', 'luck', 'magic_power', 'magic_resistance'):
+            values[name] += item_bonuses.get(name, 0)
+        
+        return tuple(values[name] for name in BONUS_VECTOR_FIELDS)
+    
     def create_instance(self, quantity: int = DEFAULT_QUANTITY, identified: bool = True) -> ItemInstance:
         """アイテムインスタンスを作成"""
         return ItemInstance(
@@ -203,6 +230,18 @@ class ItemManager:
         self.items: Dict[str, Item] = {}
         self.item_config = {}
         
+        # アイテムID -> 装備ボーナスベクトル（読み込み時に事前計算）
+        self.bonus_vectors: Dict[str, Tuple[int, ...]] = {}
+        
+        # 検索用インデックス（価格・ID順にソート済み、読み込み時に構築）
+        self._sorted_items: Tuple[Item, ...] = ()
+        self._items_by_type: Dict[ItemType, Tuple[Item, ...]] = {}
+        self._items_by_rarity: Dict[ItemRarity, Tuple[Item, ...]] = {}
+        self._items_by_price_band: Dict[int, Tuple[Item, ...]] = {}
+        self._items_by_class: Dict[str, Tuple[Item, ...]] = {}
+        # 定義を読み込むたびに増える版数（派生テーブルの再構築判定用）
+        self.items_version = 0
+        
         self._load_items()
         logger.debug("ItemManagerを初期化しました")
     
@@ -217,20 +256,76 @@ class ItemManager:
             for item_id, item_data in category_items.items():
                 item = Item(item_id, item_data)
                 self.items[item_id] = item
+                self.bonus_vectors[item_id] = item.get_bonus_vector()
         
+        self._build_indexes()
+        self.items_version += 1
         logger.info(f"{len(self.items)} 個のアイテムを読み込みました")
     
+    def _build_indexes(self):
+        """タイプ・希少度・価格帯・使用可能クラス別のインデックスを構築"""
+        self._sorted_items = tuple(sorted(self.items.values(), key=lambda item: (item.price, item.item_id)))
+        
+        by_type: Dict[ItemType, List[Item]] = {}
+        by_rarity: Dict[ItemRarity, List[Item]] = {}
+        by_price_band: Dict[int, List[Item]] = {}
+        class_names = set()
+        for item in self._sorted_items:
+            by_type.setdefault(item.item_type, []).append(item)
+            by_rarity.setdefault(item.rarity, []).append(item)
+            by_price_band.setdefault(self.get_price_band(item.price), []).append(item)
+            class_names.update(item.usable_classes)
+            class_names.update(item.required_class)
+        
+        self._items_by_type = {key: tuple(items) for key, items in by_type.items()}
+        self._items_by_rarity = {key: tuple(items) for key, items in by_rarity.items()}
+        self._items_by_price_band = {key: tuple(items) for key, items in by_price_band.items()}
+        self._items_by_class = {}
+        for character_class in class_names:
+            self._index_class(character_class)
+    
+    def _index_class(self, character_class: str) -> Tuple[Item, ...]:
+        """クラス別使用可能アイテムのインデックスを作成"""
+        items = tuple(item for item in self._sorted_items if item.can_use(character_class))
+        self._items_by_class[character_class] = items
+        return items
+    
+    @staticmethod
+    def get_price_band(price: int) -> int:
+        """価格から価格帯番号を取得"""
+        return bisect_right(PRICE_BAND_THRESHOLDS, price)
+    
     def get_item(self, item_id: str) -> Optional[Item]:
         """アイテムを取得"""
         return self.items.get(item_id)
     
-    def get_items_by_type(self, item_type: ItemType) -> List[Item]:
-        """タイプ別アイテム一覧を取得"""
-        return [item for item in self.items.values() if item.item_type == item_type]
+    def get_bonus_vector(self, item_id: str) -> Optional[Tuple[int, ...]]:
+        """事前計算済みの装備ボーナスベクトルを取得"""
+        return self.bonus_vectors.get(item_id)
+    
+    def get_all_items(self) -> Tuple[Item, ...]:
+        """全アイテム一覧を取得（価格・ID順）"""
+        return self._sorted_items
+    
+    def get_items_by_type(self, item_type: ItemType) -> Tuple[Item, ...]:
+        """タイプ別アイテム一覧を取得（価格・ID順）"""
+        return self._items_by_type.get(item_type, ())
+    
+    def get_items_by_class(self, character_class: str) -> Tuple[Item, ...]:
+        """クラス別使用可能アイテム一覧を取得（価格・ID順）"""
+        items = self._items_by_class.get(character_class)
+        if items is None:
+            # 制限に登場しないクラスは制限なしアイテムのみ（初回のみ走査）
+            items = self._index_class(character_class)
+        return items
+    
+    def get_items_by_rarity(self, rarity: ItemRarity) -> Tuple[Item, ...]:
+        """希少度別アイテム一覧を取得（価格・ID順）"""
+        return self._items_by_rarity.get(rarity, ())
     
-    def get_items_by_class(self, character_class: str) -> List[Item]:
-        """クラス別使用可能アイテム一覧を取得"""
-        return [item for item in self.items.values() if item.can_use(character_class)]
+    def get_items_by_price_band(self, band: int) -> Tuple[Item, ...]:
+        """価格帯別アイテム一覧を取得（価格・ID順、帯番号はget_price_band参照）"""
+        return self._items_by_price_band.get(band, ())
     
     def create_item_instance(self, item_id: str, quantity: int = 1, identified: bool = True) -> Optional[ItemInstance]:
         """アイテムインスタンスを作成"""
@@ -336,6 +431,7 @@ class ItemManager:
     def reload_items(self):
         """アイテム定義の再読み込み"""
         self.items.clear()
+        self.bonus_vectors.clear()
         self._load_items()
         logger.info("アイテム定義を再読み込みしました")
 
@@ -6,6 +6,7 @@ from enum import Enum
 from src.items.item import Item, ItemInstance, ItemType, item_manager
 from src.character.character import Character, CharacterStatus
 from src.character.party import Party
+from src.inventory.inventory import InventorySlot
 from src.utils.logger import logger
 
 # アイテム使用システム定数
@@ -83,8 +84,9 @@ class ItemUsageManager:
         
         return True, ""
     
-    def use_item(self, item_instance: ItemInstance, user: Character, target: Optional[Character] = None, party: Optional[Party] = None) -> Tuple[UsageResult, str, Dict[str, Any]]:
-        """アイテムを使用"""
+    def use_item(self, item_instance: ItemInstance, user: Character, target: Optional[Character] = None, party: Optional[Party] = None,
+                 slot: Optional[InventorySlot] = None) -> Tuple[UsageResult, str, Dict[str, Any]]:
+        """アイテムを使用（インベントリ内のアイテムは格納スロットを渡すと消費が索引・合計値に反映される）"""
         # アイテム情報を取得
         item = item_manager.get_item(item_instance.item_id)
         if not item:
@@ -118,7 +120,10 @@ class ItemUsageManager:
             
             if success:
                 # アイテム消費
-                item_instance.quantity -= CONSUME_QUANTITY
+                if slot is not None and slot.item_instance is item_instance:
+                    slot.change_quantity(-CONSUME_QUANTITY)
+                else:
+                    item_instance.quantity -= CONSUME_QUANTITY
                 logger.info(f"アイテム使用: {user.name} が {item.get_name()} を使用")
                 return UsageResult.SUCCESS, message, results
             else:
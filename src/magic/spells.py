@@ -128,10 +128,16 @@ class Spell:
         """魔法説明を取得"""
         return config_manager.get_text(self.description_key)
     
-    def can_use_by_class(self, character_class: str) -> bool:
-        """指定されたクラスが使用可能かチェック"""
-        spell_config = config_manager.load_config("spells")
-        class_access = spell_config.get("class_spell_access", {})
+    def can_use_by_class(self, character_class: str, class_access: Optional[Dict[str, Any]] = None) -> bool:
+        """指定されたクラスが使用可能かチェック
+        
+        Args:
+            character_class: クラス名
+            class_access: クラス別アクセス規則（省略時は設定ファイルから読み込む）
+        """
+        if class_access is None:
+            spell_config = config_manager.load_config("spells")
+            class_access = spell_config.get("class_spell_access", {})
         
         class_info = class_access.get(character_class, {})
         
@@ -456,6 +462,13 @@ class SpellManager:
         self.spells: Dict[str, Spell] = {}
         self.spell_config = {}
         
+        # 検索用テーブル（設定ファイルの定義順、読み込み時に構築）
+        self._spells_by_level: Dict[int, Tuple[Spell, ...]] = {}
+        self._spells_by_school: Dict[SpellSchool, Tuple[Spell, ...]] = {}
+        self._spells_by_class: Dict[str, Tuple[Spell, ...]] = {}
+        # クラス -> キャラクターレベル別の習得可能魔法（添字がレベル）
+        self._learnable_by_class: Dict[str, List[Tuple[Spell, ...]]] = {}
+        
         self._load_spells()
         logger.debug("SpellManagerを初期化しました")
     
@@ -473,28 +486,56 @@ class SpellManager:
                 spell = Spell(spell_id, spell_data)
                 self.spells[spell_id] = spell
         
+        self._build_tables()
         logger.info(f"{len(self.spells)} 個の魔法を読み込みました")
     
+    def _build_tables(self):
+        """レベル別・学派別・クラス別の魔法テーブルを構築"""
+        by_level: Dict[int, List[Spell]] = {}
+        by_school: Dict[SpellSchool, List[Spell]] = {}
+        for spell in self.spells.values():
+            by_level.setdefault(spell.level, []).append(spell)
+            by_school.setdefault(spell.school, []).append(spell)
+        self._spells_by_level = {level: tuple(spells) for level, spells in by_level.items()}
+        self._spells_by_school = {school: tuple(spells) for school, spells in by_school.items()}
+        
+        class_access = self.spell_config.get("class_spell_access", {})
+        max_level = max(by_level, default=0)
+        self._spells_by_class = {}
+        self._learnable_by_class = {}
+        for character_class in class_access:
+            class_spells = tuple(
+                spell for spell in self.spells.values()
+                if spell.can_use_by_class(character_class, class_access)
+            )
+            self._spells_by_class[character_class] = class_spells
+            self._learnable_by_class[character_class] = [
+                tuple(spell for spell in class_spells if spell.level <= level)
+                for level in range(max_level + 1)
+            ]
+    
     def get_spell(self, spell_id: str) -> Optional[Spell]:
         """魔法を取得"""
         return self.spells.get(spell_id)
     
-    def get_spells_by_level(self, level: int) -> List[Spell]:
+    def get_spells_by_level(self, level: int) -> Tuple[Spell, ...]:
         """レベル別魔法一覧を取得"""
-        return [spell for spell in self.spells.values() if spell.level == level]
+        return self._spells_by_level.get(level, ())
     
-    def get_spells_by_school(self, school: SpellSchool) -> List[Spell]:
+    def get_spells_by_school(self, school: SpellSchool) -> Tuple[Spell, ...]:
         """学派別魔法一覧を取得"""
-        return [spell for spell in self.spells.values() if spell.school == school]
+        return self._spells_by_school.get(school, ())
     
-    def get_spells_by_class(self, character_class: str) -> List[Spell]:
-        """クラス別使用可能魔法一覧を取得"""
-        return [spell for spell in self.spells.values() if spell.can_use_by_class(character_class)]
+    def get_spells_by_class(self, character_class: str) -> Tuple[Spell, ...]:
+        """クラス別使用可能魔法一覧を取得（アクセス規則のないクラスは空）"""
+        return self._spells_by_class.get(character_class, ())
     
-    def get_learnable_spells(self, character_class: str, character_level: int) -> List[Spell]:
+    def get_learnable_spells(self, character_class: str, character_level: int) -> Tuple[Spell, ...]:
         """習得可能魔法一覧を取得"""
-        spells = self.get_spells_by_class(character_class)
-        return [spell for spell in spells if spell.level <= character_level]
+        learnable = self._learnable_by_class.get(character_class)
+        if not learnable or character_level < 0:
+            return ()
+        return learnable[min(character_level, len(learnable) - 1)]
     
     def reload_spells(self):
         """魔法定義の再読み込み"""
@@ -1,13 +1,15 @@
 """モンスターシステム"""
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple, Mapping, Sequence, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from types import MappingProxyType
 import random
 
 from src.character.stats import BaseStats
 from src.dungeon.dungeon_generator import DungeonAttribute
-from src.core.config_manager import config_manager
+from src.core.config_manager import ConfigManager, config_manager
+from src.utils.dice import DiceExpression, compile_dice
 from src.utils.logger import logger
 
 # モンスターシステム定数
@@ -72,7 +74,7 @@ class MonsterStats:
     hit_points: int = 10
     armor_class: int = 10
     attack_bonus: int = 0
-    damage_dice: str = "1d6"
+    damage_dice: Union[str, DiceExpression] = "1d6"  # テンプレートから作る場合は解析済みのダイスを共有
     
     # 基本能力値
     strength: int = 10
@@ -91,6 +93,15 @@ class MonsterStats:
             luck=self.luck
         )
     
+    def get_damage_dice(self) -> Optional[DiceExpression]:
+        """解析済みのダメージダイスを取得（文字列の式は共有キャッシュから取得、不正な式はNone）"""
+        if isinstance(self.damage_dice, DiceExpression):
+            return self.damage_dice
+        try:
+            return compile_dice(self.damage_dice)
+        except (ValueError, TypeError, AttributeError):
+            return None
+    
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式に変換"""
         return {
@@ -98,7 +109,7 @@ class MonsterStats:
             'hit_points': self.hit_points,
             'armor_class': self.armor_class,
             'attack_bonus': self.attack_bonus,
-            'damage_dice': self.damage_dice,
+            'damage_dice': str(self.damage_dice),
             'strength': self.strength,
             'agility': self.agility,
             'intelligence': self.intelligence,
@@ -123,9 +134,9 @@ class MonsterStats:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class MonsterAbility:
-    """モンスター特殊能力"""
+    """モンスター特殊能力（テンプレートから生成したモンスター間で共有されるため不変）"""
     ability_id: str
     name: str
     description: str
@@ -160,6 +171,47 @@ class MonsterAbility:
         )
 
 
+@dataclass(frozen=True)
+class MonsterTemplate:
+    """モンスターテンプレート
+    
+    設定ファイルから読み込み時に一度だけ構築し、同種のモンスター間で共有する。
+    耐性・特殊能力・ドロップテーブルは読み取り専用。統計値は生成時に複製して使う。
+    """
+    monster_id: str
+    names: Mapping[str, str]
+    descriptions: Mapping[str, str]
+    default_name: str
+    default_description: str
+    stats: MonsterStats
+    resistances: Mapping[DungeonAttribute, MonsterResistance]
+    abilities: Tuple[MonsterAbility, ...]
+    loot_table: Tuple[Mapping[str, Any], ...]
+    experience_value: int
+    is_boss: bool
+    floors: Tuple[int, ...]
+    encounter_weight: int = 0
+    
+    def get_name(self, language: str = FALLBACK_LANGUAGE) -> str:
+        """ローカライズされた名前を取得"""
+        return self._localize(self.names, language, self.default_name)
+    
+    def get_description(self, language: str = FALLBACK_LANGUAGE) -> str:
+        """ローカライズされた説明を取得"""
+        return self._localize(self.descriptions, language, self.default_description)
+    
+    @staticmethod
+    def _localize(texts: Mapping[str, str], language: str, default: str) -> str:
+        """言語別テキストから選択（指定言語→フォールバック言語→最初の要素）"""
+        if not texts:
+            return default
+        if language in texts:
+            return texts[language]
+        if FALLBACK_LANGUAGE in texts:
+            return texts[FALLBACK_LANGUAGE]
+        return next(iter(texts.values()))
+
+
 @dataclass
 class Monster:
     """モンスタークラス"""
@@ -170,11 +222,14 @@ class Monster:
     size: MonsterSize
     stats: MonsterStats
     
+    # 属性耐性・特殊能力・ドロップアイテムは、テンプレートから生成した場合は共有の読み取り専用
+    # （MappingProxyType / タプル）になる
+    
     # 属性耐性
-    resistances: Dict[DungeonAttribute, MonsterResistance] = field(default_factory=dict)
+    resistances: Mapping[DungeonAttribute, MonsterResistance] = field(default_factory=dict)
     
     # 特殊能力
-    abilities: List[MonsterAbility] = field(default_factory=list)
+    abilities: Sequence[MonsterAbility] = field(default_factory=list)
     
     # 戦闘データ
     current_hp: Optional[int] = None
@@ -182,9 +237,12 @@ class Monster:
     ability_cooldowns: Dict[str, int] = field(default_factory=dict)
     
     # ドロップアイテム
-    loot_table: List[Dict[str, Any]] = field(default_factory=list)
+    loot_table: Sequence[Mapping[str, Any]] = field(default_factory=list)
     experience_value: int = 0
     
+    # 生成元の共有テンプレート（MonsterManagerで生成した場合）
+    template: Optional[MonsterTemplate] = field(default=None, repr=False, compare=False)
+    
     def __post_init__(self):
         """初期化後処理"""
         if self.current_hp is None:
@@ -292,19 +350,12 @@ class Monster:
         """状態効果保有確認"""
         return effect in self.status_effects
     
-    def get_attack_damage(self) -> int:
+    def get_attack_damage(self, rng: Optional[random.Random] = None) -> int:
         """攻撃ダメージ計算"""
-        return self._roll_damage_dice(self.stats.damage_dice)
-    
-    def _roll_damage_dice(self, dice_string: str) -> int:
-        """ダイスロール計算"""
-        dice_parts = dice_string.split('d')
-        if len(dice_parts) == LEVEL_ATTACK_DIVISOR:
-            num_dice = int(dice_parts[FIRST_ELEMENT_INDEX])
-            die_size = int(dice_parts[FIRST_ELEMENT_INDEX + 1])
-            return sum(random.randint(MINIMUM_DAMAGE, die_size) for _ in range(num_dice))
-        else:
+        dice = self.stats.get_damage_dice()
+        if dice is None:
             return MINIMUM_DAMAGE
+        return max(MINIMUM_DAMAGE, dice.roll(rng))
     
     def get_loot(self) -> List[Dict[str, Any]]:
         """ドロップアイテム取得"""
@@ -343,7 +394,7 @@ class Monster:
             'current_hp': self.current_hp,
             'status_effects': self.status_effects,
             'ability_cooldowns': self.ability_cooldowns,
-            'loot_table': self.loot_table,
+            'loot_table': [dict(entry) for entry in self.loot_table],
             'experience_value': self.experience_value
         }
     
@@ -360,31 +411,42 @@ class Monster:
             current_hp=data.get('current_hp'),
             status_effects=data.get('status_effects', []),
             ability_cooldowns=data.get('ability_cooldowns', {}),
+            # 耐性復元
+            resistances={DungeonAttribute(attr_str): MonsterResistance(res_str)
+                         for attr_str, res_str in data.get('resistances', {}).items()},
+            # 特殊能力復元
+            abilities=[MonsterAbility.from_dict(ability_data) for ability_data in data.get('abilities', [])],
             loot_table=data.get('loot_table', []),
             experience_value=data.get('experience_value', 0)
         )
         
-        # 耐性復元
-        for attr_str, res_str in data.get('resistances', {}).items():
-            attr = DungeonAttribute(attr_str)
-            res = MonsterResistance(res_str)
-            monster.resistances[attr] = res
-        
-        # 特殊能力復元
-        for ability_data in data.get('abilities', []):
-            ability = MonsterAbility.from_dict(ability_data)
-            monster.abilities.append(ability)
-        
         return monster
 
 
 class MonsterManager:
     """モンスター管理システム"""
     
-    def __init__(self):
+    def __init__(self, config: Optional[ConfigManager] = None):
+        self.config_manager = config or config_manager
         self.monsters: Dict[str, Monster] = {}
         self.monster_templates: Dict[str, Dict[str, Any]] = {}
+        # モンスターID -> 解析済みダメージダイス（読み込み時に解析）
+        self.damage_dice: Dict[str, DiceExpression] = {}
+        # モンスターID -> 読み込み時に構築した共有テンプレート
+        self.templates: Dict[str, MonsterTemplate] = {}
+        
+        # テンプレートの索引（読み込み時に構築）
+        self._monsters_by_floor: Dict[int, Tuple[str, ...]] = {}
+        self._regular_monsters_by_floor: Dict[int, Tuple[str, ...]] = {}  # ボスを除く（エンカウンター用）
+        self._monsters_by_level: Dict[int, Tuple[str, ...]] = {}
+        self._boss_monsters: Tuple[str, ...] = ()
+        self._regular_monsters: Tuple[str, ...] = ()
+        # テンプレートを構築し直すたびに増える版数（派生テーブルの再構築判定用）
+        self.templates_version = 0
+        
         self._load_monster_data()
+        # 設定の再読み込みでテンプレートと索引を構築し直す
+        self.config_manager.add_reload_listener(self.reload_monsters)
         
         logger.debug("MonsterManager初期化完了")
     
@@ -392,88 +454,128 @@ class MonsterManager:
         """モンスターデータ読み込み"""
         try:
             # 設定ファイルからモンスターデータを読み込み
-            monster_config = config_manager.load_config("monsters")
+            monster_config = self.config_manager.load_config("monsters")
             self.monster_templates = monster_config.get("monsters", {})
+            self._compile_damage_dice()
             
             logger.info(f"モンスターテンプレート{len(self.monster_templates)}種類を読み込みました")
-            
+        
         except Exception as e:
             logger.error(f"モンスターデータの読み込みに失敗: {e}")
             self.monster_templates = {}
+        
+        self._compile_templates()
     
+    def _compile_damage_dice(self):
+        """テンプレートのダメージダイスを解析（不正な式はデフォルトに置き換える）"""
+        self.damage_dice = {}
+        for monster_id, template in self.monster_templates.items():
+            try:
+                expression = template.get('damage_dice', DEFAULT_DAMAGE_DICE)
+                if not isinstance(expression, str):
+                    raise TypeError(f"ダイス式が文字列ではありません: {expression!r}")
+                self.damage_dice[monster_id] = compile_dice(expression)
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"モンスター {monster_id} のダメージダイスが不正です: {e}")
+                self.damage_dice[monster_id] = compile_dice(DEFAULT_DAMAGE_DICE)
+    
+    def get_damage_dice(self, monster_id: str) -> Optional[DiceExpression]:
+        """モンスターの解析済みダメージダイスを取得"""
+        return self.damage_dice.get(monster_id)
+    
+    def _compile_templates(self):
+        """全テンプレートを共有テンプレートに変換し、階層・レベル・ボス別の索引を構築"""
+        self.templates = {}
+        by_floor: Dict[int, List[str]] = {}
+        by_level: Dict[int, List[str]] = {}
+        
+        for monster_id, raw_template in self.monster_templates.items():
+            try:
+                template = self._compile_template(monster_id, raw_template)
+            except Exception as e:
+                logger.warning(f"モンスターテンプレートの構築に失敗: {monster_id}, {e}")
+                continue
+            
+            self.templates[monster_id] = template
+            for floor in template.floors:
+                by_floor.setdefault(floor, []).append(monster_id)
+            by_level.setdefault(template.stats.level, []).append(monster_id)
+        
+        self._monsters_by_floor = {floor: tuple(ids) for floor, ids in by_floor.items()}
+        self._regular_monsters_by_floor = {
+            floor: tuple(monster_id for monster_id in ids if not self.templates[monster_id].is_boss)
+            for floor, ids in by_floor.items()
+        }
+        self._monsters_by_level = {level: tuple(ids) for level, ids in by_level.items()}
+        self._boss_monsters = tuple(monster_id for monster_id, t in self.templates.items() if t.is_boss)
+        self._regular_monsters = tuple(monster_id for monster_id, t in self.templates.items() if not t.is_boss)
+        self.templates_version += 1
+    
+    def _compile_template(self, monster_id: str, template: Dict[str, Any]) -> MonsterTemplate:
+        """生データから共有テンプレートを構築"""
+        floors = list(template.get('floors', []))
+        if 'floor' in template and template['floor'] not in floors:
+            floors.append(template['floor'])
+        
+        return MonsterTemplate(
+            monster_id=monster_id,
+            names=MappingProxyType(dict(template.get('names', {}))),
+            descriptions=MappingProxyType(dict(template.get('descriptions', {}))),
+            default_name=template.get('name', ''),
+            default_description=template.get('description', ''),
+            stats=self._create_monster_stats(template, monster_id),
+            resistances=MappingProxyType(self._create_resistances(template)),
+            abilities=tuple(self._create_abilities(template)),
+            loot_table=tuple(MappingProxyType(entry) for entry in
+                             self._convert_drops_to_loot_table(template.get('drops', []))),
+            experience_value=template.get('exp_reward', COOLDOWN_EXPIRED),
+            is_boss=template.get('is_boss', False),
+            floors=tuple(sorted(floors)),
+            encounter_weight=template.get('encounter_weight', 0)
+        )
     
     def create_monster(self, monster_id: str, level_modifier: int = COOLDOWN_EXPIRED) -> Optional[Monster]:
-        """モンスター作成"""
-        if monster_id not in self.monster_templates:
+        """モンスター作成
+        
+        耐性・特殊能力・ドロップテーブルはテンプレートのもの（読み取り専用）を共有し、
+        インスタンスには統計値の複製と戦闘中に変化する状態のみを持たせる。
+        """
+        template = self.templates.get(monster_id)
+        if template is None:
             logger.error(f"未知のモンスターID: {monster_id}")
             return None
         
-        template = self.monster_templates[monster_id]
-        
-        # 多言語対応の名前と説明を取得
-        name = self._get_localized_name(template)
-        description = self._get_localized_description(template)
-        
-        # 統計値作成
-        stats = self._create_monster_stats(template, level_modifier)
+        language = getattr(config_manager, 'current_language', FALLBACK_LANGUAGE)
+        stats = replace(template.stats)
+        if level_modifier != COOLDOWN_EXPIRED:
+            self._apply_level_modifier(stats, level_modifier)
         
-        # モンスター作成
         monster = Monster(
             monster_id=monster_id,
-            name=name,
-            description=description,
+            name=template.get_name(language),
+            description=template.get_description(language),
             monster_type=MonsterType.HUMANOID,
             size=MonsterSize.MEDIUM,
             stats=stats,
-            loot_table=self._convert_drops_to_loot_table(template.get('drops', [])),
-            experience_value=template.get('exp_reward', COOLDOWN_EXPIRED)
+            resistances=template.resistances,
+            abilities=template.abilities,
+            loot_table=template.loot_table,
+            experience_value=template.experience_value,
+            template=template
         )
         
-        # 耐性と特殊能力設定
-        self._setup_monster_resistances(monster, template)
-        self._setup_monster_abilities(monster, template)
-        
         logger.debug(f"モンスター作成: {monster.name} (Lv.{monster.stats.level})")
         return monster
     
-    def _get_localized_name(self, template: Dict[str, Any]) -> str:
-        """ローカライズされた名前を取得"""
-        current_language = getattr(config_manager, 'current_language', FALLBACK_LANGUAGE)
-        
-        if 'names' in template:
-            names = template['names']
-            if current_language in names:
-                return names[current_language]
-            elif FALLBACK_LANGUAGE in names:
-                return names[FALLBACK_LANGUAGE]
-            else:
-                return list(names.values())[FIRST_ELEMENT_INDEX]
-        else:
-            return template.get('name', '')
-    
-    def _get_localized_description(self, template: Dict[str, Any]) -> str:
-        """ローカライズされた説明を取得"""
-        current_language = getattr(config_manager, 'current_language', FALLBACK_LANGUAGE)
-        
-        if 'descriptions' in template:
-            descriptions = template['descriptions']
-            if current_language in descriptions:
-                return descriptions[current_language]
-            elif FALLBACK_LANGUAGE in descriptions:
-                return descriptions[FALLBACK_LANGUAGE]
-            else:
-                return list(descriptions.values())[FIRST_ELEMENT_INDEX]
-        else:
-            return template.get('description', '')
-    
-    def _create_monster_stats(self, template: Dict[str, Any], level_modifier: int) -> MonsterStats:
-        """モンスター統計値を作成"""
+    def _create_monster_stats(self, template: Dict[str, Any], monster_id: str) -> MonsterStats:
+        """モンスター統計値を作成（レベル修正なし）"""
+        dice = self.damage_dice.get(monster_id) or compile_dice(DEFAULT_DAMAGE_DICE)
         stats_data = {
             'level': template.get('level', DEFAULT_LEVEL),
             'hit_points': template.get('hp', DEFAULT_HIT_POINTS),
             'armor_class': DEFAULT_AC_BASE + template.get('defense', COOLDOWN_EXPIRED),
             'attack_bonus': template.get('attack', DEFAULT_ATTACK_BONUS),
-            'damage_dice': DEFAULT_DAMAGE_DICE,
+            'damage_dice': dice,
             'strength': template.get('attack', DEFAULT_STAT_VALUE),
             'agility': template.get('agility', DEFAULT_STAT_VALUE),
             'intelligence': template.get('intelligence', DEFAULT_STAT_VALUE),
@@ -481,28 +583,26 @@ class MonsterManager:
             'luck': template.get('luck', DEFAULT_STAT_VALUE)
         }
         
-        if level_modifier != COOLDOWN_EXPIRED:
-            self._apply_level_modifier(stats_data, level_modifier)
-        
         return MonsterStats.from_dict(stats_data)
     
-    def _apply_level_modifier(self, stats_data: Dict[str, Any], level_modifier: int):
+    def _apply_level_modifier(self, stats: MonsterStats, level_modifier: int):
         """レベル修正を適用"""
-        stats_data['level'] += level_modifier
-        stats_data['hit_points'] += level_modifier * LEVEL_HP_MODIFIER
-        stats_data['attack_bonus'] += level_modifier // LEVEL_ATTACK_DIVISOR
+        stats.level += level_modifier
+        stats.hit_points += level_modifier * LEVEL_HP_MODIFIER
+        stats.attack_bonus += level_modifier // LEVEL_ATTACK_DIVISOR
     
-    def _setup_monster_resistances(self, monster: Monster, template: Dict[str, Any]):
-        """モンスターの耐性を設定"""
+    def _create_resistances(self, template: Dict[str, Any]) -> Dict[DungeonAttribute, MonsterResistance]:
+        """モンスターの耐性を作成"""
+        result = {}
         resistances = template.get('resistances', {})
         for attr_name, resistance_value in resistances.items():
             try:
                 attr = self._convert_attribute_name(attr_name)
                 if attr:
-                    res = self._determine_resistance_level(resistance_value)
-                    monster.resistances[attr] = res
+                    result[attr] = self._determine_resistance_level(resistance_value)
             except Exception as e:
                 logger.warning(f"耐性設定エラー: {attr_name}={resistance_value}, {e}")
+        return result
     
     def _convert_attribute_name(self, attr_name: str) -> Optional[DungeonAttribute]:
         """属性名をDungeonAttributeに変換"""
@@ -525,8 +625,9 @@ class MonsterManager:
         else:
             return MonsterResistance.NORMAL
     
-    def _setup_monster_abilities(self, monster: Monster, template: Dict[str, Any]):
-        """モンスターの特殊能力を設定"""
+    def _create_abilities(self, template: Dict[str, Any]) -> List[MonsterAbility]:
+        """モンスターの特殊能力を作成"""
+        abilities = []
         for ability_data in template.get('special_abilities', []):
             try:
                 ability = MonsterAbility(
@@ -538,9 +639,10 @@ class MonsterManager:
                     usage_count=UNLIMITED_USAGE,
                     target_type='enemy'
                 )
-                monster.abilities.append(ability)
+                abilities.append(ability)
             except Exception as e:
                 logger.warning(f"特殊能力設定エラー: {ability_data}, {e}")
+        return abilities
     
     def _convert_drops_to_loot_table(self, drops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """ドロップ情報をルートテーブルに変換"""
@@ -558,22 +660,32 @@ class MonsterManager:
         """モンスターテンプレート取得"""
         return self.monster_templates.get(monster_id)
     
+    def get_template(self, monster_id: str) -> Optional[MonsterTemplate]:
+        """共有テンプレート取得"""
+        return self.templates.get(monster_id)
+    
     def is_boss_monster(self, monster_id: str) -> bool:
         """ボスモンスターかどうか判定"""
-        template = self.get_monster_template(monster_id)
-        if template:
-            return template.get('is_boss', False)
-        return False
+        template = self.templates.get(monster_id)
+        return template.is_boss if template else False
     
     def get_boss_monsters(self) -> List[str]:
         """ボスモンスター一覧を取得"""
-        return [monster_id for monster_id, template in self.monster_templates.items() 
-                if template.get('is_boss', False)]
+        return list(self._boss_monsters)
     
     def get_regular_monsters(self) -> List[str]:
         """通常モンスター一覧を取得"""
-        return [monster_id for monster_id, template in self.monster_templates.items() 
-                if not template.get('is_boss', False)]
+        return list(self._regular_monsters)
+    
+    def get_monsters_for_floor(self, floor: int, include_bosses: bool = False) -> Tuple[str, ...]:
+        """指定階層に出現するモンスターID一覧を取得"""
+        if include_bosses:
+            return self._monsters_by_floor.get(floor, ())
+        return self._regular_monsters_by_floor.get(floor, ())
+    
+    def get_monsters_by_level(self, level: int) -> Tuple[str, ...]:
+        """指定レベル（ランク）のモンスターID一覧を取得"""
+        return self._monsters_by_level.get(level, ())
     
     def get_available_monsters(self) -> List[str]:
         """利用可能モンスターID一覧"""
@@ -616,6 +728,13 @@ class MonsterManager:
         monster.stats.hit_points = int(monster.stats.hit_points * scaling_factor)
         monster.stats.attack_bonus = max(COOLDOWN_EXPIRED, monster.stats.attack_bonus - abs(level_diff) // SCALING_DIVISOR)
         monster.current_hp = monster.stats.hit_points
+    
+    def reload_monsters(self):
+        """モンスター定義の再読み込み（monsters.yaml を読み直し、テンプレートと索引も構築し直す）"""
+        self.monsters.clear()
+        self.config_manager.reload_config("monsters")
+        self._load_monster_data()
+        logger.info("モンスター定義を再読み込みしました")
 
 
 # グローバルインスタンス
@@ -3,11 +3,19 @@
 from .navigation_manager import (
     NavigationManager,
     MovementResult,
+    AutoTravelResult,
     navigation_manager
 )
+from .encounter_profile import (
+    EncounterRateProfile,
+    compute_encounter_profile
+)
 
 __all__ = [
     "NavigationManager",
     "MovementResult", 
-    "navigation_manager"
+    "AutoTravelResult",
+    "navigation_manager",
+    "EncounterRateProfile",
+    "compute_encounter_profile"
 ]
\ No newline at end of file
@@ -0,0 +1,251 @@
+"""エンカウンター率プロファイル
+
+前回のエンカウンターからの歩数で上昇するエンカウンター率から、階層ごとの
+期待エンカウンター数をサンプリングせずに有理数で厳密に計算する。
+確率の計算は歩数（前回のエンカウンターからの歩数）を状態とするマルコフ連鎖として行う。
+"""
+
+from dataclasses import dataclass
+from fractions import Fraction
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.dungeon.dungeon_generator import DIRECTION_DELTAS, DungeonCell, DungeonLevel
+
+# 浮動小数点の確率を有理数にするときの分母の上限（設定値の丸め誤差を除く）
+RATE_DENOMINATOR_LIMIT = 10 ** 6
+# エンカウンター率が上がり続けない場合に打ち切る歩数（以降は一定の率として扱う）
+MAX_STEPS_WITHOUT_ENCOUNTER = 1000
+
+# 前回のエンカウンターからの歩数 -> その歩でのエンカウンター率
+EncounterRateFunction = Callable[[int], float]
+# セル -> そのセルでエンカウンター判定が行われる確率
+EncounterCheckFunction = Callable[[DungeonCell], float]
+
+
+def to_probability(rate: float) -> Fraction:
+    """確率を有理数に変換（[0, 1] に収める）"""
+    value = Fraction(rate).limit_denominator(RATE_DENOMINATOR_LIMIT)
+    return min(Fraction(1), max(Fraction(0), value))
+
+
+class EncounterHazard:
+    """歩数ごとのエンカウンター率（有理数）を必要な分だけ計算して保持する"""
+    
+    def __init__(self, rate_function: EncounterRateFunction):
+        self.rate_function = rate_function
+        self._rates: List[Fraction] = [Fraction(0)]
+    
+    def __call__(self, steps_since_encounter: int) -> Fraction:
+        steps_since_encounter = min(steps_since_encounter, MAX_STEPS_WITHOUT_ENCOUNTER)
+        while len(self._rates) <= steps_since_encounter:
+            self._rates.append(to_probability(self.rate_function(len(self._rates))))
+        return self._rates[steps_since_encounter]
+
+
+@dataclass(frozen=True)
+class EncounterRateProfile:
+    """階層のエンカウンター率プロファイル"""
+    level: int
+    per_step: Fraction                              # 1歩あたりの期待エンカウンター数（長期平均）
+    mean_steps_between_encounters: Optional[Fraction]  # エンカウンター間の平均歩数（遭遇しないならNone）
+    exploration_steps: int                          # 到達可能な全セルを踏む巡回の歩数（分岐への往復を含む）
+    per_exploration: Fraction                       # 全探索の巡回での期待エンカウンター数
+    stairs_path_steps: Optional[int]                # 階段間の最短歩数（到達不能ならNone）
+    per_stairs_path: Optional[Fraction]             # 最短経路での期待エンカウンター数
+    stairs_path_fight_distribution: Tuple[Fraction, ...] = ()  # 最短経路での戦闘回数の分布
+    
+    def probability_of_reaching_stairs(self, max_fights: int) -> Optional[Fraction]:
+        """戦闘 max_fights 回以内で下り階段に到達する確率"""
+        if self.stairs_path_steps is None:
+            return None
+        return sum(self.stairs_path_fight_distribution[:max(0, max_fights) + 1], Fraction(0))
+    
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """表示用に浮動小数点へ変換した辞書"""
+        def as_float(value: Optional[Fraction]) -> Optional[float]:
+            return float(value) if value is not None else None
+        
+        return {
+            'level': self.level,
+            'per_step': float(self.per_step),
+            'mean_steps_between_encounters': as_float(self.mean_steps_between_encounters),
+            'exploration_steps': self.exploration_steps,
+            'per_exploration': float(self.per_exploration),
+            'stairs_path_steps': self.stairs_path_steps,
+            'per_stairs_path': as_float(self.per_stairs_path)
+        }
+
+
+def mean_steps_between_encounters(hazard: EncounterHazard) -> Optional[Fraction]:
+    """エンカウンターの直後から次のエンカウンターまでの平均歩数
+    
+    E[T] = Σ P(T > s) を生存確率の積で求める。率が1に達した時点で打ち切り、
+    上限歩数まで達しない場合は以降を一定の率（幾何分布）として足し合わせる。
+    """
+    total = Fraction(0)
+    survival = Fraction(1)
+    for steps in range(1, MAX_STEPS_WITHOUT_ENCOUNTER + 1):
+        total += survival
+        survival *= 1 - hazard(steps)
+        if not survival:
+            return total
+    
+    tail_rate = hazard(MAX_STEPS_WITHOUT_ENCOUNTER)
+    if not tail_rate:
+        return None
+    return total + survival / tail_rate
+
+
+def fight_count_distribution(check_chances: Sequence[Fraction], hazard: EncounterHazard,
+                             steps_since_encounter: int = 0) -> Tuple[Fraction, ...]:
+    """各歩のエンカウンター判定確率の列から、戦闘回数の確率分布を求める
+    
+    状態は (前回のエンカウンターからの歩数, 戦闘回数)。判定が行われない歩でも歩数は増える。
+    """
+    states: Dict[Tuple[int, int], Fraction] = {(steps_since_encounter, 0): Fraction(1)}
+    for check_chance in check_chances:
+        next_states: Dict[Tuple[int, int], Fraction] = {}
+        for (steps, fights), probability in states.items():
+            rate = check_chance * hazard(steps + 1)
+            if rate:
+                key = (0, fights + 1)
+                next_states[key] = next_states.get(key, 0) + probability * rate
+            if rate != 1:
+                key = (steps + 1, fights)
+                next_states[key] = next_states.get(key, 0) + probability * (1 - rate)
+        states = next_states
+    
+    distribution: List[Fraction] = []
+    for (_, fights), probability in states.items():
+        while len(distribution) <= fights:
+            distribution.append(Fraction(0))
+        distribution[fights] += probability
+    return tuple(distribution)
+
+
+def expected_fight_count(check_chances: Sequence[Fraction], hazard: EncounterHazard,
+                         steps_since_encounter: int = 0) -> Fraction:
+    """各歩のエンカウンター判定確率の列から、戦闘回数の期待値を求める
+    
+    fight_count_distribution と同じマルコフ連鎖を戦闘回数について周辺化し、各歩の
+    エンカウンター確率を足し合わせる。状態は前回のエンカウンターからの歩数だけなので
+    長い巡回でも状態数は打ち切り歩数で抑えられる。
+    確率は共通の分母に対する整数の分子で持ち、約分は最後に一度だけ行う。
+    """
+    states: Dict[int, int] = {min(steps_since_encounter, MAX_STEPS_WITHOUT_ENCOUNTER): 1}
+    denominator = 1
+    expected = 0
+    for check_chance in check_chances:
+        rates = {steps: check_chance * hazard(steps + 1) for steps in states}
+        step_denominator = math.lcm(*(rate.denominator for rate in rates.values()))
+        denominator *= step_denominator
+        expected *= step_denominator
+        
+        next_states: Dict[int, int] = {}
+        for steps, probability in states.items():
+            rate = rates[steps]
+            scale = step_denominator // rate.denominator
+            encounter = probability * rate.numerator * scale
+            if encounter:
+                expected += encounter
+                next_states[0] = next_states.get(0, 0) + encounter
+            if rate != 1:
+                # 打ち切り歩数以降は率が変わらないので同じ状態にまとめる
+                key = min(steps + 1, MAX_STEPS_WITHOUT_ENCOUNTER)
+                next_states[key] = next_states.get(key, 0) + probability * (rate.denominator - rate.numerator) * scale
+        states = next_states
+    return Fraction(expected, denominator)
+
+
+def get_stairs_endpoints(level: DungeonLevel) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """階層の入口（上り階段、なければ開始位置）と出口（下り階段）"""
+    return level.stairs_up_position or level.start_position, level.stairs_down_position
+
+
+def exploration_tour(level: DungeonLevel, entrance: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """入口から到達可能な全セルを踏む巡回で踏み込むセルの列（入口を含まない）
+    
+    入口からの最短経路木を深さ優先でたどり、行き止まりの分岐は往復して最も遠い枝を最後に
+    踏んで終える。歩数は 2·(セル数−1) − 最遠セルまでの歩数。
+    ループのない階層（木）では最少歩数の巡回になり、ループがある階層では実際に歩ける
+    巡回の歩数であって最少歩数の上界になる。
+    """
+    distance_field = level.get_distance_field(entrance)
+    children: Dict[Tuple[int, int], List[Tuple[int, int]]] = {cell: [] for cell in distance_field}
+    for (x, y), distance in distance_field.items():
+        # 入口側へ1歩近づく隣接セルを親とする（移動は双方向）
+        for direction, (dx, dy) in DIRECTION_DELTAS.items():
+            parent = (x + dx, y + dy)
+            if distance and distance_field.get(parent) == distance - 1 and level.can_move(x, y, direction):
+                children[parent].append((x, y))
+                break
+    
+    # 部分木の最遠距離の小さい枝から順にたどり、最も遠い枝を最後にする
+    depth: Dict[Tuple[int, int], int] = {}
+    for cell in sorted(distance_field, key=distance_field.get, reverse=True):
+        depth[cell] = max((depth[child] for child in children[cell]), default=distance_field[cell])
+    
+    tour: List[Tuple[int, int]] = []
+    stack = [(entrance, iter(sorted(children[entrance], key=depth.get)))]
+    while stack:
+        child = next(stack[-1][1], None)
+        if child is None:
+            stack.pop()
+            if stack:
+                tour.append(stack[-1][0])
+            continue
+        tour.append(child)
+        stack.append((child, iter(sorted(children[child], key=depth.get))))
+    
+    # 最後に踏んだ最遠セルから入口へ戻る分は含めない
+    return tour[:len(tour) - max(distance_field.values())]
+
+
+def compute_encounter_profile(level: DungeonLevel, rate_function: EncounterRateFunction,
+                              check_function: Optional[EncounterCheckFunction] = None,
+                              steps_since_encounter: int = 0) -> EncounterRateProfile:
+    """階層のエンカウンター率プロファイルを計算
+    
+    Args:
+        level: 対象の階層
+        rate_function: 前回のエンカウンターからの歩数に対するエンカウンター率
+        check_function: セルに踏み込んだときにエンカウンター判定が行われる確率（省略時は常に判定）
+        steps_since_encounter: 階段を出発する時点での前回のエンカウンターからの歩数
+    """
+    hazard = EncounterHazard(rate_function)
+    mean_steps = mean_steps_between_encounters(hazard)
+    per_step = 1 / mean_steps if mean_steps else Fraction(0)
+    
+    def check_chances(cells: Sequence[Tuple[int, int]]) -> List[Fraction]:
+        return [
+            to_probability(check_function(level.get_cell(x, y))) if check_function else Fraction(1)
+            for x, y in cells
+        ]
+    
+    entrance, exit_position = get_stairs_endpoints(level)
+    # 入口へ戻れるセルは入口から行き来できるセル（移動は双方向）
+    tour = exploration_tour(level, entrance) if entrance else []
+    per_exploration = expected_fight_count(check_chances(tour), hazard, steps_since_encounter)
+    
+    path = level.get_path(entrance, exit_position) if entrance and exit_position else None
+    if path is None:
+        stairs_path_steps = None
+        per_stairs_path = None
+        distribution: Tuple[Fraction, ...] = ()
+    else:
+        distribution = fight_count_distribution(check_chances(path), hazard, steps_since_encounter)
+        stairs_path_steps = len(path)
+        per_stairs_path = sum((fights * probability for fights, probability in enumerate(distribution)),
+                              Fraction(0))
+    
+    return EncounterRateProfile(
+        level=level.level,
+        per_step=per_step,
+        mean_steps_between_encounters=mean_steps,
+        exploration_steps=len(tour),
+        per_exploration=per_exploration,
+        stairs_path_steps=stairs_path_steps,
+        per_stairs_path=per_stairs_path,
+        stairs_path_fight_distribution=distribution
+    )
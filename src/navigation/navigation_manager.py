@@ -7,8 +7,9 @@ import time
 import random
 
 from src.dungeon.dungeon_manager import DungeonManager, DungeonState, PlayerPosition
-from src.dungeon.dungeon_generator import Direction, CellType, DungeonLevel, DungeonCell
+from src.dungeon.dungeon_generator import DIRECTION_DELTAS, Direction, CellType, DungeonLevel, DungeonCell
 from src.character.party import Party
+from src.navigation.encounter_profile import EncounterRateProfile, compute_encounter_profile
 from src.utils.logger import logger
 
 # ナビゲーションシステム定数
@@ -35,6 +36,12 @@ ENCOUNTER_RUN_MULTIPLIER = 1.5
 ENCOUNTER_STEP_INCREASE_RATE = 0.05
 FIRST_ELEMENT_INDEX = 0
 
+# 自動移動で踏み込んだら停止するセルタイプ（罠・宝箱のフラグがあるセルでも停止する）
+AUTO_TRAVEL_STOP_CELL_TYPES = {
+    CellType.STAIRS_UP, CellType.STAIRS_DOWN, CellType.TREASURE,
+    CellType.TRAP, CellType.SPECIAL, CellType.BOSS
+}
+
 
 class MovementType(Enum):
     """移動タイプ"""
@@ -77,6 +84,15 @@ class NavigationState:
     sneak_mode: bool = False            # 忍び足モード
 
 
+@dataclass
+class AutoTravelResult:
+    """自動移動の結果"""
+    completed: bool                           # 目的地に到着したか
+    steps: int                                # 実際に移動した歩数
+    path: List[Tuple[int, int]]               # 計画した経路（開始位置を含まない）
+    last_event: Optional[MovementEvent] = None  # 最後の移動イベント（停止した理由）
+
+
 class NavigationManager:
     """ナビゲーション管理システム"""
     
@@ -109,7 +125,7 @@ class NavigationManager:
         # 循環参照防止：既に同じパーティが設定されている場合はスキップ
         if self.current_party is party:
             return
-            
+        
         self.current_party = party
         logger.info(f"パーティ{party.name}を設定しました")
     
@@ -355,6 +371,94 @@ class NavigationManager:
                 new_position=old_position
             )
     
+    def plan_auto_travel(self, target: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """発見済みのセルだけを通る目的地までの経路を計画（到達できなければNone）"""
+        if self._validate_movement_preconditions():
+            return None
+        
+        dungeon_state = self.dungeon_manager.current_dungeon
+        pos = dungeon_state.player_position
+        current_level = dungeon_state.levels.get(pos.level)
+        if not current_level:
+            return None
+        
+        discovered = {tuple(cell) for cell in dungeon_state.discovered_cells.get(pos.level, [])}
+        discovered.add((pos.x, pos.y))
+        return current_level.find_path((pos.x, pos.y), target, discovered)
+    
+    def auto_travel(self, target: Tuple[int, int], movement_type: MovementType = MovementType.WALK) -> AutoTravelResult:
+        """発見済みのセルを通って目的地まで自動移動
+        
+        1歩ずつ move_player を呼ぶので、歩数・エンカウンター・罠の判定は手動で歩いた場合と同じになる。
+        途中の描画は行わず、移動イベントが発生するか罠・宝箱・階段などのセルに踏み込んだ時点で停止する。
+        """
+        validation_result = self._validate_movement_preconditions()
+        if validation_result:
+            return AutoTravelResult(completed=False, steps=0, path=[], last_event=validation_result)
+        
+        path = self.plan_auto_travel(target)
+        pos = self.dungeon_manager.current_dungeon.player_position
+        if path is None:
+            position = (pos.x, pos.y, pos.level)
+            event = MovementEvent(
+                result=MovementResult.INVALID_TARGET,
+                message="目的地までの既知の経路がありません",
+                old_position=position,
+                new_position=position
+            )
+            return AutoTravelResult(completed=False, steps=0, path=[], last_event=event)
+        
+        steps = 0
+        event = None
+        for x, y in path:
+            direction = self._get_step_direction((pos.x, pos.y), (x, y))
+            event = self.move_player(direction, movement_type)
+            if event.new_position != event.old_position:
+                steps += 1
+            if event.result != MovementResult.SUCCESS:
+                break
+            if self._is_auto_travel_stop_cell(self.dungeon_manager.get_current_cell()):
+                break
+        
+        completed = (pos.x, pos.y) == tuple(target)
+        logger.debug(f"自動移動: {steps}/{len(path)}歩 ({'到着' if completed else '停止'})")
+        return AutoTravelResult(completed=completed, steps=steps, path=path, last_event=event)
+    
+    def auto_travel_to_stairs(self, direction: str, movement_type: MovementType = MovementType.WALK) -> AutoTravelResult:
+        """現在の階層の階段まで自動移動（"up" は上り階段、なければ入口）"""
+        target = None
+        if self.dungeon_manager and self.dungeon_manager.current_dungeon:
+            dungeon_state = self.dungeon_manager.current_dungeon
+            current_level = dungeon_state.levels.get(dungeon_state.player_position.level)
+            if current_level:
+                if direction == "up":
+                    target = current_level.stairs_up_position or current_level.start_position
+                elif direction == "down":
+                    target = current_level.stairs_down_position
+        
+        if not target:
+            return AutoTravelResult(completed=False, steps=0, path=[], last_event=MovementEvent(
+                result=MovementResult.INVALID_TARGET,
+                message="階段の位置が分かりません",
+                old_position=DEFAULT_POSITION,
+                new_position=DEFAULT_POSITION
+            ))
+        return self.auto_travel(target, movement_type)
+    
+    def _get_step_direction(self, start: Tuple[int, int], target: Tuple[int, int]) -> Direction:
+        """隣接セルへの移動方向を取得"""
+        delta = (target[0] - start[0], target[1] - start[1])
+        for direction, direction_delta in DIRECTION_DELTAS.items():
+            if direction_delta == delta:
+                return direction
+        raise ValueError(f"隣接していないセルです: {start} -> {target}")
+    
+    def _is_auto_travel_stop_cell(self, cell: Optional[DungeonCell]) -> bool:
+        """自動移動を停止するセルか"""
+        if not cell:
+            return True
+        return cell.has_trap or cell.has_treasure or cell.cell_type in AUTO_TRAVEL_STOP_CELL_TYPES
+    
     def set_movement_mode(self, sneak: bool = False, auto_map: bool = True):
         """移動モード設定"""
         self.navigation_state.sneak_mode = sneak
@@ -475,8 +579,9 @@ class NavigationManager:
         
         return None
     
-    def _calculate_encounter_rate(self, current_level: DungeonLevel, movement_type: MovementType) -> float:
-        """エンカウンター率を計算"""
+    def _calculate_encounter_rate(self, current_level: DungeonLevel, movement_type: MovementType,
+                                  steps_since_encounter: Optional[int] = None) -> float:
+        """エンカウンター率を計算（歩数省略時は現在の状態の歩数）"""
         # 基本エンカウンター率
         encounter_rate = current_level.encounter_rate * self.navigation_state.encounter_rate
         
@@ -484,7 +589,7 @@ class NavigationManager:
         encounter_rate *= self._get_movement_encounter_multiplier(movement_type)
         
         # 歩数による調整
-        encounter_rate *= self._get_step_encounter_multiplier()
+        encounter_rate *= self._get_step_encounter_multiplier(steps_since_encounter)
         
         return encounter_rate
     
@@ -497,13 +602,45 @@ class NavigationManager:
         else:
             return DEFAULT_MOVEMENT_SPEED
     
-    def _get_step_encounter_multiplier(self) -> float:
+    def _get_step_encounter_multiplier(self, steps_since_encounter: Optional[int] = None) -> float:
         """歩数によるエンカウンター率倍率を取得"""
-        steps_since_encounter = self.navigation_state.step_count - self.navigation_state.last_encounter_step
+        if steps_since_encounter is None:
+            steps_since_encounter = self.navigation_state.step_count - self.navigation_state.last_encounter_step
         if steps_since_encounter > self.encounter_step_threshold:
             return DEFAULT_MOVEMENT_SPEED + (steps_since_encounter - self.encounter_step_threshold) * ENCOUNTER_STEP_INCREASE_RATE
         return DEFAULT_MOVEMENT_SPEED
     
+    def get_encounter_profile(self, dungeon_level: DungeonLevel,
+                              movement_type: MovementType = MovementType.WALK,
+                              steps_since_encounter: int = 0) -> EncounterRateProfile:
+        """階層のエンカウンター率プロファイルを計算
+        
+        移動時と同じエンカウンター率の計算式と階層の構造から、1歩あたり・全探索・
+        階段間の最短経路での期待エンカウンター数と、最短経路での戦闘回数の分布を厳密に求める。
+        トラップ・宝箱・階段のセルでは移動時と同様にエンカウンター判定を行わない
+        （トラップは回避した場合のみ判定する）。
+        """
+        return compute_encounter_profile(
+            dungeon_level,
+            lambda steps: self._calculate_encounter_rate(dungeon_level, movement_type, steps),
+            lambda cell: self._get_encounter_check_chance(cell, movement_type),
+            steps_since_encounter
+        )
+    
+    def get_encounter_profiles(self, dungeon_state: DungeonState,
+                               movement_type: MovementType = MovementType.WALK) -> Dict[int, EncounterRateProfile]:
+        """ダンジョンの全階層のエンカウンター率プロファイルを計算"""
+        return {level_number: self.get_encounter_profile(level, movement_type)
+                for level_number, level in sorted(dungeon_state.levels.items())}
+    
+    def _get_encounter_check_chance(self, cell: DungeonCell, movement_type: MovementType) -> float:
+        """セルに踏み込んだときにエンカウンター判定が行われる確率"""
+        if cell.has_treasure or cell.cell_type in [CellType.STAIRS_UP, CellType.STAIRS_DOWN]:
+            return 0.0
+        if cell.has_trap:
+            return min(1.0, max(0.0, self._calculate_trap_avoid_chance(movement_type)))
+        return 1.0
+    
     def _determine_encounter_type(self) -> str:
         """エンカウンタータイプを決定"""
         encounter_types = ["normal", "ambush", "treasure_guardian"]
@@ -540,17 +677,55 @@ class NavigationManager:
         # 発見済みセルの情報を収集
         discovered_cells = dungeon_state.discovered_cells.get(dungeon_state.player_position.level, [])
         
-        map_data = self._create_map_data_structure(dungeon_state, discovered_cells)
+        map_data = self._create_map_data_structure(dungeon_state, discovered_cells, current_level)
         
         # 発見済みセルの詳細情報を追加
         self._add_cell_details_to_map_data(map_data, discovered_cells, current_level)
         
         return map_data
     
-    def _create_map_data_structure(self, dungeon_state: DungeonState, discovered_cells: List[Tuple[int, int]]) -> Dict[str, Any]:
+    def get_auto_map_changes(self, since_token: Optional[Tuple[int, int, int]]) -> Dict[str, Any]:
+        """指定した時点以降に変化した発見済みセルのみのオートマップデータ取得
+        
+        戻り値の 'token'（階層, 版番号の系列, 版番号）を次回の since_token に渡す。
+        階層が変わった場合、セーブからの復元などで版番号の系列が変わった場合や
+        差分を取得できない場合は 'full' が True の全体データを返す。
+        """
+        if not self.navigation_state.auto_map_enabled or not self.dungeon_manager:
+            return {}
+        
+        dungeon_state = self.dungeon_manager.current_dungeon
+        if not dungeon_state:
+            return {}
+        
+        current_level = dungeon_state.levels.get(dungeon_state.player_position.level)
+        if not current_level:
+            return {}
+        
+        changed_cells = None
+        if (since_token is not None and len(since_token) == 3
+                and since_token[0] == dungeon_state.player_position.level
+                and since_token[1] == current_level.map_epoch):
+            changed_cells = current_level.get_changed_cells(since_token[2])
+        if changed_cells is None:
+            map_data = self.get_auto_map_data()
+            map_data['full'] = True
+            return map_data
+        
+        # 変化したセルのうち発見済みのもののみ
+        discovered_cells = [(x, y) for x, y in changed_cells if current_level.cells[(x, y)].discovered]
+        map_data = self._create_map_data_structure(dungeon_state, discovered_cells, current_level)
+        map_data['full'] = False
+        self._add_cell_details_to_map_data(map_data, discovered_cells, current_level)
+        return map_data
+    
+    def _create_map_data_structure(self, dungeon_state: DungeonState, discovered_cells: List[Tuple[int, int]],
+                                   current_level: DungeonLevel) -> Dict[str, Any]:
         """マップデータ構造を作成"""
         return {
             'level': dungeon_state.player_position.level,
+            'version': current_level.map_version,
+            'token': (dungeon_state.player_position.level, current_level.map_epoch, current_level.map_version),
             'player_position': (dungeon_state.player_position.x, dungeon_state.player_position.y),
             'player_facing': dungeon_state.player_position.facing.value,
             'discovered_cells': discovered_cells,
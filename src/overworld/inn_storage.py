@@ -4,7 +4,7 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 import uuid
 
-from src.inventory.inventory import Inventory, InventorySlot, InventoryManager
+from src.inventory.inventory import Inventory, InventorySlot, InventoryManager, SlotIndexMixin
 from src.items.item import ItemInstance, item_manager
 from src.utils.logger import logger
 
@@ -17,7 +17,7 @@ FIRST_ELEMENT_INDEX = 0
 
 
 @dataclass
-class InnStorage:
+class InnStorage(SlotIndexMixin):
     """宿屋倉庫"""
     storage_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     capacity: int = DEFAULT_STORAGE_CAPACITY  # 倉庫容量（パーティインベントリより大きく）
@@ -27,6 +27,7 @@ class InnStorage:
         """初期化後処理"""
         if not self.slots:
             self.slots = [InventorySlot() for _ in range(self.capacity)]
+        self.rebuild_index()
         logger.debug(f"宿屋倉庫を初期化: {self.storage_id} (容量: {self.capacity})")
     
     def add_item(self, item_instance: ItemInstance) -> bool:
@@ -43,9 +44,10 @@ class InnStorage:
         if not self._is_stackable(item_instance):
             return False
         
-        for slot in self.slots:
+        for index in self.get_item_slots(item_instance.item_id):
+            slot = self.slots[index]
             if self._can_stack_with_slot(slot, item_instance):
-                slot.item_instance.quantity += item_instance.quantity
+                slot.change_quantity(item_instance.quantity)
                 logger.debug(f"宿屋倉庫でアイテムをスタック: {item_instance.item_id} +{item_instance.quantity}")
                 return True
         
@@ -65,11 +67,11 @@ class InnStorage:
     
     def _try_add_to_new_slot(self, item_instance: ItemInstance) -> bool:
         """新しいスロットにアイテムを追加"""
-        for slot in self.slots:
-            if slot.is_empty():
-                slot.add_item(item_instance)
-                logger.info(f"宿屋倉庫にアイテム追加: {item_instance.item_id} x{item_instance.quantity}")
-                return True
+        index = self.find_empty_slot()
+        if index is not None:
+            self.slots[index].add_item(item_instance)
+            logger.info(f"宿屋倉庫にアイテム追加: {item_instance.item_id} x{item_instance.quantity}")
+            return True
         
         logger.warning("宿屋倉庫が満杯です")
         return False
@@ -87,7 +89,7 @@ class InnStorage:
         if quantity >= item_instance.quantity:
             return self._remove_all_items_from_slot(slot, item_instance)
         else:
-            return self._remove_partial_items_from_slot(item_instance, quantity)
+            return self._remove_partial_items_from_slot(slot, item_instance, quantity)
     
     def _is_valid_slot_index(self, slot_index: int) -> bool:
         """スロットインデックスが有効かチェック"""
@@ -100,9 +102,10 @@ class InnStorage:
         logger.info(f"宿屋倉庫からアイテム削除: {removed_item.item_id} x{removed_item.quantity}")
         return removed_item
     
-    def _remove_partial_items_from_slot(self, item_instance: ItemInstance, quantity: int) -> ItemInstance:
+    def _remove_partial_items_from_slot(self, slot: InventorySlot, item_instance: ItemInstance,
+                                        quantity: int) -> ItemInstance:
         """スロットから一部のアイテムを削除"""
-        item_instance.quantity -= quantity
+        slot.change_quantity(-quantity)
         removed_item = ItemInstance(
             item_id=item_instance.item_id,
             quantity=quantity,
@@ -122,7 +125,7 @@ class InnStorage:
     
     def get_used_slots_count(self) -> int:
         """使用中スロット数を取得"""
-        return sum(1 for slot in self.slots if not slot.is_empty())
+        return len(self.slots) - len(self._free_slots)
     
     def get_free_slots_count(self) -> int:
         """空きスロット数を取得"""
@@ -130,11 +133,8 @@ class InnStorage:
     
     def get_all_items(self) -> List[tuple]:
         """全アイテムを(slot_index, item_instance)のタプルで取得"""
-        items = []
-        for i, slot in enumerate(self.slots):
-            if not slot.is_empty():
-                items.append((i, slot.item_instance))
-        return items
+        occupied = sorted(index for slot_indices in self._slots_by_item.values() for index in slot_indices)
+        return [(index, self.slots[index].item_instance) for index in occupied]
     
     def is_full(self) -> bool:
         """倉庫が満杯かチェック"""
@@ -170,6 +170,7 @@ class InnStorage:
         while len(storage.slots) < storage.capacity:
             storage.slots.append(InventorySlot())
         
+        storage.rebuild_index()
         return storage
 
 
@@ -301,12 +302,12 @@ class InnStorageManager:
         storage = self.get_storage()
         
         # 指定されたアイテムを探す
-        for slot_index, item_instance in storage.get_all_items():
-            if item_instance.item_id == item_id:
-                removed_item = storage.remove_item(slot_index, quantity)
-                return removed_item is not None
+        slot_indices = storage.get_item_slots(item_id)
+        if not slot_indices:
+            return False
         
-        return False
+        removed_item = storage.remove_item(slot_indices[0], quantity)
+        return removed_item is not None
     
     def save_storage_data(self) -> Dict[str, Any]:
         """倉庫データを保存用辞書で取得"""
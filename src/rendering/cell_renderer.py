@@ -0,0 +1,200 @@
+"""固定深度セル描画レンダラー（Wizardry風）
+
+グリッドと4方向の向きしか持たないダンジョンの特性を利用し、
+前方Nマス・左右 side_cells マス分の壁ポリゴンを画面サイズごとに事前計算して描画する。
+レイキャスティングを行わないため、描画コストは画面解像度に依存しない。
+"""
+
+import math
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+from src.dungeon.dungeon_manager import PlayerPosition
+from src.dungeon.dungeon_generator import DungeonLevel, CellType, Direction
+from src.rendering.renderer_config import CellViewConfig, CameraConfig
+from src.rendering.wall_renderer import WallRenderer, WallType
+from src.rendering.direction_helper import DirectionHelper
+
+# 面の種類
+FACE_FRONT = "front"
+FACE_LEFT = "left"
+FACE_RIGHT = "right"
+
+# 方向ごとの座標差分
+DIRECTION_DELTAS = {
+    Direction.NORTH: (0, -1),
+    Direction.SOUTH: (0, 1),
+    Direction.EAST: (1, 0),
+    Direction.WEST: (-1, 0)
+}
+
+Polygon = List[Tuple[int, int]]
+
+
+class CellRenderer:
+    """固定深度セル描画処理クラス"""
+    
+    def __init__(self, screen: pygame.Surface, wall_renderer: WallRenderer,
+                 cell_config: CellViewConfig = None, camera_config: CameraConfig = None):
+        self.screen = screen
+        self.wall_renderer = wall_renderer
+        self.cell_config = cell_config or CellViewConfig()
+        self.camera_config = camera_config or CameraConfig()
+        
+        # (深度, 横オフセット, 面) -> (ポリゴン, 塗り色)
+        self._templates: Dict[Tuple[int, int, str], Tuple[Polygon, Tuple[int, int, int]]] = {}
+        self._template_key: Optional[Tuple] = None
+        self.outline_color: Tuple[int, int, int] = (0, 0, 0)
+    
+    def set_target(self, surface: pygame.Surface):
+        """描画先サーフェスを設定（テンプレートはサイズが変われば再計算される）"""
+        self.screen = surface
+    
+    def get_templates(self) -> Dict[Tuple[int, int, str], Tuple[Polygon, Tuple[int, int, int]]]:
+        """壁ポリゴンのテンプレートを取得（画面サイズ・設定変更時のみ再計算）"""
+        key = (self.screen.get_size(), self.wall_renderer.pixel_scale, self.cell_config.depth,
+               self.cell_config.side_cells, self.cell_config.near_clip, self.camera_config.fov)
+        if self._template_key != key:
+            self._templates = self._build_templates()
+            self._template_key = key
+        return self._templates
+    
+    def _build_templates(self) -> Dict[Tuple[int, int, str], Tuple[Polygon, Tuple[int, int, int]]]:
+        """全セル・全面のポリゴンと色を事前計算"""
+        wall_renderer = self.wall_renderer
+        wall_renderer.screen_width, wall_renderer.screen_height = self.screen.get_size()
+        self.outline_color = wall_renderer.calculate_wall_color(0.0, WallType.CORNER.value)
+        
+        templates = {}
+        for depth in range(self.cell_config.depth + 1):
+            for offset in range(-self.cell_config.side_cells, self.cell_config.side_cells + 1):
+                for face in (FACE_FRONT, FACE_LEFT, FACE_RIGHT):
+                    # 正面の壁は奥の辺、側壁はセルの中央の距離で明るさを決める
+                    shade_distance = depth + 0.5 if face == FACE_FRONT else depth
+                    templates[(depth, offset, face)] = (
+                        self._project_quad(*self._get_face_segment(depth, offset, face)),
+                        wall_renderer.calculate_wall_color(shade_distance, WallType.FACE.value)
+                    )
+        return templates
+    
+    def _get_face_segment(self, depth: int, offset: int, face: str) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """壁面の両端（横位置, 前方距離）をカメラ座標で取得"""
+        near_z = max(depth - 0.5, self.cell_config.near_clip)
+        far_z = depth + 0.5
+        if face == FACE_FRONT:
+            return (offset - 0.5, far_z), (offset + 0.5, far_z)
+        if face == FACE_LEFT:
+            return (offset - 0.5, far_z), (offset - 0.5, near_z)
+        return (offset + 0.5, near_z), (offset + 0.5, far_z)
+    
+    def _project_quad(self, start: Tuple[float, float], end: Tuple[float, float]) -> Polygon:
+        """床から天井までの壁面（横位置, 前方距離の2点）を画面ポリゴンに射影"""
+        x1, top1, bottom1 = self._project_edge(*start)
+        x2, top2, bottom2 = self._project_edge(*end)
+        return [(x1, top1), (x2, top2), (x2, bottom2), (x1, bottom1)]
+    
+    def _project_edge(self, lateral: float, forward: float) -> Tuple[int, int, int]:
+        """壁の縦エッジを射影（レイキャスト描画と同じ高さ・位置計算を使用）"""
+        width = self.screen.get_width()
+        normalized = (lateral / forward) / math.tan(self.camera_config.fov_radians / 2)
+        x = int(width / 2 + normalized * (width / 2))
+        
+        wall_height = self.wall_renderer.calculate_wall_height(forward)
+        top = self.wall_renderer.calculate_wall_position(wall_height)
+        return x, top, top + wall_height
+    
+    def render_cells(self, level: DungeonLevel, player_pos: PlayerPosition) -> List[Tuple[int, int, str]]:
+        """プレイヤー前方のセルを奥から手前へ描画し、描画した壁面を返す"""
+        templates = self.get_templates()
+        faces = self._collect_visible_faces(level, player_pos)
+        
+        for key in reversed(faces):
+            polygon, color = templates[key]
+            pygame.draw.polygon(self.screen, color, polygon)
+            pygame.draw.polygon(self.screen, self.outline_color, polygon, 1)
+        return faces
+    
+    def build_depth_buffer(self, faces: List[Tuple[int, int, str]], column_count: int) -> List[float]:
+        """描画した壁面から列ごとの壁までの距離を求める（レイキャスト描画の深度バッファと同じ形式）
+        
+        各列の視線と壁面の交点のうち最も近いものの距離を入れる。
+        どの壁面にも当たらない列は描画範囲の奥端までの距離とする。
+        """
+        depth_buffer = [float(self.cell_config.depth) + 0.5] * column_count
+        half = column_count // 2
+        if not half:
+            return depth_buffer
+        
+        tan_half_fov = math.tan(self.camera_config.fov_radians / 2)
+        for depth, offset, face in faces:
+            (lateral1, forward1), (lateral2, forward2) = self._get_face_segment(depth, offset, face)
+            
+            # 壁面の両端を射影した列の範囲のみ調べる
+            columns = [half + lateral / forward / tan_half_fov * half
+                       for lateral, forward in ((lateral1, forward1), (lateral2, forward2))]
+            first = max(0, math.floor(min(columns)))
+            last = min(column_count - 1, math.ceil(max(columns)))
+            
+            for column in range(first, last + 1):
+                # 視線の傾き（横位置 / 前方距離）
+                slope = (column - half) / half * tan_half_fov
+                if face == FACE_FRONT:
+                    forward = forward1
+                    if not min(lateral1, lateral2) <= slope * forward <= max(lateral1, lateral2):
+                        continue
+                else:
+                    if not slope:
+                        continue
+                    forward = lateral1 / slope
+                    if not min(forward1, forward2) <= forward <= max(forward1, forward2):
+                        continue
+                distance = forward * math.sqrt(1 + slope * slope)
+                if distance < depth_buffer[column]:
+                    depth_buffer[column] = distance
+        return depth_buffer
+    
+    def _collect_visible_faces(self, level: DungeonLevel, player_pos: PlayerPosition) -> List[Tuple[int, int, str]]:
+        """見えている壁面を手前から順に列挙"""
+        facing = player_pos.facing
+        left = DirectionHelper.get_left_direction(facing)
+        right = DirectionHelper.get_right_direction(facing)
+        forward_dx, forward_dy = DIRECTION_DELTAS[facing]
+        right_dx, right_dy = DIRECTION_DELTAS[right]
+        side_cells = self.cell_config.side_cells
+        
+        faces = []
+        for depth in range(self.cell_config.depth + 1):
+            center_x = player_pos.x + forward_dx * depth
+            center_y = player_pos.y + forward_dy * depth
+            
+            # 左右へ側壁に当たるまで（最大 side_cells マス）たどり、途中のセルの正面の壁も描画する
+            for direction, sign in ((left, -1), (right, 1)):
+                face = FACE_LEFT if sign < 0 else FACE_RIGHT
+                side_x, side_y = center_x, center_y
+                for step in range(side_cells + 1):
+                    if self._has_wall(level, side_x, side_y, direction):
+                        faces.append((depth, sign * step, face))
+                        break
+                    if step == side_cells:
+                        break
+                    side_x += right_dx * sign
+                    side_y += right_dy * sign
+                    if self._has_wall(level, side_x, side_y, facing):
+                        faces.append((depth, sign * (step + 1), FACE_FRONT))
+            
+            if self._has_wall(level, center_x, center_y, facing):
+                faces.append((depth, 0, FACE_FRONT))
+                break
+        
+        return faces
+    
+    def _has_wall(self, level: DungeonLevel, x: int, y: int, direction: Direction) -> bool:
+        """セルの指定方向に壁があるか（隣が壁セル・範囲外の場合も壁とみなす）"""
+        cell = level.get_cell(x, y)
+        if cell is None or cell.cell_type == CellType.WALL:
+            return True
+        if cell.walls.get(direction, False):
+            return True
+        dx, dy = DIRECTION_DELTAS[direction]
+        neighbor = level.get_cell(x + dx, y + dy)
+        return neighbor is None or neighbor.cell_type == CellType.WALL
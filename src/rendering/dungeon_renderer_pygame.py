@@ -16,12 +16,13 @@ from src.character.party import Party
 from src.rendering.dungeon_input_handler import DungeonInputHandler, DungeonInputAction, MovementResult
 from src.ui.windows.dungeon_menu_manager import dungeon_menu_manager
 from src.utils.logger import logger
-from src.rendering.renderer_config import RendererConfig
+from src.rendering.renderer_config import RendererConfig, RENDER_MODE_CELL
 from src.rendering.camera import Camera
 from src.rendering.raycast_engine import RaycastEngine
 from src.rendering.wall_renderer import WallRenderer
 from src.rendering.ui_renderer import UIRenderer
 from src.rendering.prop_renderer import PropRenderer
+from src.rendering.cell_renderer import CellRenderer
 from src.rendering.direction_helper import DirectionHelper
 
 
@@ -75,8 +76,16 @@ class DungeonRendererPygame:
         self.camera = Camera(self.config.directions)
         self.raycast_engine = RaycastEngine(self.config.raycast)
         self.wall_renderer = WallRenderer(self.screen, self.config.wall_render, self.config.colors)
+        self.cell_renderer = CellRenderer(self.screen, self.wall_renderer, self.config.cell_view, self.config.camera)
         self.ui_renderer = UIRenderer(self.screen, self.config.ui, self.config.colors)
-        self.prop_renderer = PropRenderer(self.screen, self.config.prop_render, self.config.colors)
+        self.prop_renderer = PropRenderer(self.screen, self.config.prop_render, self.config.colors,
+                                          self.config.camera)
+        
+        # 列ごとの壁距離（プロップの遮蔽判定に使用）
+        self.depth_buffer = []
+        
+        # 内部解像度描画用のオフスクリーンサーフェス
+        self._view_surface: Optional[pygame.Surface] = None
         
         # 入力ハンドラー（分離されたコンポーネント）
         self.input_handler = DungeonInputHandler()
@@ -190,10 +199,12 @@ class DungeonRendererPygame:
         # 疑似3D描画
         try:
             # 床と天井を先に描画（背景クリアの役割も担う）
+            self._begin_view()
             self.wall_renderer.render_floor_and_ceiling()
             
             # 壁面描画
-            self._render_walls_raycast(level, player_position)
+            self._render_walls(level, player_position)
+            self._present_view()
             
             # UI描画（簡易版）
             self.ui_renderer.render_basic_ui(player_position, level)
@@ -256,24 +267,75 @@ class DungeonRendererPygame:
     
     def _render_pseudo_3d(self, level: DungeonLevel, player_pos: PlayerPosition):
         """疑似3D描画（レイキャスティング風）"""
+        self._begin_view()
+        
         # 床と天井を先に描画（これが背景クリアの役割も担う）
         self.wall_renderer.render_floor_and_ceiling()
         
-        # 壁面をレイキャスティングで描画
-        self._render_walls_raycast(level, player_pos)
+        # 壁面を描画（設定に応じてレイキャスティングまたはセル描画）
+        self._render_walls(level, player_pos)
         
         # プロップ（階段、宝箱など）を描画
-        self.prop_renderer.render_props_3d(level, player_pos, self.camera)
+        self.prop_renderer.render_props_3d(level, player_pos, self.camera, self.depth_buffer)
+        
+        self._present_view()
+    
+    def _begin_view(self) -> pygame.Surface:
+        """3Dビューの描画先を準備（内部解像度が画面より小さい場合はオフスクリーン）"""
+        scale = self.config.screen.render_scale
+        screen_width, screen_height = self.screen.get_size()
+        if scale >= 1.0:
+            target = self.screen
+            scale = 1.0
+        else:
+            size = (max(1, int(screen_width * scale)), max(1, int(screen_height * scale)))
+            if self._view_surface is None or self._view_surface.get_size() != size:
+                self._view_surface = pygame.Surface(size)
+                if pygame.display.get_surface() is not None:
+                    self._view_surface = self._view_surface.convert()
+            target = self._view_surface
+            scale = size[1] / screen_height
+        
+        self.wall_renderer.set_target(target, scale)
+        self.prop_renderer.set_target(target, scale)
+        self.cell_renderer.set_target(target)
+        return target
+    
+    def _present_view(self):
+        """オフスクリーンに描画した3Dビューを画面サイズに拡大して転送"""
+        if self.wall_renderer.screen is self.screen:
+            return
+        pygame.transform.scale(self.wall_renderer.screen, self.screen.get_size(), self.screen)
+    
+    def _render_walls(self, level: DungeonLevel, player_pos: PlayerPosition):
+        """描画モードに応じて壁面を描画"""
+        if self.config.render_mode == RENDER_MODE_CELL:
+            self._render_walls_cell(level, player_pos)
+        else:
+            self._render_walls_raycast(level, player_pos)
+    
+    def _render_walls_cell(self, level: DungeonLevel, player_pos: PlayerPosition):
+        """固定深度セル描画による壁面描画"""
+        faces = self.cell_renderer.render_cells(level, player_pos)
+        
+        # プロップの遮蔽判定用に描画した壁面から列ごとの深度バッファを作る
+        ray_count = self.config.raycast.calculate_ray_count(self.wall_renderer.screen_width)
+        self.depth_buffer = self.cell_renderer.build_depth_buffer(faces, ray_count)
     
     def _render_walls_raycast(self, level: DungeonLevel, player_pos: PlayerPosition):
         """レイキャスティングによる壁面描画"""
         # レイキャスティングの準備
-        ray_count = self.config.raycast.calculate_ray_count(self.screen.get_width())
+        ray_count = self.config.raycast.calculate_ray_count(self.wall_renderer.screen_width)
         ray_start = self.camera.get_ray_start_position(player_pos)
         
+        # 深度バッファは列数が変わった時のみ確保し直す
+        if len(self.depth_buffer) != ray_count:
+            self.depth_buffer = [0.0] * ray_count
+        
         for ray_index in range(ray_count):
             ray_angle = self.camera.calculate_ray_angle(ray_index, ray_count, self.config.camera.fov_radians)
             distance, hit_wall, wall_type = self.raycast_engine.cast_ray(level, player_pos, ray_start, ray_angle)
+            self.depth_buffer[ray_index] = distance
             
             if hit_wall:
                 from src.rendering.wall_renderer import WallType
@@ -387,10 +449,12 @@ class DungeonRendererPygame:
         debug_info = {
             "status": "enabled" if self.enabled else "disabled",
             "render_quality": self.render_quality.value,
+            "render_mode": self.config.render_mode,
             "view_mode": self.view_mode.value,
             "fov": self.config.camera.fov,
             "view_distance": self.config.camera.view_distance,
             "screen_size": self.config.screen.size,
+            "render_scale": self.config.screen.render_scale,
             "camera_position": self.camera.get_position(),
             "camera_angle_degrees": self.camera.state.angle_degrees,
             "dungeon_manager_set": self.dungeon_manager is not None,
@@ -2,38 +2,58 @@
 
 import math
 import pygame
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
 
 from src.dungeon.dungeon_manager import PlayerPosition
-from src.dungeon.dungeon_generator import DungeonLevel, CellType
-from src.rendering.renderer_config import PropRenderConfig, ColorConfig
+from src.dungeon.dungeon_generator import CellFeature, DungeonLevel
+from src.rendering.renderer_config import PropRenderConfig, ColorConfig, CameraConfig
 from src.rendering.camera import Camera
 
 
+# プロップとして描画するセル種別（トラップは隠し要素のため描画しない）
+PROP_STAIRS_UP = "stairs_up"
+PROP_STAIRS_DOWN = "stairs_down"
+PROP_TREASURE = "treasure"
+PROP_BOSS = "boss"
+
+# 描画する特徴（描画順）
+PROP_FEATURES = (CellFeature.STAIRS_UP, CellFeature.STAIRS_DOWN, CellFeature.BOSS, CellFeature.TREASURE)
+
+
 class PropRenderer:
     """プロップ（階段、宝箱など）描画処理クラス"""
     
     def __init__(self, screen: pygame.Surface, prop_config: PropRenderConfig = None, 
-                 color_config: ColorConfig = None):
+                 color_config: ColorConfig = None, camera_config: CameraConfig = None):
         self.screen = screen
         self.prop_config = prop_config or PropRenderConfig()
         self.color_config = color_config or ColorConfig()
+        self.camera_config = camera_config or CameraConfig()
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
+        
+        # 表示解像度に対する描画先の倍率（内部解像度描画時は1未満）
+        self.pixel_scale = 1.0
     
-    def render_props_3d(self, level: DungeonLevel, player_pos: PlayerPosition, camera: Camera):
-        """3Dプロップを描画"""
-        for x in range(max(0, player_pos.x - self.prop_config.visibility_range),
-                      min(level.width, player_pos.x + self.prop_config.visibility_range + 1)):
-            for y in range(max(0, player_pos.y - self.prop_config.visibility_range),
-                          min(level.height, player_pos.y + self.prop_config.visibility_range + 1)):
-                
-                cell = level.get_cell(x, y)
-                if not cell:
-                    continue
-                
+    def set_target(self, surface: pygame.Surface, pixel_scale: float = 1.0):
+        """描画先サーフェスと表示解像度に対する倍率を設定"""
+        self.screen = surface
+        self.screen_width, self.screen_height = surface.get_size()
+        self.pixel_scale = pixel_scale
+    
+    def render_props_3d(self, level: DungeonLevel, player_pos: PlayerPosition, camera: Camera,
+                        depth_buffer: Optional[Sequence[float]] = None):
+        """3Dプロップを描画
+        
+        depth_buffer にはレイキャストで得た列ごとの壁距離を渡す。
+        壁より奥にあるプロップは描画前に除外される。
+        """
+        visibility_range = self.prop_config.visibility_range
+        for feature in PROP_FEATURES:
+            # 階層の特徴索引から視認範囲内のセルのみを取得
+            for x, y in level.find_features_in_range(feature, player_pos.x, player_pos.y, visibility_range):
                 # プロップの位置情報を計算
-                prop_info = self._calculate_prop_position(x, y, player_pos, camera)
+                prop_info = self._calculate_prop_position(x, y, player_pos, camera, depth_buffer)
                 
                 if not prop_info['visible']:
                     continue
@@ -42,16 +62,17 @@ class PropRenderer:
                 distance = prop_info['distance']
                 
                 # プロップを描画
-                if cell.cell_type == CellType.STAIRS_UP:
+                if feature == CellFeature.STAIRS_UP:
                     self._draw_stairs(screen_x, distance, True)
-                elif cell.cell_type == CellType.STAIRS_DOWN:
+                elif feature == CellFeature.STAIRS_DOWN:
                     self._draw_stairs(screen_x, distance, False)
-                
-                if cell.has_treasure:
+                elif feature == CellFeature.BOSS:
+                    self._draw_boss(screen_x, distance)
+                elif feature == CellFeature.TREASURE:
                     self._draw_treasure(screen_x, distance)
     
     def _calculate_prop_position(self, x: int, y: int, player_pos: PlayerPosition, 
-                                camera: Camera) -> Dict[str, Any]:
+                                camera: Camera, depth_buffer: Optional[Sequence[float]] = None) -> Dict[str, Any]:
         """プロップの画面位置情報を計算"""
         dx = x - player_pos.x
         dy = y - player_pos.y
@@ -60,16 +81,27 @@ class PropRenderer:
         if distance > self.prop_config.visibility_range:
             return {'visible': False}
         
-        angle_to_prop = math.atan2(dy, dx)
-        relative_angle = angle_to_prop - camera.get_angle()
+        # カメラ座標系（前方・右方向）に変換
+        angle = camera.get_angle()
+        forward_x, forward_y = math.cos(angle), math.sin(angle)
+        forward = dx * forward_x + dy * forward_y
+        lateral = dx * -forward_y + dy * forward_x
+        if forward <= 0:
+            return {'visible': False}
         
-        # FOVを75度と仮定（設定から取得すべき）
-        fov_rad = 75 * math.pi / 180
-        if abs(relative_angle) > fov_rad / 2:
+        # レイの角度計算（tan補正）と同じ射影で正規化した横位置
+        normalized = (lateral / forward) / math.tan(self.camera_config.fov_radians / 2)
+        if abs(normalized) > 1.0:
             return {'visible': False}
         
-        screen_x = int(self.screen_width / 2 + 
-                      (relative_angle / (fov_rad / 2)) * (self.screen_width / 2))
+        screen_x = int(self.screen_width / 2 + normalized * (self.screen_width / 2))
+        
+        # 深度バッファで壁に隠れたプロップを除外
+        if depth_buffer:
+            half = len(depth_buffer) // 2
+            column = min(len(depth_buffer) - 1, max(0, half + int(normalized * half)))
+            if distance > depth_buffer[column]:
+                return {'visible': False}
         
         return {
             'visible': True,
@@ -101,10 +133,21 @@ class PropRenderer:
         pygame.draw.rect(self.screen, self.color_config.treasure, treasure_rect)
         pygame.draw.rect(self.screen, self.color_config.treasure_detail, treasure_rect, 1)
     
+    def _draw_boss(self, screen_x: int, distance: float):
+        """ボス部屋の目印を描画"""
+        if distance > 10.0:  # view_distance
+            return
+        
+        size = self._calculate_prop_size(distance, self.prop_config.boss_base_size)
+        
+        boss_rect = self._create_centered_rect(screen_x, size)
+        pygame.draw.rect(self.screen, self.color_config.boss, boss_rect)
+        pygame.draw.rect(self.screen, self.color_config.white, boss_rect, 1)
+    
     def _calculate_prop_size(self, distance: float, base_size: int) -> int:
         """距離に基づいてプロップのサイズを計算"""
-        return max(self.prop_config.min_size, 
-                  int(base_size / max(distance, self.prop_config.size_divisor)))
+        return max(max(1, int(self.prop_config.min_size * self.pixel_scale)),
+                  int(base_size * self.pixel_scale / max(distance, self.prop_config.size_divisor)))
     
     def _create_centered_rect(self, screen_x: int, size: int) -> pygame.Rect:
         """中央揃えの矩形を作成"""
@@ -10,6 +10,7 @@ class ScreenConfig:
     """画面設定"""
     width: int = 1024
     height: int = 768
+    render_scale: float = 1.0  # 3Dビューの内部解像度倍率（0.5で縦横半分の解像度で描画して拡大表示）
     
     @property
     def size(self) -> Tuple[int, int]:
@@ -66,12 +67,21 @@ class WallRenderConfig:
     view_distance: float = 10.0  # 描画での最大表示距離
 
 
+@dataclass
+class CellViewConfig:
+    """固定深度セル描画設定（Wizardry風）"""
+    depth: int = 4  # 前方に描画するマス数
+    side_cells: int = 1  # 左右に描画するマス数
+    near_clip: float = 0.1  # 手前側の側壁を切り取る距離
+
+
 @dataclass
 class PropRenderConfig:
     """プロップ描画設定"""
     visibility_range: int = 5
     stairs_base_size: int = 20
     treasure_base_size: int = 15
+    boss_base_size: int = 24
     min_size: int = 4
     size_divisor: float = 0.5
 
@@ -106,6 +116,7 @@ class ColorConfig:
     stairs_down: Tuple[int, int, int] = (150, 150, 200)
     treasure: Tuple[int, int, int] = (255, 215, 0)
     treasure_detail: Tuple[int, int, int] = (200, 180, 0)
+    boss: Tuple[int, int, int] = (180, 40, 40)
 
 
 @dataclass
@@ -117,13 +128,20 @@ class DirectionConfig:
     angle_west: float = math.pi
 
 
+# 3Dビューの描画モード
+RENDER_MODE_RAYCAST = "raycast"  # レイキャスティング
+RENDER_MODE_CELL = "cell"        # 固定深度セル描画
+
+
 @dataclass
 class RendererConfig:
     """レンダラー統合設定"""
+    render_mode: str = RENDER_MODE_RAYCAST
     screen: ScreenConfig = None
     camera: CameraConfig = None
     raycast: RaycastConfig = None
     wall_render: WallRenderConfig = None
+    cell_view: CellViewConfig = None
     prop_render: PropRenderConfig = None
     ui: UIConfig = None
     colors: ColorConfig = None
@@ -138,6 +156,8 @@ class RendererConfig:
             self.raycast = RaycastConfig()
         if self.wall_render is None:
             self.wall_render = WallRenderConfig()
+        if self.cell_view is None:
+            self.cell_view = CellViewConfig()
         if self.prop_render is None:
             self.prop_render = PropRenderConfig()
         if self.ui is None:
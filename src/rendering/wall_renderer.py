@@ -1,7 +1,7 @@
 """壁描画レンダラー"""
 
 import pygame
-from typing import Tuple
+from typing import Optional, Tuple
 from enum import Enum
 
 from src.rendering.renderer_config import WallRenderConfig, ColorConfig
@@ -24,41 +24,76 @@ class WallRenderer:
         self.color_config = color_config or ColorConfig()
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
+        
+        # 表示解像度に対する描画先の倍率（内部解像度描画時は1未満）
+        self.pixel_scale = 1.0
+        
+        # 床・天井背景のキャッシュ（描画先のサイズが変わった時のみ再生成）
+        self._backdrop_surface: Optional[pygame.Surface] = None
+        self._backdrop_key: Optional[Tuple[int, int]] = None
+    
+    def set_target(self, surface: pygame.Surface, pixel_scale: float = 1.0):
+        """描画先サーフェスと表示解像度に対する倍率を設定"""
+        self.screen = surface
+        self.screen_width, self.screen_height = surface.get_size()
+        self.pixel_scale = pixel_scale
     
     def render_wall_column(self, ray_index: int, distance: float, wall_type: str = WallType.FACE.value, ray_count: int = None):
         """壁の縦線を描画"""
         # 広角補正のための距離調整
         corrected_distance = self._apply_fisheye_correction(distance, ray_index, ray_count) if ray_count else distance
         
-        wall_height = self._calculate_wall_height(corrected_distance)
-        wall_top = self._calculate_wall_position(wall_height)
-        wall_color = self._calculate_wall_color(corrected_distance, wall_type)
+        wall_height = self.calculate_wall_height(corrected_distance)
+        wall_top = self.calculate_wall_position(wall_height)
+        wall_color = self.calculate_wall_color(corrected_distance, wall_type)
         
         x = ray_index * self.wall_config.render_width
         wall_rect = pygame.Rect(x, wall_top, self.wall_config.render_width, wall_height)
         pygame.draw.rect(self.screen, wall_color, wall_rect)
     
     def render_floor_and_ceiling(self):
-        """床と天井を描画"""
+        """床と天井を描画（キャッシュ済み背景を1回のblitで転送）"""
+        self.screen.blit(self.get_backdrop_surface(), (0, 0))
+    
+    def get_backdrop_surface(self) -> pygame.Surface:
+        """床・天井背景を取得（描画先のサイズ変更時のみ再生成）"""
+        size = self.screen.get_size()
+        if self._backdrop_surface is None or self._backdrop_key != size:
+            self.screen_width, self.screen_height = size
+            self._backdrop_surface = self._build_backdrop_surface()
+            self._backdrop_key = size
+        return self._backdrop_surface
+    
+    def invalidate_backdrop(self):
+        """背景キャッシュを破棄"""
+        self._backdrop_surface = None
+        self._backdrop_key = None
+    
+    def _build_backdrop_surface(self) -> pygame.Surface:
+        """床と天井の背景サーフェスを生成"""
+        surface = pygame.Surface((self.screen_width, self.screen_height))
+        if pygame.display.get_surface() is not None:
+            # 画面と同じピクセル形式にしてblitを高速化
+            surface = surface.convert()
+        
         # 設定から天井比率を取得
         ceiling_height = int(self.screen_height * self.wall_config.ceiling_ratio)
         floor_height = self.screen_height - ceiling_height
         
         # 床（下部）
-        floor_rect = pygame.Rect(0, ceiling_height, self.screen_width, floor_height)
-        pygame.draw.rect(self.screen, self.color_config.floor, floor_rect)
+        surface.fill(self.color_config.floor, pygame.Rect(0, ceiling_height, self.screen_width, floor_height))
         
         # 天井（上部）
-        ceiling_rect = pygame.Rect(0, 0, self.screen_width, ceiling_height)
-        pygame.draw.rect(self.screen, self.color_config.ceiling, ceiling_rect)
+        surface.fill(self.color_config.ceiling, pygame.Rect(0, 0, self.screen_width, ceiling_height))
+        return surface
     
-    def _calculate_wall_height(self, distance: float) -> int:
+    def calculate_wall_height(self, distance: float) -> int:
         """距離に基づいて壁の高さを計算"""
-        wall_height = int(self.wall_config.height * self.wall_config.distance_scale / 
+        wall_height = int(self.wall_config.height * self.wall_config.distance_scale * self.pixel_scale /
                          max(distance, self.wall_config.min_distance))
         return min(wall_height, self.screen_height)
     
-    def _calculate_wall_position(self, wall_height: int) -> int:
+    def calculate_wall_position(self, wall_height: int) -> int:
         """壁の描画位置（上端）を計算"""
         # 設定から天井比率と壁位置比率を取得
         ceiling_height = int(self.screen_height * self.wall_config.ceiling_ratio)
@@ -68,7 +103,7 @@ class WallRenderer:
         wall_center = ceiling_height + int(available_height * self.wall_config.wall_position_ratio)
         return wall_center - (wall_height // 2)
     
-    def _calculate_wall_color(self, distance: float, wall_type: str = WallType.FACE.value) -> Tuple[int, int, int]:
+    def calculate_wall_color(self, distance: float, wall_type: str = WallType.FACE.value) -> Tuple[int, int, int]:
         """距離と壁タイプに基づいて壁の色を計算"""
         brightness = self._calculate_brightness(distance)
         base_color = self._get_base_color_for_wall_type(wall_type)
@@ -67,7 +67,7 @@ class SmallMapUI(UIElement):
         
         # マップスケール計算
         self._calculate_map_scale()
-        
+    
     
     def _calculate_map_scale(self):
         """マップのスケールを計算（固定サイズの周辺マップ用）"""
@@ -109,19 +109,14 @@ class SmallMapUI(UIElement):
         player_y = self.dungeon_state.player_position.y
         half_range = MAP_VIEW_RANGE // 2
         
+        # 現在位置から見えるセル（壁の向こうは表示しない）
+        in_sight = level_data.get_visible_positions(player_x, player_y, half_range)
+        
         for x in range(player_x - half_range, player_x + half_range + 1):
             for y in range(player_y - half_range, player_y + half_range + 1):
                 cell = level_data.cells.get((x, y))
-                if cell:
-                    # 全てのセルを表示（デバッグ用）または探索システムが実装されていない場合
-                    # 実装では探索済みまたは訪問済みのセルのみを表示するべき
-                    if hasattr(cell, 'discovered') and cell.discovered:
-                        visible_cells.append(cell)
-                    elif hasattr(cell, 'visited') and cell.visited:
-                        visible_cells.append(cell)
-                    else:
-                        # 探索システムが未実装の場合は、プレイヤー周辺のセルを表示
-                        visible_cells.append(cell)
+                if cell and (cell.discovered or cell.visited or (x, y) in in_sight):
+                    visible_cells.append(cell)
         
         return visible_cells
     
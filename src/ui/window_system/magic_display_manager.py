@@ -9,7 +9,7 @@ from enum import Enum
 
 from src.character.party import Party
 from src.character.character import Character
-from src.magic.spells import SpellBook, Spell, SpellSchool, SpellType
+from src.magic.spells import SpellBook, Spell, SpellSchool, SpellType, spell_manager
 from src.utils.logger import logger
 
 
@@ -108,20 +108,21 @@ class MagicDisplayManager:
         if not spellbook:
             return []
         
-        # 魔法管理システムから習得済み魔法を取得
-        # 実際の実装では spell_manager を使用
+        # 魔法管理システムから習得済み魔法を取得（定義のない魔法は表示しない）
         learned_spells = getattr(spellbook, 'learned_spells', [])
         formatted_spells = []
         
-        # モック用の簡易実装
         for spell_id in learned_spells:
-            # 実際の実装では spell_manager.get_spell(spell_id) を使用
+            spell = spell_manager.get_spell(spell_id)
+            if not spell:
+                continue
+            name = spell.get_name()
             formatted_spells.append({
                 'spell_id': spell_id,
-                'name': f"魔法{spell_id}",
-                'level': 1,
-                'school': 'mage',
-                'display_text': f"魔法{spell_id} (Lv.1 魔術)"
+                'name': name,
+                'level': spell.level,
+                'school': spell.school.value,
+                'display_text': f"{name} (Lv.{spell.level} {self.get_school_name(spell.school)})"
             })
         
         return formatted_spells
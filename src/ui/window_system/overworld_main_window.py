@@ -671,6 +671,12 @@ class OverworldMainWindow(Window):
         else:
             logger.debug(f"OverworldMainWindow: CharacterStatusBar描画スキップ (bar={bool(self.character_status_bar)}, state={self.state})")
     
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        """独自描画しているCharacterStatusBarの領域を返す（HP等は毎フレーム変わりうる）"""
+        if self.character_status_bar and self.state == WindowState.SHOWN:
+            return [self.character_status_bar.rect]
+        return []
+    
     def update(self, time_delta: float) -> None:
         """ウィンドウの更新"""
         # 親クラスの更新処理
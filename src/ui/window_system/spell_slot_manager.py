@@ -8,7 +8,7 @@ from typing import Dict, List, Optional, Any, Callable, Tuple
 from enum import Enum
 
 from src.character.character import Character
-from src.magic.spells import SpellBook, Spell
+from src.magic.spells import SpellBook, Spell, spell_manager
 from src.utils.logger import logger
 
 
@@ -290,20 +290,17 @@ class SpellSlotManager:
         if not spellbook:
             return []
         
-        # 習得済み魔法から装備可能なものを抽出
-        # 実際の実装では spell_manager と連携
+        # 習得順に魔法管理システムから定義を引き、スロットレベル以下のものを抽出（定義のない魔法は除外）
         learned_spells = getattr(spellbook, 'learned_spells', [])
         available_spells = []
         
         for spell_id in learned_spells:
-            # 魔法レベルチェック（模擬）
-            spell_level = 1  # 実際の実装では spell_manager.get_spell(spell_id).level
-            
-            if spell_level <= level:
+            spell = spell_manager.get_spell(spell_id)
+            if spell and spell.level <= level:
                 available_spells.append({
                     'spell_id': spell_id,
-                    'name': f"魔法{spell_id}",
-                    'level': spell_level,
+                    'name': spell.get_name(),
+                    'level': spell.level,
                     'can_equip': True
                 })
         
@@ -196,6 +196,18 @@ class Window(ABC):
         # UIManagerの描画はWindowManager.draw()で一括して行われる
         pass
     
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        """
+        draw()で独自に描画し、今フレームで変化した可能性のある領域を取得
+        
+        pygame_gui要素の変化はWindowManagerが検出するため、
+        独自描画を行うウィンドウのみオーバーライドする。
+        
+        Returns:
+            List[pygame.Rect]: 再転送が必要な領域
+        """
+        return []
+    
     def handle_escape(self) -> bool:
         """
         ESCキーの処理
@@ -4,7 +4,7 @@ WindowManager クラス
 Window Systemの中核となる管理クラス
 """
 
-from typing import Dict, Optional, List, Type, Any
+from typing import Dict, Optional, List, Tuple, Type, Any
 import pygame
 import pygame_gui
 from datetime import datetime
@@ -18,6 +18,9 @@ from .statistics_manager import StatisticsManager
 from .window_pool import get_window_pool
 from src.ui.font_manager_pygame import font_manager
 
+# 差分描画でこれを超える数の矩形が溜まった場合は全画面更新にまとめる
+MAX_DIRTY_RECTS = 32
+
 
 class WindowManager:
     """
@@ -47,6 +50,7 @@ class WindowManager:
         self._initialize_system_state()
         self._initialize_statistics()
         self._initialize_event_handling()
+        self._initialize_presentation_state()
         
         self._initialized = True
         logger.debug("WindowManagerを初期化しました")
@@ -78,6 +82,14 @@ class WindowManager:
         """イベントハンドリングを初期化"""
         self.escape_handlers: List[callable] = []
     
+    def _initialize_presentation_state(self):
+        """差分描画（ダーティ矩形）の状態を初期化"""
+        self._dirty_rects: List[pygame.Rect] = []
+        self._full_redraw_requested = True
+        self._last_drawn_window_id: Optional[str] = None
+        # pygame_guiスプライトごとの (画像ID, 矩形) の前フレームのスナップショット
+        self._ui_sprite_snapshot: Dict[int, Tuple[int, Tuple[int, int, int, int]]] = {}
+    
     @classmethod
     def get_instance(cls) -> 'WindowManager':
         """シングルトンインスタンスを取得"""
@@ -235,6 +247,7 @@ class WindowManager:
         
         # ウィンドウを表示
         window.show()
+        self.request_full_redraw()
         
         # スタックに追加
         if push_to_stack:
@@ -260,6 +273,7 @@ class WindowManager:
         
         # ウィンドウの状態を非表示に変更
         window.hide()
+        self.request_full_redraw()
         
         # スタックから削除
         if remove_from_stack:
@@ -293,6 +307,7 @@ class WindowManager:
         
         # ウィンドウのUI要素を破棄
         window.destroy()
+        self.request_full_redraw()
         
         # レジストリから削除
         if window.window_id in self.window_registry:
@@ -335,6 +350,7 @@ class WindowManager:
         
         # ウィンドウのUI要素を完全に破棄
         window.destroy()
+        self.request_full_redraw()
         
         # レジストリから削除
         if window.window_id in self.window_registry:
@@ -597,9 +613,17 @@ class WindowManager:
         # 最上位ウィンドウのみを描画する
         top_window = self.get_active_window()
         
+        # 最上位ウィンドウが切り替わった場合は全画面更新
+        top_window_id = top_window.window_id if top_window else None
+        if top_window_id != self._last_drawn_window_id:
+            self.request_full_redraw()
+            self._last_drawn_window_id = top_window_id
+        
         if top_window and top_window.state == WindowState.SHOWN:
             # 最上位ウィンドウのみ描画
             top_window.draw(surface)
+            for rect in top_window.get_dirty_rects():
+                self.mark_dirty(rect)
             logger.debug(f"最上位ウィンドウを描画: {top_window.window_id}")
         else:
             # ウィンドウがない場合は背景をクリア
@@ -609,11 +633,88 @@ class WindowManager:
         # UIManagerの描画（最上位ウィンドウのUI要素）
         if self.ui_manager:
             self.ui_manager.draw_ui(surface)
+            self._collect_ui_dirty_rects()
         else:
             logger.warning("WindowManager.draw(): UIManagerがありません")
         
         self.statistics_manager.increment_counter('frames_rendered')
     
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        """
+        次回の画面更新で転送する領域を追加
+        
+        Args:
+            rect: 変更された領域
+        """
+        if self._full_redraw_requested:
+            return
+        if len(self._dirty_rects) >= MAX_DIRTY_RECTS:
+            self.request_full_redraw()
+            return
+        self._dirty_rects.append(pygame.Rect(rect))
+    
+    def request_full_redraw(self) -> None:
+        """次回の画面更新を全画面（flip）にする"""
+        self._full_redraw_requested = True
+        self._dirty_rects.clear()
+    
+    def _collect_ui_dirty_rects(self) -> None:
+        """pygame_guiスプライトの画像・位置の変化からダーティ矩形を収集"""
+        snapshot = {}
+        for blit_data in self.ui_manager.get_sprite_group().visible:
+            # 実際に転送される領域（位置 + 画像サイズ）。空の画像は描画されない
+            image, position = blit_data[0], blit_data[1]
+            width, height = image.get_size()
+            if width == 0 or height == 0:
+                continue
+            rect = (int(position[0]), int(position[1]), width, height)
+            entry = (id(image), rect)
+            key = id(blit_data)
+            snapshot[key] = entry
+            
+            previous = self._ui_sprite_snapshot.get(key)
+            if previous != entry:
+                self.mark_dirty(rect)
+                if previous:
+                    self.mark_dirty(previous[1])
+        
+        # 消えたスプライトの領域
+        for key, previous in self._ui_sprite_snapshot.items():
+            if key not in snapshot:
+                self.mark_dirty(previous[1])
+        
+        self._ui_sprite_snapshot = snapshot
+    
+    def consume_dirty_rects(self) -> Optional[List[pygame.Rect]]:
+        """
+        溜まったダーティ矩形を取り出して状態をリセット
+        
+        Returns:
+            Optional[List[pygame.Rect]]: 転送すべき矩形。全画面更新が必要な場合はNone
+        """
+        if self._full_redraw_requested:
+            rects = None
+        else:
+            rects = self._dirty_rects
+        self._dirty_rects = []
+        self._full_redraw_requested = False
+        return rects
+    
+    def present(self) -> None:
+        """
+        描画結果を画面に転送
+        
+        変更領域のみを pygame.display.update(rects) で転送し、
+        ウィンドウ遷移などで全画面更新が必要な場合は flip にフォールバックする。
+        """
+        rects = self.consume_dirty_rects()
+        if rects is None:
+            pygame.display.flip()
+            self.statistics_manager.increment_counter('full_presents')
+        elif rects:
+            pygame.display.update(rects)
+            self.statistics_manager.increment_counter('partial_presents')
+    
     def add_escape_handler(self, handler: callable) -> None:
         """
         ESCキーハンドラーを追加
@@ -746,6 +847,9 @@ class WindowManager:
         # 統計情報をリセット
         self.statistics_manager.reset_all()
         
+        # 差分描画の状態をリセット
+        self._initialize_presentation_state()
+        
         self.running = False
         logger.info("WindowManagerをクリーンアップしました")
     
@@ -777,6 +881,10 @@ class WindowManager:
         handled = False
         
         for event in events:
+            # 画面サイズ変更・露出時は全画面を転送し直す
+            if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWSIZECHANGED):
+                self.request_full_redraw()
+            
             # アクティブなウィンドウがある場合は、そのウィンドウに優先的にイベントを送る
             active_window = self.get_active_window()
             if active_window:
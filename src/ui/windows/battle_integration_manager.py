@@ -9,7 +9,7 @@ from dataclasses import dataclass
 
 from src.ui.window_system import WindowManager
 from src.ui.window_system.battle_ui_window import BattleUIWindow
-from src.combat.combat_manager import CombatManager, CombatState
+from src.combat.combat_manager import CombatManager, CombatState, get_configured_combat_log_path
 from src.character.party import Party
 from src.monsters.monster import Monster
 from src.utils.logger import logger
@@ -54,7 +54,7 @@ class BattleIntegrationManager:
             self.battle_context = battle_context
             
             # CombatManagerを作成・設定
-            self.current_combat_manager = CombatManager()
+            self.current_combat_manager = CombatManager(combat_log_path=get_configured_combat_log_path())
             self.current_combat_manager.party = party
             self.current_combat_manager.monsters = enemies
             
@@ -126,7 +126,9 @@ class BattleIntegrationManager:
             if self.battle_context and self.battle_context.return_callback:
                 self.battle_context.return_callback(victory, battle_result)
             
-            # リソースクリーンアップ
+            # リソースクリーンアップ（リングに残った戦闘ログを書き出してファイルを閉じる）
+            if self.current_combat_manager:
+                self.current_combat_manager.close_combat_log()
             self.current_battle_window = None
             self.current_combat_manager = None
             self.battle_context = None
@@ -261,6 +263,8 @@ class BattleIntegrationManager:
         try:
             if self.current_battle_window:
                 self.current_battle_window.cleanup()
+            if self.current_combat_manager:
+                self.current_combat_manager.close_combat_log()
             
             self.current_battle_window = None
             self.current_combat_manager = None
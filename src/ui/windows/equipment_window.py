@@ -434,7 +434,7 @@ class EquipmentWindow(Window):
                 self.refresh_view()
             else:
                 # インベントリに空きがない場合、装備を戻す
-                self.current_equipment.equipped_items[slot] = item_instance
+                self.current_equipment.equip_item(item_instance, slot, self.current_character.character_class)
                 self.show_message("インベントリに空きがありません")
 
     def show_equipment_bonus(self) -> None:
@@ -13,6 +13,9 @@ from .helpers import (
     safe_get_dict_value, ensure_directory_exists, backup_file,
     validate_range, create_lookup_function, batch_process, retry_operation
 )
+from .dice import DiceExpression, compile_dice
+from .alias_table import AliasTable
+from .union_find import UnionFind
 
 # デフォルトエクスポート
 __all__ = [
@@ -35,7 +38,16 @@ __all__ = [
     "interpolate", "distance_2d", "safe_divide", "round_to_precision",
     "format_number_with_commas", "join_with_separator", "truncate_string",
     "safe_get_dict_value", "ensure_directory_exists", "backup_file",
-    "validate_range", "create_lookup_function", "batch_process", "retry_operation"
+    "validate_range", "create_lookup_function", "batch_process", "retry_operation",
+    
+    # ダイス式
+    "DiceExpression", "compile_dice",
+    
+    # 重み付き抽選
+    "AliasTable",
+    
+    # 素集合
+    "UnionFind"
 ]
 
 # モジュール情報
@@ -0,0 +1,68 @@
+"""エイリアステーブル（Walker/Vose法）
+
+重み付きの候補から O(1) で抽選するための前計算テーブル。
+構築は O(n)、抽選は乱数2回と配列参照のみで候補数に依存しない。
+"""
+
+from typing import Generic, List, Optional, Sequence, Tuple, TypeVar
+import random
+
+T = TypeVar('T')
+
+
+class AliasTable(Generic[T]):
+    """重み付き抽選用のエイリアステーブル"""
+    
+    __slots__ = ('items', 'weights', '_probabilities', '_aliases')
+    
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        if len(items) != len(weights):
+            raise ValueError("候補と重みの数が一致しません")
+        if not items:
+            raise ValueError("候補が空です")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("重みに負の値が含まれています")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("重みの合計が0です")
+        
+        self.items: Tuple[T, ...] = tuple(items)
+        self.weights: Tuple[float, ...] = tuple(weights)
+        
+        count = len(self.items)
+        scaled = [weight * count / total for weight in weights]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        
+        # 残りは丸め誤差のみなので確率1とする
+        self._probabilities: List[float] = probabilities
+        self._aliases: List[int] = aliases
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def sample(self, rng: Optional[random.Random] = None) -> T:
+        """重みに従って1件抽選"""
+        rng = rng or random
+        index = int(rng.random() * len(self.items))
+        if rng.random() < self._probabilities[index]:
+            return self.items[index]
+        return self.items[self._aliases[index]]
+    
+    def probability(self, item: T) -> float:
+        """候補が選ばれる確率（重みの比率）"""
+        total = sum(self.weights)
+        return sum(weight for candidate, weight in zip(self.items, self.weights) if candidate == item) / total
@@ -0,0 +1,86 @@
+"""ダイス式
+
+"2d6+3" のようなダイス式を一度だけ解析して不変オブジェクトにする。
+同じ式は共有キャッシュから同一のオブジェクトが返るため、攻撃のたびに文字列を解析しない。
+最小値・最大値・期待値は解析的に求められるので、サンプリングせずにバランス調整に使える。
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+import random
+import re
+
+# ダイス式の書式（"2d6+3", "d8", "1d4-1", 定数のみの "5"）
+DICE_PATTERN = re.compile(r'(\d*)d(\d+)([+-]\d+)?')
+CONSTANT_PATTERN = re.compile(r'[+-]?\d+')
+DEFAULT_DICE_COUNT = 1
+
+
+@dataclass(frozen=True)
+class DiceExpression:
+    """解析済みのダイス式（count 個の sides 面ダイスの合計 + modifier）"""
+    count: int
+    sides: int
+    modifier: int = 0
+    
+    def roll(self, rng: Optional[random.Random] = None) -> int:
+        """ダイスを振る（rng 未指定時は random モジュールを使用）"""
+        randint = (rng or random).randint
+        sides = self.sides
+        total = self.modifier
+        for _ in range(self.count):
+            total += randint(1, sides)
+        return total
+    
+    @property
+    def min(self) -> int:
+        """最小値"""
+        return self.count + self.modifier
+    
+    @property
+    def max(self) -> int:
+        """最大値"""
+        return self.count * self.sides + self.modifier
+    
+    @property
+    def mean(self) -> float:
+        """期待値"""
+        return self.count * (self.sides + 1) / 2 + self.modifier
+    
+    def __str__(self) -> str:
+        """正規化したダイス式"""
+        if not self.count:
+            return str(self.modifier)
+        modifier = f"{self.modifier:+d}" if self.modifier else ""
+        return f"{self.count}d{self.sides}{modifier}"
+
+
+@lru_cache(maxsize=None)
+def _intern_dice(count: int, sides: int, modifier: int) -> DiceExpression:
+    """表記違いの同じ式（"d6" と "1D6" など）で同一オブジェクトを共有する"""
+    return DiceExpression(count, sides, modifier)
+
+
+@lru_cache(maxsize=None)
+def compile_dice(expression: str) -> DiceExpression:
+    """ダイス式を解析（同じ式は同一オブジェクトを返す）
+    
+    Raises:
+        ValueError: 書式が不正な場合
+    """
+    text = expression.replace(" ", "").lower()
+    
+    match = DICE_PATTERN.fullmatch(text)
+    if match:
+        count = int(match.group(1)) if match.group(1) else DEFAULT_DICE_COUNT
+        sides = int(match.group(2))
+        modifier = int(match.group(3)) if match.group(3) else 0
+        if sides <= 0:
+            raise ValueError(f"ダイスの面数が不正です: {expression}")
+        return _intern_dice(count, sides, modifier)
+    
+    if CONSTANT_PATTERN.fullmatch(text):
+        return _intern_dice(0, 1, int(text))
+    
+    raise ValueError(f"不正なダイス式: {expression}")
@@ -0,0 +1,61 @@
+"""素集合データ構造（Union-Find）
+
+要素の連結成分を管理する。経路半減とサイズによる併合で、
+操作はほぼ定数時間（アッカーマン関数の逆関数）になる。
+"""
+
+from typing import Dict, Generic, Hashable, Iterable, TypeVar
+
+T = TypeVar('T', bound=Hashable)
+
+
+class UnionFind(Generic[T]):
+    """素集合データ構造（未登録の要素は参照時に単独の集合として追加する）"""
+    
+    __slots__ = ('_parents', '_sizes')
+    
+    def __init__(self, items: Iterable[T] = ()):
+        self._parents: Dict[T, T] = {}
+        self._sizes: Dict[T, int] = {}
+        for item in items:
+            self.add(item)
+    
+    def __len__(self) -> int:
+        return len(self._parents)
+    
+    def __contains__(self, item: T) -> bool:
+        return item in self._parents
+    
+    def add(self, item: T):
+        """要素を単独の集合として追加（登録済みなら何もしない）"""
+        if item not in self._parents:
+            self._parents[item] = item
+            self._sizes[item] = 1
+    
+    def find(self, item: T) -> T:
+        """要素が属する集合の代表元"""
+        self.add(item)
+        parents = self._parents
+        while parents[item] != item:
+            parents[item] = parents[parents[item]]
+            item = parents[item]
+        return item
+    
+    def union(self, item1: T, item2: T) -> bool:
+        """2つの要素の集合を併合（既に同じ集合ならFalse）"""
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return False
+        if self._sizes[root1] < self._sizes[root2]:
+            root1, root2 = root2, root1
+        self._parents[root2] = root1
+        self._sizes[root1] += self._sizes[root2]
+        return True
+    
+    def connected(self, item1: T, item2: T) -> bool:
+        """2つの要素が同じ集合に属するか"""
+        return self.find(item1) == self.find(item2)
+    
+    def size(self, item: T) -> int:
+        """要素が属する集合の要素数"""
+        return self._sizes[self.find(item)]
@@ -0,0 +1,252 @@
+"""戦闘管理システムのテスト"""
+
+import random
+
+import pytest
+
+import src.dungeon  # モンスターとダンジョンの循環importを避けるため先に読み込む
+from src.combat.combat_manager import (
+    CombatManager, CombatAction, CombatResult, CombatState, CombatLogRecord, read_combat_log,
+    get_configured_combat_log_path, COMBAT_LOG_DIR
+)
+from src.core.config_manager import config_manager
+from src.character.character import Character, CharacterStatus
+from src.character.party import Party
+from src.character.stats import BaseStats
+from src.monsters.monster import Monster, MonsterType, MonsterSize, MonsterStats
+
+
+def create_character(name: str, agility: int) -> Character:
+    """テスト用キャラクター作成"""
+    stats = BaseStats(strength=15, agility=agility, intelligence=12, faith=12, luck=10)
+    return Character.create_character(name, "human", "fighter", stats)
+
+
+def create_monster(name: str, agility: int, hit_points: int = 12) -> Monster:
+    """テスト用モンスター作成"""
+    stats = MonsterStats(level=1, hit_points=hit_points, agility=agility)
+    return Monster(
+        monster_id=name, name=name, description="",
+        monster_type=MonsterType.BEAST, size=MonsterSize.MEDIUM, stats=stats
+    )
+
+
+def sort_based_turn_order(manager: CombatManager):
+    """生存者を毎回集めて敏捷性で並べ直す従来の行動順"""
+    order = list(manager.party.get_living_characters())
+    order.extend(m for m in manager.monsters if m.is_alive)
+    order.sort(key=manager._get_agility, reverse=True)
+    return order
+
+
+def sort_based_combat_end(manager: CombatManager) -> CombatResult:
+    """生存者リストから求める従来の戦闘終了判定"""
+    if not manager.party.get_living_characters():
+        return CombatResult.DEFEAT
+    if not [m for m in manager.monsters if m.is_alive]:
+        return CombatResult.VICTORY
+    return CombatResult.CONTINUE
+
+
+class TestCombatTurnOrder:
+    """行動順と生存数の差分管理のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.manager = CombatManager()
+        self.party = Party(name="TestParty")
+    
+    def _start(self, rng: random.Random):
+        for i in range(rng.randint(1, 6)):
+            self.party.add_character(create_character(f"Hero{i}", rng.randint(8, 12)))
+        monsters = [create_monster(f"Monster{i}", rng.randint(8, 12), rng.randint(20, 80))
+                    for i in range(rng.randint(1, 6))]
+        assert self.manager.start_combat(self.party, monsters)
+    
+    def test_initial_order_matches_sort(self):
+        """開始時の行動順が敏捷性順（同速は登録順）になるテスト"""
+        self._start(random.Random(1))
+        assert [id(a) for a in self.manager.turn_order] == [id(a) for a in sort_based_turn_order(self.manager)]
+    
+    @pytest.mark.parametrize("seed", range(20))
+    def test_incremental_order_matches_sort_based_order(self, seed):
+        """戦闘不能・蘇生・敏捷性変化・参加・離脱を繰り返しても従来の並べ直しと一致するテスト"""
+        rng = random.Random(seed)
+        random.seed(seed)
+        self._start(rng)
+        manager = self.manager
+        
+        for _ in range(300):
+            if manager.combat_state != CombatState.IN_PROGRESS:
+                break
+            
+            event = rng.random()
+            characters = list(self.party.characters.values())
+            if event < 0.1:
+                # 敏捷性を変える効果
+                actor = rng.choice(characters + manager.monsters)
+                if isinstance(actor, Character):
+                    actor.base_stats.agility = rng.randint(6, 14)
+                else:
+                    actor.stats.agility = rng.randint(6, 14)
+                manager.update_combatant(actor)
+            elif event < 0.15:
+                # 戦闘不能からの復帰
+                character = rng.choice(characters)
+                if not character.is_alive():
+                    character.status = CharacterStatus.GOOD
+                    character.derived_stats.current_hp = 1
+                    manager.update_combatant(character)
+            else:
+                actor = manager.get_current_actor()
+                targets = manager.get_valid_targets(actor, CombatAction.ATTACK)
+                target = rng.choice(targets) if targets else None
+                result = manager.execute_action(CombatAction.ATTACK, target)
+                assert result == sort_based_combat_end(manager)
+                if manager.current_turn_index == 0:
+                    # ラウンド開始時の行動順
+                    expected = sort_based_turn_order(manager)
+                    assert [id(a) for a in manager.turn_order] == [id(a) for a in expected]
+            
+            status = manager.get_combat_status()
+            assert status['party_members'] == len(self.party.get_living_characters())
+            assert status['monsters_alive'] == len([m for m in manager.monsters if m.is_alive])
+    
+    def test_dead_actor_leaves_next_round(self):
+        """戦闘不能になった参加者は次のラウンドから行動順に含まれないテスト"""
+        hero = create_character("Hero", 12)
+        self.party.add_character(hero)
+        slow = create_monster("Slow", 5)
+        fast = create_monster("Fast", 15)
+        assert self.manager.start_combat(self.party, [slow, fast])
+        assert self.manager.turn_order == [fast, hero, slow]
+        
+        fast.current_hp = 0
+        self.manager.update_combatant(fast)
+        # 現在のラウンドの行動順はそのまま
+        assert len(self.manager.turn_order) == 3
+        
+        for _ in range(3):
+            self.manager.execute_action(CombatAction.DEFEND)
+        assert self.manager.turn_order == [hero, slow]
+        assert self.manager.get_combat_status()['monsters_alive'] == 1
+    
+    
+    def test_damage_updates_counts_without_sweep(self, monkeypatch):
+        """ダメージを与えた時点で対象のみが行動順と生存数に反映されるテスト"""
+        self.party.add_character(create_character("Hero", 12))
+        monsters = [create_monster("A", 5, hit_points=1), create_monster("B", 6)]
+        assert self.manager.start_combat(self.party, monsters)
+        monkeypatch.setattr(self.manager, "_check_hit", lambda attacker, target: True)
+        
+        updated = []
+        original_update = self.manager.update_combatant
+        monkeypatch.setattr(self.manager, "update_combatant",
+                            lambda actor: (updated.append(actor), original_update(actor)))
+        assert self.manager.execute_action(CombatAction.ATTACK, monsters[0]) == CombatResult.CONTINUE
+        
+        assert updated == [monsters[0]]
+        assert self.manager.get_combat_status()['monsters_alive'] == 1
+        assert updated == [monsters[0]], "状況取得で全参加者を走査しています"
+        
+        # マネージャーを通さない変化は呼び出し側が通知する
+        monsters[1].current_hp = 0
+        self.manager.update_combatant(monsters[1])
+        assert self.manager.execute_action(CombatAction.DEFEND) == CombatResult.VICTORY
+
+class TestCombatLog:
+    """戦闘ログのテスト"""
+    
+    def _start(self, manager: CombatManager, monster_hp: int = 1000):
+        party = Party(name="TestParty")
+        party.add_character(create_character("Hero", 10))
+        assert manager.start_combat(party, [create_monster("Dummy", 5, monster_hp)])
+    
+    def test_log_is_bounded(self):
+        """戦闘ログが容量を超えて増えないテスト"""
+        manager = CombatManager(combat_log_capacity=8)
+        self._start(manager)
+        
+        for _ in range(50):
+            manager.execute_action(CombatAction.DEFEND)
+        
+        assert len(manager.combat_log) == 8
+        assert all(isinstance(record, CombatLogRecord) for record in manager.combat_log)
+        assert manager.combat_log[-1].turn_number == 25
+        assert manager.get_combat_status()['combat_log_size'] == 8
+    
+    def test_overflow_and_finished_battle_are_exported(self, tmp_path):
+        """溢れた記録と終了した戦闘の記録がファイルに順番通り書き出されるテスト"""
+        path = tmp_path / "combat.jsonl"
+        manager = CombatManager(combat_log_capacity=4, combat_log_path=path)
+        
+        for battle in range(2):
+            self._start(manager, monster_hp=1000 if battle == 0 else 1)
+            for _ in range(9):
+                manager.execute_action(CombatAction.DEFEND)
+            manager.monsters[0].current_hp = 0
+            manager.update_combatant(manager.monsters[0])
+            result = manager.execute_action(CombatAction.DEFEND)
+            assert result == CombatResult.VICTORY
+            manager.reset_combat()
+        manager.cleanup()
+        
+        records = list(read_combat_log(path))
+        assert len(records) == 20
+        first_id = records[0].battle_id
+        assert [r.battle_id for r in records] == [first_id] * 10 + [first_id + 1] * 10
+        assert [r.turn_number for r in records[:10]] == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+        assert records[0].actor == "Hero"
+        assert records[0].action == CombatAction.DEFEND.value
+        assert "身を守っている" in records[0].result
+    
+    def test_battles_from_separate_managers_are_distinguished(self, tmp_path):
+        """戦闘ごとに作ったマネージャーが同じファイルに書いても戦闘を区別でき、途中終了でも記録が残るテスト"""
+        path = tmp_path / "combat.jsonl"
+        for _ in range(2):
+            manager = CombatManager(combat_log_capacity=8, combat_log_path=path)
+            self._start(manager)
+            for _ in range(3):
+                manager.execute_action(CombatAction.DEFEND)
+            # 戦闘の決着前にウィンドウが閉じられた場合
+            manager.close_combat_log()
+            assert manager._combat_log_file is None
+        
+        records = list(read_combat_log(path))
+        assert len(records) == 6
+        battle_ids = [r.battle_id for r in records]
+        assert battle_ids[:3] == [battle_ids[0]] * 3 and battle_ids[3:] == [battle_ids[3]] * 3
+        assert battle_ids[0] != battle_ids[3]
+    
+    def test_no_export_without_path(self, tmp_path, monkeypatch):
+        """書き出し先未指定ならファイルを作らないテスト"""
+        monkeypatch.chdir(tmp_path)
+        manager = CombatManager(combat_log_capacity=2)
+        self._start(manager)
+        for _ in range(5):
+            manager.execute_action(CombatAction.DEFEND)
+        manager.cleanup()
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_log_path_follows_config_flag(self, monkeypatch):
+        """設定の debug.combat_log_file で書き出しを有効にでき、同じセッションでは同じファイルになるテスト"""
+        monkeypatch.setattr(config_manager, "load_config",
+                            lambda name: {"debug": {"combat_log_file": False}})
+        assert get_configured_combat_log_path() is None
+        
+        monkeypatch.setattr(config_manager, "load_config",
+                            lambda name: {"debug": {"combat_log_file": True}})
+        path = get_configured_combat_log_path()
+        assert path.parent == COMBAT_LOG_DIR and path.suffix == ".jsonl"
+        assert get_configured_combat_log_path() == path
+    
+    def test_dispatch_table_built_once(self):
+        """行動の実行関数テーブルが呼び出しごとに作り直されないテスト"""
+        manager = CombatManager()
+        executors = manager._action_executors
+        self._start(manager)
+        manager.execute_action(CombatAction.DEFEND)
+        
+        assert manager._action_executors is executors
+        assert set(executors) == set(CombatAction)
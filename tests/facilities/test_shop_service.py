@@ -8,7 +8,7 @@ from src.facilities.services.shop_service import ShopService
 from src.facilities.core.service_result import ServiceResult, ResultType
 from src.character.party import Party
 from src.character.character import Character
-from src.items.item import ItemInstance, Item, ItemManager
+from src.items.item import ItemInstance, Item, ItemManager, ItemRarity
 from src.inventory.inventory import Inventory, InventoryManager, InventorySlotType
 
 
@@ -94,9 +94,10 @@ class TestShopService(unittest.TestCase):
     def test_generate_shop_inventory(self, mock_inventory_manager):
         """商店在庫生成のテスト"""
         # アイテムマネージャーのモック設定
-        self.mock_item_manager.items = {
-            "test_item": self.mock_item
-        }
+        self.mock_item.item_id = "test_item"
+        self.mock_item_manager.get_items_by_rarity.side_effect = (
+            lambda rarity: (self.mock_item,) if rarity == ItemRarity.COMMON else ()
+        )
         
         self.shop_service._generate_shop_inventory()
         
@@ -0,0 +1,37 @@
+"""エイリアステーブルのテスト"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.alias_table import AliasTable
+
+
+class TestAliasTable:
+    """エイリアステーブルのテスト"""
+    
+    def test_sampled_frequencies_match_weights(self):
+        """抽選頻度が重みの比率と一致するテスト"""
+        weights = {"a": 1, "b": 2, "c": 3.5, "d": 0, "e": 10}
+        table = AliasTable(list(weights), list(weights.values()))
+        rng = random.Random(42)
+        samples = 100000
+        counts = Counter(table.sample(rng) for _ in range(samples))
+        
+        assert counts["d"] == 0
+        for item in weights:
+            assert counts[item] / samples == pytest.approx(table.probability(item), abs=0.01)
+    
+    def test_same_seed_same_result(self):
+        """同じシードなら同じ抽選結果になるテスト"""
+        table = AliasTable(["x", "y", "z"], [5, 3, 2])
+        first = [table.sample(random.Random(7)) for _ in range(3)]
+        assert first[0] == first[1] == first[2]
+        assert len(table) == 3
+    
+    @pytest.mark.parametrize("items, weights", [([], []), (["a"], [0]), (["a", "b"], [1]), (["a"], [-1])])
+    def test_invalid_input(self, items, weights):
+        """不正な入力はValueErrorになるテスト"""
+        with pytest.raises(ValueError):
+            AliasTable(items, weights)
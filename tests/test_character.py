@@ -279,4 +279,98 @@ class TestCharacterKnownSpells:
         fighter = Character.create_character(
             name="TestFighter", race="human", character_class="fighter", base_stats=self.test_stats
         )
-        assert len(fighter.known_spells) == 0
\ No newline at end of file
+        assert len(fighter.known_spells) == 0
+
+class TestCharacterCombatValueCache:
+    """実効能力値キャッシュのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.character = Character.create_character(
+            name="CacheHero", race="human", character_class="fighter",
+            base_stats=BaseStats(strength=16, agility=12, intelligence=10, faith=10, luck=11)
+        )
+    
+    def _uncached_values(self):
+        """キャッシュを経由しない計算結果"""
+        equipment = self.character.get_equipment() if self.character._equipment_initialized else None
+        status_effects = self.character.get_status_effects() if self.character._status_effects_initialized else None
+        return self.character._calculate_combat_values(equipment, status_effects)
+    
+    def _assert_matches_uncached(self):
+        """キャッシュ経由の値がキャッシュなしの計算と一致することを確認"""
+        expected_stats, expected_attack, expected_defense = self._uncached_values()
+        assert self.character.get_effective_stats() == expected_stats
+        assert self.character.get_attack_power() == expected_attack
+        assert self.character.get_defense() == expected_defense
+    
+    def test_cached_values_match_uncached_for_random_sequences(self):
+        """ランダムな装備・状態効果操作の後もキャッシュ値が一致することを確認"""
+        import random
+        from src.equipment.equipment import EquipmentSlot
+        from src.items.item import ItemInstance
+        from src.effects.status_effects import StatusEffectType, StrengthUpEffect, DefenseUpEffect, PoisonEffect
+        
+        rng = random.Random(1234)
+        equipment = self.character.get_equipment()
+        status_effects = self.character.get_status_effects()
+        weapons = ["dagger", "short_sword", "long_sword", "mace"]
+        armors = ["cloth_robe", "leather_armor", "chain_mail", "plate_armor"]
+        
+        for step in range(300):
+            action = rng.randrange(7)
+            if action == 0:
+                weapon = ItemInstance(item_id=rng.choice(weapons), quantity=1, identified=True)
+                equipment.equip_item(weapon, EquipmentSlot.WEAPON, self.character.character_class)
+            elif action == 1:
+                armor = ItemInstance(item_id=rng.choice(armors), quantity=1, identified=True)
+                equipment.equip_item(armor, EquipmentSlot.ARMOR, self.character.character_class)
+            elif action == 2:
+                equipment.unequip_item(rng.choice([EquipmentSlot.WEAPON, EquipmentSlot.ARMOR]))
+            elif action == 3:
+                effect_class = rng.choice([StrengthUpEffect, DefenseUpEffect, PoisonEffect])
+                effect = effect_class(duration=rng.randint(1, 6), strength=rng.randint(1, 5))
+                status_effects.add_effect(effect, self.character)
+            elif action == 4:
+                effect_type = rng.choice([StatusEffectType.STRENGTH_UP, StatusEffectType.DEFENSE_UP, StatusEffectType.POISON])
+                status_effects.remove_effect(effect_type, self.character)
+            elif action == 5:
+                status_effects.process_turn(self.character)
+                self.character.derived_stats.current_hp = self.character.derived_stats.max_hp
+            else:
+                self.character.base_stats.strength = rng.randint(3, 20)
+                self.character.base_stats.luck = rng.randint(3, 20)
+            
+            self._assert_matches_uncached()
+        
+        print(f"300ステップのランダム操作で一致を確認: 攻撃力={self.character.get_attack_power()}, 防御力={self.character.get_defense()}")
+    
+    def test_cache_reused_until_version_changes(self):
+        """バージョンが変わるまで再計算されないことを確認"""
+        from unittest.mock import patch
+        from src.equipment.equipment import EquipmentSlot
+        from src.items.item import ItemInstance
+        
+        equipment = self.character.get_equipment()
+        self.character.get_attack_power()
+        
+        with patch.object(self.character, '_calculate_combat_values', wraps=self.character._calculate_combat_values) as bonus_spy:
+            for _ in range(10):
+                self.character.get_attack_power()
+                self.character.get_defense()
+                self.character.get_effective_stats()
+            assert bonus_spy.call_count == 0
+            
+            equipment.equip_item(ItemInstance(item_id="long_sword", quantity=1, identified=True),
+                                 EquipmentSlot.WEAPON, self.character.character_class)
+            self.character.get_attack_power()
+            self.character.get_defense()
+            assert bonus_spy.call_count == 1
+    
+    def test_effective_stats_returns_independent_copy(self):
+        """返された実効能力値を変更してもキャッシュが壊れないことを確認"""
+        stats = self.character.get_effective_stats()
+        original_strength = stats.strength
+        stats.strength += 100
+        
+        assert self.character.get_effective_stats().strength == original_strength
@@ -0,0 +1,56 @@
+"""ダイス式のテスト"""
+
+import itertools
+import random
+
+import pytest
+
+from src.utils.dice import DiceExpression, compile_dice
+
+
+class TestDiceExpression:
+    """ダイス式のテスト"""
+    
+    def test_compile_formats(self):
+        """各書式の解析テスト"""
+        assert compile_dice("2d6+3") == DiceExpression(2, 6, 3)
+        assert compile_dice("d8") == DiceExpression(1, 8, 0)
+        assert compile_dice("1D4-1") == DiceExpression(1, 4, -1)
+        assert compile_dice(" 3 d 6 ") == DiceExpression(3, 6, 0)
+        assert compile_dice("5") == DiceExpression(0, 1, 5)
+    
+    @pytest.mark.parametrize("expression", ["", "abc", "2d", "2d0", "d6+", "1d6*2"])
+    def test_invalid_expression(self, expression):
+        """不正な書式はValueErrorになるテスト"""
+        with pytest.raises(ValueError):
+            compile_dice(expression)
+    
+    def test_equal_expressions_share_object(self):
+        """同じ式は表記違いでも同一オブジェクトを共有するテスト"""
+        assert compile_dice("2d6+3") is compile_dice("2d6+3")
+        assert compile_dice("d6") is compile_dice("1D6")
+        assert str(compile_dice("1D6")) == "1d6"
+        assert str(compile_dice("2d6-1")) == "2d6-1"
+    
+    @pytest.mark.parametrize("expression", ["1d6", "2d4+1", "3d3-2", "7"])
+    def test_analytic_values_match_enumeration(self, expression):
+        """最小値・最大値・期待値が全出目の列挙と一致するテスト"""
+        dice = compile_dice(expression)
+        outcomes = [sum(faces) + dice.modifier
+                    for faces in itertools.product(range(1, dice.sides + 1), repeat=dice.count)]
+        
+        assert dice.min == min(outcomes)
+        assert dice.max == max(outcomes)
+        assert dice.mean == pytest.approx(sum(outcomes) / len(outcomes))
+    
+    def test_roll_with_rng(self):
+        """乱数生成器を指定したロールが範囲内かつ再現可能なテスト"""
+        dice = compile_dice("3d6+2")
+        rolls = [dice.roll(random.Random(42)) for _ in range(3)]
+        assert rolls[0] == rolls[1] == rolls[2]
+        
+        rng = random.Random(7)
+        values = [dice.roll(rng) for _ in range(2000)]
+        assert min(values) >= dice.min
+        assert max(values) <= dice.max
+        assert sum(values) / len(values) == pytest.approx(dice.mean, abs=0.3)
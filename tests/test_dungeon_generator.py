@@ -0,0 +1,246 @@
+"""ダンジョンレベルの距離場・視界・特徴索引のテスト"""
+
+from collections import deque
+
+import pytest
+
+from src.dungeon.dungeon_generator import (
+    CellFeature, CellType, Direction, DungeonAttribute, DungeonCell, DungeonGenerator, DungeonLevel
+)
+
+
+def create_open_level(width: int, height: int) -> DungeonLevel:
+    """外周のみ壁のある開けた階層を作成"""
+    level = DungeonLevel(level=1, width=width, height=height, attribute=DungeonAttribute.PHYSICAL)
+    for x in range(width):
+        for y in range(height):
+            cell = DungeonCell(x=x, y=y, cell_type=CellType.FLOOR)
+            cell.walls[Direction.NORTH] = y == 0
+            cell.walls[Direction.SOUTH] = y == height - 1
+            cell.walls[Direction.WEST] = x == 0
+            cell.walls[Direction.EAST] = x == width - 1
+            level.set_cell(cell)
+    return level
+
+
+def naive_distance(level: DungeonLevel, start, target):
+    """隣接セルを順にたどる素朴な幅優先探索"""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        position = queue.popleft()
+        if position == target:
+            return distances[position]
+        for neighbor in level.get_passable_neighbors(*position):
+            if neighbor not in distances:
+                distances[neighbor] = distances[position] + 1
+                queue.append(neighbor)
+    return None
+
+
+class TestDistanceField:
+    """距離場のテスト"""
+    
+    def test_distance_matches_naive_search(self):
+        """生成した階層で距離場が素朴な探索と一致するテスト"""
+        level = DungeonGenerator("distance_test").generate_level(3)
+        target = level.stairs_down_position
+        distance_field = level.get_distance_field(target)
+        
+        for position in list(distance_field)[:40]:
+            assert distance_field[position] == naive_distance(level, position, target)
+        
+        path = level.get_path(level.stairs_up_position, target)
+        assert path[-1] == target
+        assert len(path) == distance_field[level.stairs_up_position]
+    
+    def test_cache_and_invalidation(self):
+        """距離場がキャッシュされ、構造の変更で破棄されるテスト"""
+        level = create_open_level(5, 1)
+        distance_field = level.get_distance_field((0, 0))
+        
+        assert level.get_distance_field((0, 0)) is distance_field
+        assert distance_field[(4, 0)] == 4
+        with pytest.raises(TypeError):
+            distance_field[(4, 0)] = 0
+        
+        level.set_cell(DungeonCell(x=2, y=0, cell_type=CellType.WALL))
+        assert level.get_distance_field((0, 0)) is not distance_field
+        assert level.get_distance((4, 0), (0, 0)) is None
+        assert level.get_path((4, 0), (0, 0)) is None
+    
+    def test_secret_passage(self):
+        """発見済みの隠し通路は壁があっても通れるテスト"""
+        level = create_open_level(3, 3)
+        level.cells[(0, 0)].walls[Direction.EAST] = True
+        level.cells[(1, 0)].walls[Direction.WEST] = True
+        level.cells[(0, 0)].walls[Direction.SOUTH] = True
+        level.cells[(0, 1)].walls[Direction.NORTH] = True
+        level.invalidate_layout()
+        
+        assert level.get_distance((0, 0), (2, 2)) is None
+        
+        level.add_secret_passage((1, 0), (0, 0))
+        assert level.can_move(0, 0, Direction.EAST)
+        assert level.get_distance((0, 0), (2, 2)) == 4
+        
+        restored = DungeonLevel.from_dict(level.to_dict())
+        assert restored.has_secret_passage((0, 0), (1, 0))
+    
+    def test_stairs_connectivity(self):
+        """階段間の連結判定のテスト"""
+        level = create_open_level(4, 1)
+        level.stairs_up_position = (0, 0)
+        level.stairs_down_position = (3, 0)
+        assert level.is_stairs_connected()
+        
+        level.cells[(1, 0)].walls[Direction.EAST] = True
+        level.invalidate_layout()
+        assert not level.is_stairs_connected()
+
+
+class TestFieldOfView:
+    """視界計算のテスト"""
+    
+    def test_open_room_is_fully_visible(self):
+        """開けた部屋では範囲内の全セルが見えるテスト"""
+        level = create_open_level(5, 5)
+        
+        visible = level.get_visible_positions(2, 2, 2)
+        
+        assert visible == {(x, y) for x in range(5) for y in range(5)}
+        assert level.get_visible_positions(2, 2, 2) is visible
+    
+    def test_walls_block_sight(self):
+        """壁の向こうのセルは見えないテスト"""
+        level = create_open_level(7, 5)
+        for y in range(5):
+            level.set_cell(DungeonCell(x=3, y=y, cell_type=CellType.WALL))
+        
+        visible = level.get_visible_positions(1, 2, 5)
+        
+        assert (3, 2) in visible
+        assert not any(x > 3 for x, _ in visible)
+        
+        # 壁に開口部を作ると向こう側が見える（構造の変更でキャッシュが破棄される）
+        level.set_cell(DungeonCell(x=3, y=2, cell_type=CellType.FLOOR))
+        assert (5, 2) in level.get_visible_positions(1, 2, 5)
+    
+    def test_facing_excludes_cells_behind(self):
+        """向きを指定すると背後のセルを除くテスト"""
+        level = create_open_level(5, 5)
+        
+        visible = level.get_visible_positions(2, 2, 2, Direction.NORTH)
+        
+        assert visible == {(x, y) for x in range(5) for y in range(3)}
+
+
+class TestFeatureIndex:
+    """特殊セルの索引のテスト"""
+    
+    def test_index_matches_scan(self):
+        """生成した階層の索引とバケット検索が全セルの走査と一致するテスト"""
+        level = DungeonGenerator("feature_test").generate_level(4)
+        treasures = {position for position, cell in level.cells.items() if cell.has_treasure}
+        
+        assert level.get_feature_positions(CellFeature.TREASURE) == treasures
+        assert level.get_feature_positions(CellFeature.STAIRS_DOWN) == {level.stairs_down_position}
+        
+        for x, y in [(0, 0), (level.width // 2, level.height // 2), (level.width - 1, 3)]:
+            for radius in (0, 3, 9):
+                expected = sorted((tx, ty) for tx, ty in treasures
+                                  if abs(tx - x) <= radius and abs(ty - y) <= radius)
+                assert level.find_features_in_range(CellFeature.TREASURE, x, y, radius) == expected
+            
+            nearest = min(treasures, key=lambda position: (abs(position[0] - x) + abs(position[1] - y), position))
+            assert level.find_nearest_feature(CellFeature.TREASURE, x, y) == nearest
+    
+    def test_incremental_update(self):
+        """宝箱の開封・トラップの解除・隠し通路の発見が索引に反映されるテスト"""
+        level = create_open_level(20, 20)
+        level.cells[(3, 3)].has_treasure = True
+        level.cells[(15, 15)].has_trap = True
+        level.rebuild_feature_index()
+        
+        assert level.find_nearest_feature(CellFeature.TREASURE, 18, 18) == (3, 3)
+        
+        level.cells[(3, 3)].has_treasure = False
+        level.update_cell_features(3, 3)
+        level.cells[(15, 15)].has_trap = False
+        level.update_cell_features(15, 15)
+        assert level.find_nearest_feature(CellFeature.TREASURE, 18, 18) is None
+        assert not level.get_feature_positions(CellFeature.TRAP)
+        
+        level.add_secret_passage((10, 10), (10, 11))
+        assert level.find_features_in_range(CellFeature.SECRET_PASSAGE, 9, 9, 2) == [(10, 10), (10, 11)]
+        assert level.get_special_locations([CellFeature.SECRET_PASSAGE]) == {
+            "secret_passage": [(10, 10), (10, 11)]
+        }
+
+
+def create_split_level() -> DungeonLevel:
+    """壁で隔てられた2つの部屋だけの階層を作成"""
+    level = DungeonLevel(level=1, width=10, height=6, attribute=DungeonAttribute.PHYSICAL)
+    for x in range(10):
+        for y in range(6):
+            cell_type = CellType.FLOOR if 1 <= y <= 4 and (x in (1, 2) or x in (6, 7, 8)) else CellType.WALL
+            level.set_cell(DungeonCell(x=x, y=y, cell_type=cell_type))
+    level.start_position = (1, 1)
+    level.cells[(8, 4)].cell_type = CellType.STAIRS_DOWN
+    level.stairs_down_position = (8, 4)
+    level.cells[(7, 2)].has_treasure = True
+    DungeonGenerator()._update_wall_info(level)
+    level.invalidate_layout()
+    return level
+
+
+class TestConnectivity:
+    """生成時の連結性検証のテスト"""
+    
+    def test_repair_carves_minimum_corridor(self):
+        """到達できない重要セルを最少の掘削でつなぐテスト"""
+        generator = DungeonGenerator("repair_test")
+        level = create_split_level()
+        
+        assert generator.find_unreachable_cells(level) == [(8, 4), (7, 2)]
+        assert not level.is_stairs_connected()
+        
+        # 2つの部屋の間の壁は3列
+        assert generator.repair_connectivity(level) == 3
+        assert generator.find_unreachable_cells(level) == []
+        assert level.is_stairs_connected()
+        assert level.get_distance((1, 1), (8, 4)) is not None
+    
+    def test_boss_cell_does_not_connect_regions(self):
+        """歩行できないボスのセルだけでつながる領域は到達不能として修復するテスト"""
+        generator = DungeonGenerator("boss_link_test")
+        level = create_split_level()
+        for x in (3, 4):
+            level.cells[(x, 2)].cell_type = CellType.FLOOR
+        level.cells[(5, 2)].cell_type = CellType.BOSS
+        level.boss_position = (5, 2)
+        generator._update_wall_info(level)
+        level.invalidate_layout()
+        
+        # ボスは手前の床から到達できるが、ボスの先の部屋へは行けない
+        assert generator.find_unreachable_cells(level) == [(8, 4), (7, 2)]
+        
+        # ボスを迂回して (4, 3) と (5, 3) を掘る
+        assert generator.repair_connectivity(level) == 2
+        assert generator.find_unreachable_cells(level) == []
+        assert level.get_distance((1, 1), (8, 4)) is not None
+    
+    def test_generated_levels_are_connected(self):
+        """複数シードの生成で全ての重要セルへ到達でき、集計が整合するテスト"""
+        generator = DungeonGenerator()
+        summary = generator.sweep_connectivity(["sweep_a", "sweep_b"], [1, 5, 20])
+        
+        assert summary['levels_generated'] == 6
+        assert summary['invalid'] == 0
+        assert 0.0 <= summary['repair_rate'] <= 1.0
+        assert summary['max_validation_time'] >= summary['mean_validation_time'] >= 0.0
+        
+        level = generator.generate_level(3)
+        report = generator.last_connectivity_report
+        assert report.level == 3 and report.valid
+        assert generator.find_unreachable_cells(level) == []
@@ -1,5 +1,8 @@
 """エンカウンター管理システムのテスト"""
 
+import random
+from collections import Counter
+
 import pytest
 from unittest.mock import Mock, patch
 
@@ -12,6 +15,7 @@ from src.dungeon.dungeon_generator import DungeonAttribute
 from src.character.party import Party
 from src.character.character import Character
 from src.character.stats import BaseStats
+from src.monsters.monster import MonsterManager
 
 
 class TestEncounterManager:
@@ -131,19 +135,82 @@ class TestEncounterManager:
         assert group.experience_modifier > 0
     
     def test_attribute_monster_variation(self):
-        """属性によるモンスター変化テスト"""
-        # 炎属性ダンジョンのモンスターテーブル
+        """属性によるモンスター出現重みの変化テスト"""
+        # スライムは炎が弱点、フレイムエレメンタルは炎に耐性
+        fire_weights = self.encounter_manager.get_encounter_weights(1, DungeonAttribute.FIRE)
+        physical_weights = self.encounter_manager.get_encounter_weights(1, DungeonAttribute.PHYSICAL)
+        assert set(fire_weights) == set(physical_weights) == {"rat", "slime", "bat_swarm"}
+        assert physical_weights["slime"] == 80
+        assert fire_weights["slime"] < physical_weights["slime"]
+        
+        fire_weights = self.encounter_manager.get_encounter_weights(10, DungeonAttribute.FIRE)
+        physical_weights = self.encounter_manager.get_encounter_weights(10, DungeonAttribute.PHYSICAL)
+        assert fire_weights["flame_elemental"] > physical_weights["flame_elemental"]
+        
+        # 出現候補は monsters.yaml の floors に従う
         fire_monsters = self.encounter_manager.encounter_tables[DungeonAttribute.FIRE][1]
-        # 物理属性ダンジョンのモンスターテーブル
-        physical_monsters = self.encounter_manager.encounter_tables[DungeonAttribute.PHYSICAL][1]
-        
-        # 炎属性には flame_ プレフィックスのモンスターが含まれる
-        flame_monsters = [m for m in fire_monsters if m.startswith("flame_")]
-        assert len(flame_monsters) > 0
-        
-        # 物理属性にはプレフィックスモンスターが含まれない
-        physical_prefixed = [m for m in physical_monsters if "_" in m and not m.startswith("dire_")]
-        assert len(physical_prefixed) == 0
+        assert sorted(fire_monsters) == ["bat_swarm", "rat", "slime"]
+    
+    def test_sampled_frequencies_match_weights(self):
+        """抽選頻度が設定された重みの比率と一致するテスト"""
+        rng = random.Random(123)
+        samples = 100000
+        
+        for level, attribute, rank in [(1, DungeonAttribute.PHYSICAL, None),
+                                       (5, DungeonAttribute.FIRE, MonsterRank.NORMAL),
+                                       (12, DungeonAttribute.DARK, None)]:
+            table = self.encounter_manager.get_encounter_table(level, attribute, rank)
+            weights = self.encounter_manager.get_encounter_weights(level, attribute, rank)
+            counts = Counter(table.sample(rng) for _ in range(samples))
+            
+            total_weight = sum(weights.values())
+            for monster_id, weight in weights.items():
+                expected = weight / total_weight
+                assert counts[monster_id] / samples == pytest.approx(expected, abs=0.01)
+    
+    def test_rank_tables_follow_level_difference(self):
+        """ランク別テーブルが階層とのレベル差で分かれるテスト"""
+        weights = {rank: self.encounter_manager.get_encounter_weights(5, DungeonAttribute.PHYSICAL, rank)
+                   for rank in (MonsterRank.WEAK, MonsterRank.NORMAL, MonsterRank.STRONG, MonsterRank.ELITE)}
+        
+        assert "goblin" in weights[MonsterRank.WEAK]          # レベル3
+        assert "hobgoblin" in weights[MonsterRank.NORMAL]     # レベル5
+        assert "lizardman" in weights[MonsterRank.STRONG]     # レベル6
+        assert "mimic" in weights[MonsterRank.ELITE]          # レベル8
+        
+        # 設定のない深い階層は最も近い設定済み階層のモンスターを使う
+        assert set(self.encounter_manager.get_encounter_weights(20, DungeonAttribute.PHYSICAL)) == \
+            set(self.encounter_manager.get_encounter_weights(15, DungeonAttribute.PHYSICAL))
+    
+    def test_tables_rebuilt_on_reload(self, tmp_path):
+        """monsters.yaml を書き換えて設定を再読み込みするとテーブルが構築し直されるテスト"""
+        import shutil
+        import yaml
+        from src.core.config_manager import ConfigManager
+        
+        shutil.copy("config/monsters.yaml", tmp_path / "monsters.yaml")
+        config = ConfigManager(str(tmp_path))
+        monsters = MonsterManager(config=config)
+        em = EncounterManager(monster_manager=monsters)
+        assert em.get_encounter_weights(1, DungeonAttribute.PHYSICAL)["rat"] == 100
+        
+        def write_rat_weight(weight):
+            with open(tmp_path / "monsters.yaml", 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f)
+            data["monsters"]["rat"]["encounter_weight"] = weight
+            with open(tmp_path / "monsters.yaml", 'w', encoding='utf-8') as f:
+                yaml.safe_dump(data, f, allow_unicode=True)
+        
+        # 全設定の再読み込みでファイルの変更が反映される
+        write_rat_weight(0)
+        config.reload_all()
+        assert "rat" not in em.get_encounter_weights(1, DungeonAttribute.PHYSICAL)
+        assert "rat" not in em.encounter_tables[DungeonAttribute.PHYSICAL][1]
+        
+        # モンスター定義だけの再読み込みでもファイルを読み直す
+        write_rat_weight(40)
+        monsters.reload_monsters()
+        assert em.get_encounter_weights(1, DungeonAttribute.PHYSICAL)["rat"] == 40
     
     def test_encounter_location_consistency(self):
         """エンカウンター位置の一貫性テスト"""
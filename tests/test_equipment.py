@@ -5,7 +5,7 @@ from src.equipment.equipment import (
     Equipment, EquipmentSlot, EquipmentBonus, EquipmentManager,
     equipment_manager
 )
-from src.items.item import ItemInstance, ItemManager, item_manager
+from src.items.item import ItemInstance, ItemManager, item_manager, BONUS_VECTOR_FIELDS
 from src.character.character import Character
 from src.character.stats import BaseStats
 
@@ -177,6 +177,74 @@ class TestEquipment:
         
         assert bonus.attack_power == expected_attack
     
+    def test_running_bonus_matches_full_recalculation(self):
+        """差分更新された総ボーナスが全スロット再集計と一致することを確認"""
+        import random
+        
+        def recalculate(equipment):
+            total = EquipmentBonus()
+            for item_instance in equipment.equipped_items.values():
+                if not item_instance:
+                    continue
+                item = item_manager.get_item(item_instance.item_id)
+                bonus = EquipmentBonus.from_dict(item.item_data.get('bonuses', {}))
+                if item.is_weapon():
+                    bonus.attack_power = item.get_attack_power()
+                elif item.is_armor():
+                    bonus.defense = item.get_defense()
+                bonus.attack_power = int(bonus.attack_power * item_instance.condition)
+                bonus.defense = int(bonus.defense * item_instance.condition)
+                bonus.magic_power = int(bonus.magic_power * item_instance.condition)
+                bonus.magic_resistance = int(bonus.magic_resistance * item_instance.condition)
+                total = total + bonus
+            return total
+        
+        rng = random.Random(42)
+        weapons = ["dagger", "short_sword", "long_sword", "mace"]
+        armors = ["cloth_robe", "leather_armor", "chain_mail", "plate_armor"]
+        
+        for _ in range(200):
+            roll = rng.random()
+            if roll < 0.4:
+                weapon = ItemInstance(item_id=rng.choice(weapons), condition=rng.choice([1.0, 0.75, 0.3]))
+                self.equipment.equip_item(weapon, EquipmentSlot.WEAPON, "fighter")
+            elif roll < 0.8:
+                armor = ItemInstance(item_id=rng.choice(armors), condition=rng.choice([1.0, 0.75, 0.3]))
+                self.equipment.equip_item(armor, EquipmentSlot.ARMOR, "fighter")
+            else:
+                self.equipment.unequip_item(rng.choice([EquipmentSlot.WEAPON, EquipmentSlot.ARMOR]))
+            
+            assert self.equipment.total_bonus == recalculate(self.equipment)
+        
+        # 復元した装備も同じ集計値を持つ
+        restored = Equipment.from_dict(self.equipment.to_dict())
+        assert restored.total_bonus == recalculate(self.equipment)
+        
+        # calculate_equipment_bonus は集計値のコピーを返す
+        bonus = self.equipment.calculate_equipment_bonus()
+        bonus.attack_power += 100
+        assert self.equipment.total_bonus == recalculate(self.equipment)
+    
+    def test_bonus_follows_condition_and_item_reload(self, monkeypatch):
+        """耐久度の変化とアイテム定義の再読み込みが総ボーナスに反映されることを確認"""
+        sword = ItemInstance(item_id="long_sword", condition=0.5)
+        self.equipment.equip_item(sword, EquipmentSlot.WEAPON, "fighter")
+        attack = item_manager.get_item("long_sword").get_attack_power()
+        assert self.equipment.total_bonus.attack_power == int(attack * 0.5)
+        
+        # 修理などで耐久度が変わった
+        version = self.equipment.version
+        item_manager.perform_repair(sword)
+        assert self.equipment.total_bonus.attack_power == attack
+        assert self.equipment.version > version
+        
+        # アイテム定義が再読み込みされた（攻撃力が変わった定義に差し替え）
+        vector = list(item_manager.get_bonus_vector("long_sword"))
+        vector[BONUS_VECTOR_FIELDS.index('attack_power')] = attack + 5
+        monkeypatch.setitem(item_manager.bonus_vectors, "long_sword", tuple(vector))
+        monkeypatch.setattr(item_manager, "items_version", item_manager.items_version + 1)
+        assert self.equipment.calculate_equipment_bonus().attack_power == attack + 5
+    
     def test_get_equipment_summary(self):
         """装備要約取得のテスト"""
         # 武器と防具を装備
@@ -379,4 +379,145 @@ class TestPartyInventoryIntegration:
         
         # 同じインベントリが返される
         assert inventory == inventory2
-        assert inventory2.get_used_slot_count() == 1
\ No newline at end of file
+        assert inventory2.get_used_slot_count() == 1
+
+class TestInventoryIndex:
+    """インベントリ索引の整合性テスト"""
+    
+    ITEM_IDS = ["healing_potion", "mana_potion", "antidote", "dagger", "leather_armor", "torch"]
+    
+    def _assert_index_consistent(self, inventory):
+        """索引による問い合わせがスロットの全走査と一致することを確認"""
+        occupied = [(i, slot.item_instance) for i, slot in enumerate(inventory.slots) if not slot.is_empty()]
+        empty = [i for i, slot in enumerate(inventory.slots) if slot.is_empty()]
+        
+        assert inventory.get_used_slot_count() == len(occupied)
+        assert inventory.get_empty_slot_count() == len(empty)
+        assert inventory.find_empty_slot() == (empty[0] if empty else None)
+        
+        for item_id in self.ITEM_IDS:
+            expected_count = sum(instance.quantity for _, instance in occupied if instance.item_id == item_id)
+            assert inventory.get_item_count(item_id) == expected_count
+            assert inventory.get_item_slots(item_id) == [i for i, instance in occupied if instance.item_id == item_id]
+        
+        expected_weight = sum(item_manager.get_item(instance.item_id).weight * instance.quantity for _, instance in occupied)
+        expected_value = sum(item_manager.get_item(instance.item_id).price * instance.quantity for _, instance in occupied)
+        assert inventory.get_total_quantity() == sum(instance.quantity for _, instance in occupied)
+        assert inventory.get_total_weight() == pytest.approx(expected_weight)
+        assert inventory.get_total_value() == expected_value
+    
+    def test_index_consistent_through_random_operations(self):
+        """ランダムな追加・削除・移動・ソート・転送の後も索引が一致することを確認"""
+        import random
+        
+        rng = random.Random(7)
+        manager = InventoryManager()
+        storage = Inventory("storage", InventorySlotType.PARTY, max_slots=200)
+        character = Inventory("char", InventorySlotType.CHARACTER, max_slots=10)
+        
+        for _ in range(500):
+            inventory = rng.choice([storage, character])
+            other = character if inventory is storage else storage
+            action = rng.randrange(6)
+            if action == 0:
+                inventory.add_item(ItemInstance(item_id=rng.choice(self.ITEM_IDS), quantity=rng.randint(1, 5)))
+            elif action == 1:
+                inventory.remove_item(rng.randrange(inventory.max_slots), rng.choice([None, 1, 2]))
+            elif action == 2:
+                inventory.remove_item_by_id(rng.choice(self.ITEM_IDS), rng.randint(1, 3))
+            elif action == 3:
+                inventory.move_item(rng.randrange(inventory.max_slots), rng.randrange(inventory.max_slots))
+            elif action == 4:
+                inventory.sort_items()
+            else:
+                manager.transfer_item(inventory, rng.randrange(inventory.max_slots), other, rng.choice([None, 1]))
+            
+            self._assert_index_consistent(storage)
+            self._assert_index_consistent(character)
+        
+        restored = Inventory.from_dict(storage.to_dict())
+        self._assert_index_consistent(restored)
+        print(f"倉庫: {storage.get_used_slot_count()}スロット使用, 総数量{storage.get_total_quantity()}")
+    
+    def test_transfer_to_full_inventory_keeps_source(self):
+        """満杯のインベントリへの転送は元のスロットを変更しないことを確認"""
+        manager = InventoryManager()
+        source = Inventory("source", InventorySlotType.CHARACTER, max_slots=3)
+        target = Inventory("target", InventorySlotType.CHARACTER, max_slots=1)
+        
+        source.add_item(ItemInstance(item_id="torch", quantity=1))
+        source.add_item(ItemInstance(item_id="dagger", quantity=1))
+        target.add_item(ItemInstance(item_id="leather_armor", quantity=1))
+        
+        assert manager.transfer_item(source, 1, target) == False
+        assert source.slots[1].item_instance.item_id == "dagger"
+        assert source.get_item_slots("dagger") == [1]
+    
+    def test_totals_follow_item_usage(self):
+        """アイテム使用による消費がスロット経由で索引と合計値に反映されることを確認"""
+        from src.items.item_usage import ItemUsageManager, UsageResult
+        
+        inventory = Inventory("char", InventorySlotType.CHARACTER, max_slots=10)
+        inventory.add_item(ItemInstance(item_id="healing_potion", quantity=5, identified=True))
+        inventory.add_item(ItemInstance(item_id="torch", quantity=2))
+        
+        stats = BaseStats(strength=15, agility=12, intelligence=14, faith=10, luck=13)
+        character = Character.create_character("TestHero", "human", "fighter", stats)
+        character.take_damage(20)
+        slot = inventory.slots[0]
+        result, _, _ = ItemUsageManager().use_item(slot.item_instance, character, character, slot=slot)
+        
+        assert result == UsageResult.SUCCESS
+        assert inventory.get_item_count("healing_potion") == 4
+        self._assert_index_consistent(inventory)
+        
+        inventory.slots[1].change_quantity(3)
+        assert inventory.get_item_count("torch") == 5
+        self._assert_index_consistent(inventory)
+    
+    def test_inn_storage_index(self):
+        """宿屋倉庫の索引が追加・一部削除・全削除・復元後も一致することを確認"""
+        from src.overworld.inn_storage import InnStorage
+        
+        storage = InnStorage(capacity=120)
+        for item_id in self.ITEM_IDS * 3:
+            assert storage.add_item(ItemInstance(item_id=item_id, quantity=2))
+        
+        storage.remove_item(storage.get_item_slots("dagger")[0], 1)
+        storage.remove_item(storage.get_item_slots("torch")[0], 2)
+        
+        for restored in (storage, InnStorage.from_dict(storage.to_dict())):
+            occupied = [i for i, slot in enumerate(restored.slots) if not slot.is_empty()]
+            assert [index for index, _ in restored.get_all_items()] == occupied
+            assert restored.get_used_slots_count() == len(occupied)
+            assert restored.find_empty_slot() == min(set(range(len(restored.slots))) - set(occupied))
+            for item_id in self.ITEM_IDS:
+                assert restored.get_item_slots(item_id) == [
+                    i for i in occupied if restored.slots[i].item_instance.item_id == item_id
+                ]
+    
+    def test_inventory_component_item_totals(self):
+        """InventoryComponentのアイテム数集計のテスト"""
+        character = Character.create_character(
+            "Packer", "human", "fighter",
+            BaseStats(strength=15, agility=12, intelligence=10, faith=10, luck=10)
+        )
+        items = character.items
+        
+        items.add_item("healing_potion", quantity=60)
+        items.add_item("healing_potion", quantity=60)  # スタック上限を超えた分は新スロット
+        items.add_item("torch", quantity=3)
+        assert items.get_item_quantity("healing_potion") == 120
+        assert items.get_inventory_status()['total_items'] == 123
+        
+        assert items.remove_item("healing_potion", 100) == 100
+        assert items.get_item_quantity("healing_potion") == 20
+        assert items.has_item("torch", 3) == True
+        
+        items.add_item("healing_potion", quantity=5)
+        assert items.get_item_quantity("healing_potion") == 25
+        
+        restored = type(items)(character)
+        restored.from_dict(items.to_dict())
+        assert restored.get_item_quantity("healing_potion") == 25
+        assert restored.get_item_quantity("torch") == 3
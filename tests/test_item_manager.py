@@ -0,0 +1,77 @@
+"""アイテム管理システムのテスト"""
+
+import pytest
+from src.items.item import ItemManager, ItemType, ItemRarity, PRICE_BAND_THRESHOLDS
+
+
+class TestItemManagerIndexes:
+    """ItemManagerの検索インデックスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.manager = ItemManager()
+    
+    def _sort_key(self, item):
+        return (item.price, item.item_id)
+    
+    def test_type_index_matches_full_scan(self):
+        """タイプ別インデックスが全件走査と一致し、価格順であることを確認"""
+        for item_type in ItemType:
+            expected = sorted(
+                (item for item in self.manager.items.values() if item.item_type == item_type),
+                key=self._sort_key
+            )
+            assert list(self.manager.get_items_by_type(item_type)) == expected
+        
+        weapons = self.manager.get_items_by_type(ItemType.WEAPON)
+        print(f"武器: {[item.item_id for item in weapons]}")
+        assert len(weapons) > 0
+    
+    def test_class_index_matches_full_scan(self):
+        """クラス別インデックスが can_use の結果と一致することを確認"""
+        for character_class in ["fighter", "mage", "priest", "thief", "bishop", "samurai", "lord", "ninja", "unknown"]:
+            expected = sorted(
+                (item for item in self.manager.items.values() if item.can_use(character_class)),
+                key=self._sort_key
+            )
+            assert list(self.manager.get_items_by_class(character_class)) == expected
+    
+    def test_rarity_and_price_band_indexes(self):
+        """希少度別・価格帯別インデックスのテスト"""
+        for rarity in ItemRarity:
+            expected = sorted(
+                (item for item in self.manager.items.values() if item.rarity == rarity),
+                key=self._sort_key
+            )
+            assert list(self.manager.get_items_by_rarity(rarity)) == expected
+        
+        total = 0
+        for band in range(len(PRICE_BAND_THRESHOLDS) + 1):
+            items = self.manager.get_items_by_price_band(band)
+            total += len(items)
+            for item in items:
+                assert self.manager.get_price_band(item.price) == band
+        assert total == len(self.manager.items)
+        
+        assert self.manager.get_price_band(0) == 0
+        assert self.manager.get_price_band(100) == 1
+        assert self.manager.get_price_band(5000) == len(PRICE_BAND_THRESHOLDS)
+    
+    def test_query_results_are_stable(self):
+        """同じ問い合わせは同じシーケンスを返すことを確認"""
+        first = self.manager.get_items_by_type(ItemType.ARMOR)
+        second = self.manager.get_items_by_type(ItemType.ARMOR)
+        
+        assert first is second
+        assert isinstance(first, tuple)
+    
+    def test_indexes_rebuilt_on_reload(self):
+        """再読み込みでインデックスが再構築されることを確認"""
+        old_weapons = self.manager.get_items_by_type(ItemType.WEAPON)
+        
+        self.manager.reload_items()
+        new_weapons = self.manager.get_items_by_type(ItemType.WEAPON)
+        
+        assert [item.item_id for item in new_weapons] == [item.item_id for item in old_weapons]
+        assert all(new is self.manager.get_item(new.item_id) for new in new_weapons)
+        assert list(self.manager.get_all_items()) == sorted(self.manager.items.values(), key=self._sort_key)
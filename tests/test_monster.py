@@ -1,13 +1,16 @@
 """モンスターシステムのテスト"""
 
+import random
+
 import pytest
 from unittest.mock import Mock, patch
 
 from src.monsters.monster import (
     Monster, MonsterType, MonsterSize, MonsterResistance, MonsterStats, 
-    MonsterAbility, MonsterManager, monster_manager
+    MonsterAbility, MonsterManager, monster_manager, DEFAULT_DAMAGE_DICE
 )
 from src.dungeon.dungeon_generator import DungeonAttribute
+from src.utils.dice import compile_dice
 
 
 class TestMonsterStats:
@@ -280,6 +283,12 @@ class TestMonster:
         damage = self.monster.get_attack_damage()
         assert damage == 12  # 6 + 6
     
+    def test_monster_attack_damage_with_modifier(self):
+        """修正値付きダイス（1d8+2）のダメージ範囲テスト"""
+        rng = random.Random(3)
+        damages = {self.monster.get_attack_damage(rng) for _ in range(200)}
+        assert damages == set(range(3, 11))
+    
     @patch('random.random')
     def test_monster_loot_generation(self, mock_random):
         """ドロップアイテム生成テスト"""
@@ -332,6 +341,39 @@ class TestMonsterManager:
         assert isinstance(self.manager.monster_templates, dict)
         assert len(self.manager.monster_templates) > 0  # デフォルトモンスターが存在
     
+    def test_damage_dice_compiled_on_load(self):
+        """読み込み時に全テンプレートのダメージダイスが解析されるテスト"""
+        assert set(self.manager.damage_dice) == set(self.manager.monster_templates)
+        dice = self.manager.get_damage_dice("goblin")
+        assert dice is compile_dice("1d6")
+        assert (dice.min, dice.max, dice.mean) == (1, 6, 3.5)
+    
+    def test_created_monsters_share_compiled_dice(self):
+        """作成したモンスターがテンプレートの解析済みダイスを共有するテスト"""
+        monster = self.manager.create_monster("goblin")
+        assert monster.stats.damage_dice is self.manager.get_damage_dice("goblin")
+        assert monster.stats.get_damage_dice() is compile_dice("1d6")
+        assert monster.stats.to_dict()['damage_dice'] == "1d6"
+    
+    def test_non_string_damage_dice_falls_back(self, tmp_path):
+        """文字列でないダメージダイスはそのモンスターだけデフォルトにするテスト"""
+        import yaml
+        from src.core.config_manager import ConfigManager
+        
+        monsters = {
+            "good": {"level": 1, "hp": 5, "damage_dice": "2d4"},
+            "number": {"level": 1, "hp": 5, "damage_dice": 6},
+            "listed": {"level": 1, "hp": 5, "damage_dice": [1, 6]}
+        }
+        with open(tmp_path / "monsters.yaml", 'w', encoding='utf-8') as f:
+            yaml.safe_dump({"monsters": monsters}, f)
+        
+        manager = MonsterManager(config=ConfigManager(str(tmp_path)))
+        assert set(manager.templates) == {"good", "number", "listed"}
+        assert manager.get_damage_dice("good") is compile_dice("2d4")
+        assert manager.get_damage_dice("number") is compile_dice(DEFAULT_DAMAGE_DICE)
+        assert manager.get_damage_dice("listed") is compile_dice(DEFAULT_DAMAGE_DICE)
+    
     def test_default_monsters_creation(self):
         """デフォルトモンスター作成テスト"""
         # デフォルトモンスターが存在することを確認
@@ -393,6 +435,51 @@ class TestMonsterManager:
         assert monsters[0].monster_id == "goblin"
         assert monsters[1].monster_id == "orc"
     
+    def test_monsters_share_template(self):
+        """同種のモンスターが共有テンプレートを参照し、可変状態のみ個別に持つテスト"""
+        first, second = self.manager.create_monster_group(["goblin", "goblin"])
+        
+        assert first.template is second.template is self.manager.get_template("goblin")
+        assert first.resistances is second.resistances
+        assert first.abilities is second.abilities
+        assert first.loot_table is second.loot_table
+        assert first.stats is not second.stats
+        
+        first.take_damage(3)
+        self.manager.scale_monster_for_party(first, 20, 4)
+        assert second.current_hp == second.stats.hit_points == self.manager.get_template("goblin").stats.hit_points
+    
+    def test_template_indexes_match_scan(self):
+        """階層・レベル・ボス別の索引が生データの走査結果と一致するテスト"""
+        raw = self.manager.monster_templates
+        
+        assert self.manager.get_boss_monsters() == [m for m, t in raw.items() if t.get('is_boss', False)]
+        assert self.manager.get_regular_monsters() == [m for m, t in raw.items() if not t.get('is_boss', False)]
+        
+        for floor in range(1, 16):
+            expected = [m for m, t in raw.items()
+                        if floor in t.get('floors', []) or t.get('floor') == floor]
+            assert list(self.manager.get_monsters_for_floor(floor, include_bosses=True)) == expected
+            assert list(self.manager.get_monsters_for_floor(floor)) == \
+                [m for m in expected if not raw[m].get('is_boss', False)]
+            # ボスを除く一覧も読み込み時に構築済み（呼び出しごとに作り直さない）
+            assert self.manager.get_monsters_for_floor(floor) is self.manager.get_monsters_for_floor(floor)
+        
+        for level in {t.get('level', 1) for t in raw.values()}:
+            assert list(self.manager.get_monsters_by_level(level)) == \
+                [m for m, t in raw.items() if t.get('level', 1) == level]
+    
+    def test_monster_serialization_from_template(self):
+        """テンプレートから生成したモンスターのシリアライゼーションテスト"""
+        monster = self.manager.create_monster("cave_boss")
+        data = monster.to_dict()
+        
+        assert isinstance(data['loot_table'], list)
+        assert all(isinstance(entry, dict) for entry in data['loot_table'])
+        restored = Monster.from_dict(data)
+        assert restored.resistances == dict(monster.resistances)
+        assert len(restored.abilities) == len(monster.abilities)
+    
     def test_scale_monster_for_party_stronger(self):
         """強いパーティ向けモンスタースケーリングテスト"""
         monster = self.manager.create_monster("goblin")
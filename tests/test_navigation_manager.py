@@ -1,5 +1,10 @@
 """ナビゲーション管理システムのテスト"""
 
+import itertools
+import random
+from fractions import Fraction
+from math import comb
+
 import pytest
 from unittest.mock import Mock, patch
 
@@ -7,7 +12,10 @@ from src.navigation.navigation_manager import (
     NavigationManager, MovementType, MovementResult, MovementEvent
 )
 from src.dungeon.dungeon_manager import DungeonManager, DungeonState, PlayerPosition
-from src.dungeon.dungeon_generator import Direction, CellType, DungeonAttribute
+from src.dungeon.dungeon_generator import (
+    Direction, CellType, DungeonAttribute, DungeonCell, DungeonLevel, DungeonGenerator
+)
+from src.navigation.encounter_profile import compute_encounter_profile
 from src.character.party import Party
 from src.character.character import Character
 from src.character.stats import BaseStats
@@ -452,4 +460,286 @@ class TestAutoMap:
         # オートマップデータ取得
         map_data = self.nav_manager.get_auto_map_data()
         
-        assert map_data == {}
\ No newline at end of file
+        assert map_data == {}
+
+
+def create_corridor_level(length: int, encounter_rate: float = 0.1) -> DungeonLevel:
+    """上り階段から下り階段まで一直線の通路の階層を作成"""
+    level = DungeonLevel(level=2, width=length, height=1, attribute=DungeonAttribute.PHYSICAL,
+                         encounter_rate=encounter_rate)
+    for x in range(length):
+        cell = DungeonCell(x=x, y=0, cell_type=CellType.FLOOR)
+        cell.walls[Direction.WEST] = x == 0
+        cell.walls[Direction.EAST] = x == length - 1
+        level.set_cell(cell)
+    level.cells[(0, 0)].cell_type = CellType.STAIRS_UP
+    level.cells[(length - 1, 0)].cell_type = CellType.STAIRS_DOWN
+    level.stairs_up_position = (0, 0)
+    level.stairs_down_position = (length - 1, 0)
+    return level
+
+
+class TestEncounterProfile:
+    """エンカウンター率プロファイルのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.nav_manager = NavigationManager()
+    
+    def test_constant_rate_is_binomial(self):
+        """一定の率なら階段間の戦闘回数が二項分布に一致するテスト"""
+        level = create_corridor_level(9)
+        profile = compute_encounter_profile(level, lambda steps: 0.25)
+        
+        assert profile.per_step == Fraction(1, 4)
+        assert profile.mean_steps_between_encounters == 4
+        assert profile.stairs_path_steps == 8
+        assert profile.exploration_steps == 8
+        assert profile.per_exploration == 2
+        for fights in range(9):
+            expected = comb(8, fights) * Fraction(1, 4) ** fights * Fraction(3, 4) ** (8 - fights)
+            assert profile.stairs_path_fight_distribution[fights] == expected
+        assert profile.per_stairs_path == 2
+        assert profile.probability_of_reaching_stairs(8) == 1
+    
+    def test_exploration_steps_include_backtracking(self):
+        """分岐のある階層では行き止まりからの戻りも全探索の歩数に含めるテスト"""
+        level = create_corridor_level(5)
+        level.height = 3
+        level.cells[(2, 0)].walls[Direction.SOUTH] = False
+        for y in (1, 2):
+            cell = DungeonCell(x=2, y=y, cell_type=CellType.FLOOR)
+            cell.walls[Direction.NORTH] = False
+            cell.walls[Direction.SOUTH] = y == 2
+            level.set_cell(cell)
+        profile = compute_encounter_profile(level, lambda steps: 0.25)
+        
+        # 分岐の先 (2, 2) まで往復してから下り階段へ向かう 2+2+2+2 歩
+        assert profile.exploration_steps == 8
+        assert profile.per_exploration == 2
+        
+        # 判定の行われないセルは巡回で踏む回数だけ期待値から除かれる
+        no_check_in_branch = compute_encounter_profile(level, lambda steps: 0.25,
+                                                       check_function=lambda cell: 0.0 if cell.y > 0 else 1.0)
+        assert no_check_in_branch.per_exploration == Fraction(5, 4)
+    
+    def test_mean_steps_with_rising_rate(self):
+        """歩数で率が上がる場合の平均歩数の厳密値テスト"""
+        profile = compute_encounter_profile(create_corridor_level(3), lambda steps: 0.5 if steps < 2 else 1.0)
+        
+        # P(T=1)=1/2, P(T=2)=1/2 なので平均1.5歩
+        assert profile.mean_steps_between_encounters == Fraction(3, 2)
+        assert profile.per_step == Fraction(2, 3)
+    
+    def test_profile_matches_enumeration(self):
+        """移動時の率の計算式による全遭遇パターンの列挙と一致するテスト"""
+        self.nav_manager.encounter_step_threshold = 2
+        level = create_corridor_level(9, encounter_rate=0.2)
+        level.cells[(4, 0)].has_treasure = True
+        profile = self.nav_manager.get_encounter_profile(level, MovementType.RUN)
+        
+        # 宝箱と下り階段のセルではエンカウンター判定を行わない
+        checked = [x not in (4, 8) for x in range(1, 9)]
+        expected = [Fraction(0)] * 9
+        for pattern in itertools.product([False, True], repeat=8):
+            if any(hit and not check for hit, check in zip(pattern, checked)):
+                continue
+            probability = Fraction(1)
+            steps = 0
+            for hit, check in zip(pattern, checked):
+                steps += 1
+                rate = Fraction(self.nav_manager._calculate_encounter_rate(level, MovementType.RUN, steps))
+                rate = min(Fraction(1), rate.limit_denominator(10 ** 6)) if check else Fraction(0)
+                probability *= rate if hit else 1 - rate
+                if hit:
+                    steps = 0
+            expected[sum(pattern)] += probability
+        
+        assert list(profile.stairs_path_fight_distribution) == expected[:len(profile.stairs_path_fight_distribution)]
+        assert sum(expected[len(profile.stairs_path_fight_distribution):]) == 0
+        assert profile.probability_of_reaching_stairs(1) == expected[0] + expected[1]
+    
+    def test_generated_dungeon_profiles(self):
+        """生成した階層のプロファイルが整合しているテスト"""
+        generator = DungeonGenerator("profile_seed")
+        dungeon_state = Mock(spec=DungeonState)
+        dungeon_state.levels = {level: generator.generate_level(level) for level in (1, 2, 3)}
+        
+        profiles = self.nav_manager.get_encounter_profiles(dungeon_state)
+        
+        assert list(profiles) == [1, 2, 3]
+        for profile in profiles.values():
+            assert 0 < profile.per_step <= 1
+            assert 0 < profile.per_exploration < profile.exploration_steps
+            if profile.stairs_path_steps is not None:
+                assert sum(profile.stairs_path_fight_distribution) == 1
+                probabilities = [profile.probability_of_reaching_stairs(k) for k in range(4)]
+                assert probabilities == sorted(probabilities)
+        # 深い階層ほど1歩あたりのエンカウンター数が多い
+        assert profiles[1].per_step < profiles[2].per_step < profiles[3].per_step
+
+
+class TestAutoTravel:
+    """自動移動のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        # 5x3 の開けた階層（エンカウンター率は歩数で上がるため0にはしない）
+        self.level = DungeonLevel(level=1, width=5, height=3, attribute=DungeonAttribute.PHYSICAL,
+                                  encounter_rate=0.1)
+        for x in range(5):
+            for y in range(3):
+                cell = DungeonCell(x=x, y=y, cell_type=CellType.FLOOR)
+                cell.walls[Direction.NORTH] = y == 0
+                cell.walls[Direction.SOUTH] = y == 2
+                cell.walls[Direction.WEST] = x == 0
+                cell.walls[Direction.EAST] = x == 4
+                self.level.set_cell(cell)
+        self.level.start_position = (0, 0)
+        
+        # 上端と右端のみ発見済み（直進の近道 (0,1)->(4,1) は未発見）
+        self.discovered = [(x, 0) for x in range(5)] + [(4, 1), (4, 2)]
+    
+    def create_navigation(self, tmp_path, position=(4, 2)) -> NavigationManager:
+        """実際のダンジョンマネージャーを使うナビゲーションマネージャーを作成"""
+        dungeon_manager = DungeonManager(save_directory=str(tmp_path))
+        dungeon_manager.current_dungeon = DungeonState(
+            dungeon_id="auto_travel", seed="auto_travel",
+            player_position=PlayerPosition(x=position[0], y=position[1], level=1),
+            levels={1: self.level},
+            discovered_cells={1: list(self.discovered)}
+        )
+        nav_manager = NavigationManager()
+        nav_manager.set_dungeon_manager(dungeon_manager)
+        return nav_manager
+    
+    def test_travel_over_discovered_cells(self, tmp_path):
+        """発見済みのセルだけを通って目的地に到着するテスト"""
+        nav_manager = self.create_navigation(tmp_path)
+        
+        with patch('src.navigation.navigation_manager.random.random', return_value=0.99):
+            result = nav_manager.auto_travel((0, 0))
+        
+        assert result.completed
+        assert result.path == [(4, 1), (4, 0), (3, 0), (2, 0), (1, 0), (0, 0)]
+        assert result.steps == 6
+        assert nav_manager.navigation_state.step_count == 6
+        assert nav_manager.dungeon_manager.current_dungeon.steps_taken == 6
+        
+        # 未発見のセルへは経路を計画しない
+        failed = nav_manager.auto_travel((2, 2))
+        assert not failed.completed
+        assert failed.last_event.result == MovementResult.INVALID_TARGET
+    
+    def test_stops_on_treasure_cell(self, tmp_path):
+        """途中の宝箱のセルで停止するテスト"""
+        self.level.cells[(2, 0)].has_treasure = True
+        nav_manager = self.create_navigation(tmp_path)
+        
+        with patch('src.navigation.navigation_manager.random.random', return_value=0.99):
+            result = nav_manager.auto_travel_to_stairs("up")
+        
+        assert not result.completed
+        assert result.steps == 4
+        assert result.last_event.result == MovementResult.TREASURE_FOUND
+        position = nav_manager.dungeon_manager.current_dungeon.player_position
+        assert (position.x, position.y) == (2, 0)
+    
+    def test_same_state_as_manual_walking(self, tmp_path):
+        """手動で同じ経路を歩いた場合と同じ状態になるテスト"""
+        auto_manager = self.create_navigation(tmp_path)
+        random.seed(11)
+        with patch('src.navigation.navigation_manager.random.random', side_effect=itertools.cycle([0.5, 0.01, 0.7])):
+            auto_result = auto_manager.auto_travel((0, 0))
+        
+        manual_manager = self.create_navigation(tmp_path)
+        random.seed(11)
+        with patch('src.navigation.navigation_manager.random.random', side_effect=itertools.cycle([0.5, 0.01, 0.7])):
+            for direction in [Direction.NORTH, Direction.NORTH, Direction.WEST, Direction.WEST]:
+                manual_event = manual_manager.move_player(direction)
+                if manual_event.result != MovementResult.SUCCESS:
+                    break
+        
+        # 2歩目でエンカウンターが発生して停止する
+        assert auto_result.last_event.result == MovementResult.ENCOUNTER
+        assert auto_result.last_event == manual_event
+        auto_state = auto_manager.dungeon_manager.current_dungeon
+        manual_state = manual_manager.dungeon_manager.current_dungeon
+        assert auto_state.player_position == manual_state.player_position
+        assert auto_state.steps_taken == manual_state.steps_taken == 2
+        assert auto_state.encounters_faced == manual_state.encounters_faced == 1
+        assert auto_manager.navigation_state == manual_manager.navigation_state
+
+
+class TestAutoMapChanges:
+    """オートマップの差分取得のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.level = create_corridor_level(6, encounter_rate=0.0)
+        self.level.cells[(0, 0)].discovered = True
+        self.level.cells[(3, 0)].has_trap = True
+        self.level.cells[(3, 0)].trap_type = "poison"
+    
+    def test_changes_since_version(self, tmp_path):
+        """移動やセルの変化の差分のみを取得でき、全体データと一致するテスト"""
+        dungeon_manager = DungeonManager(save_directory=str(tmp_path))
+        dungeon_manager.current_dungeon = DungeonState(
+            dungeon_id="auto_map", seed="auto_map",
+            player_position=PlayerPosition(x=0, y=0, level=2, facing=Direction.EAST),
+            levels={2: self.level},
+            discovered_cells={2: [(0, 0)]}
+        )
+        nav_manager = NavigationManager()
+        nav_manager.set_dungeon_manager(dungeon_manager)
+        
+        snapshot = nav_manager.get_auto_map_data()
+        token = snapshot['token']
+        assert nav_manager.get_auto_map_changes(token)['cell_details'] == {}
+        
+        dungeon_manager.move_player(Direction.EAST)
+        dungeon_manager.move_player(Direction.EAST)
+        changes = nav_manager.get_auto_map_changes(token)
+        assert not changes['full']
+        assert changes['discovered_cells'] == [(1, 0), (2, 0)]
+        assert changes['player_position'] == (2, 0)
+        
+        # 差分を適用した結果が全体データと一致する
+        snapshot['cell_details'].update(changes['cell_details'])
+        assert snapshot['cell_details'] == nav_manager.get_auto_map_data()['cell_details']
+        
+        # 未発見のセルの変化は含まれない
+        token = changes['token']
+        self.level.cells[(3, 0)].has_trap = False
+        self.level.mark_cell_changed(3, 0)
+        assert nav_manager.get_auto_map_changes(token)['cell_details'] == {}
+        
+        # 構造の変更や別の階層の時点からは全体データを返す
+        level, epoch, version = nav_manager.get_auto_map_data()['token']
+        assert nav_manager.get_auto_map_changes((1, epoch, version))['full']
+        assert nav_manager.get_auto_map_changes(None)['full']
+        self.level.invalidate_layout()
+        assert nav_manager.get_auto_map_changes(token)['full']
+    
+    def test_restored_level_returns_full(self, tmp_path):
+        """セーブから復元した階層には復元前の時点からの差分を返さないテスト"""
+        dungeon_manager = DungeonManager(save_directory=str(tmp_path))
+        dungeon_manager.current_dungeon = DungeonState(
+            dungeon_id="auto_map", seed="auto_map",
+            player_position=PlayerPosition(x=0, y=0, level=2, facing=Direction.EAST),
+            levels={2: self.level},
+            discovered_cells={2: [(0, 0)]}
+        )
+        nav_manager = NavigationManager()
+        nav_manager.set_dungeon_manager(dungeon_manager)
+        for _ in range(3):
+            self.level.mark_cell_changed(0, 0)
+        token = nav_manager.get_auto_map_data()['token']
+        
+        # 復元した階層は版番号が0から始まり、以前の版番号と同じ値に達し得る
+        restored = DungeonLevel.from_dict(self.level.to_dict())
+        dungeon_manager.current_dungeon.levels[2] = restored
+        while restored.map_version <= token[2]:
+            restored.mark_cell_changed(1, 0)
+        assert restored.get_changed_cells(token[2]) is not None
+        assert nav_manager.get_auto_map_changes(token)['full']
@@ -0,0 +1,76 @@
+"""ダンジョン全階層の事前生成のテスト"""
+
+import json
+import os
+
+from src.dungeon.dungeon_generator import DungeonGenerator
+from src.dungeon.dungeon_manager import DungeonManager
+from src.dungeon.pregeneration import get_generator_fingerprint, get_pregeneration_path, pregenerate_dungeon
+
+
+def generate_sequentially(dungeon_id: str, seed: str, floors: int):
+    """ゲーム中と同じく1つの生成器で階層を順に生成"""
+    generator = DungeonGenerator(seed)
+    return {level: generator.generate_level(level, dungeon_id).to_dict() for level in range(1, floors + 1)}
+
+
+class TestPregeneration:
+    """事前生成のテスト"""
+    
+    def test_parallel_matches_sequential(self):
+        """並列生成の結果は逐次生成と同一"""
+        result = pregenerate_dungeon("test_dungeon", "pregen_seed", floors=3, max_workers=2, cache_dir=None)
+        
+        expected = generate_sequentially("test_dungeon", "pregen_seed", 3)
+        assert {level: data.to_dict() for level, data in result.levels.items()} == expected
+        assert sorted(result.floor_timings) == [1, 2, 3]
+        assert not result.from_cache
+    
+    def test_artifact_reused(self, tmp_path):
+        """保存した生成結果を次回に再利用"""
+        cache_dir = str(tmp_path)
+        first = pregenerate_dungeon("test_dungeon", "cache_seed", floors=2, parallel=False, cache_dir=cache_dir)
+        assert os.path.exists(get_pregeneration_path("test_dungeon", "cache_seed", cache_dir))
+        
+        second = pregenerate_dungeon("test_dungeon", "cache_seed", floors=2, cache_dir=cache_dir)
+        assert second.from_cache
+        assert second.floor_timings == first.floor_timings
+        for level, dungeon_level in first.levels.items():
+            restored = second.levels[level]
+            assert restored.to_dict() == dungeon_level.to_dict()
+            assert restored.stairs_down_position == dungeon_level.stairs_down_position
+            assert isinstance(restored.start_position, tuple)
+        
+        # 階層数が異なれば再生成する
+        assert not pregenerate_dungeon("test_dungeon", "cache_seed", floors=3, parallel=False,
+                                       cache_dir=cache_dir).from_cache
+    
+    def test_artifact_from_other_generator_ignored(self, tmp_path):
+        """生成器のソースが異なる保存データは使わずに再生成"""
+        cache_dir = str(tmp_path)
+        pregenerate_dungeon("test_dungeon", "stale_seed", floors=2, parallel=False, cache_dir=cache_dir)
+        path = get_pregeneration_path("test_dungeon", "stale_seed", cache_dir)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['generator_fingerprint'] == get_generator_fingerprint()
+        
+        data['generator_fingerprint'] = "older_generator"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        assert not pregenerate_dungeon("test_dungeon", "stale_seed", floors=2, parallel=False,
+                                       cache_dir=cache_dir).from_cache
+        assert pregenerate_dungeon("test_dungeon", "stale_seed", floors=2, cache_dir=cache_dir).from_cache
+    
+    def test_create_dungeon_pregenerates_all_floors(self, tmp_path):
+        """ダンジョン作成時に全階層を事前生成"""
+        manager = DungeonManager(save_directory=str(tmp_path))
+        dungeon_state = manager.create_dungeon("beginners_cave", "manager_seed", pregenerate=True)
+        
+        expected = generate_sequentially("beginners_cave", "manager_seed", len(dungeon_state.levels))
+        assert len(expected) > 1
+        # 1階は開始位置が発見済みになる以外は同一
+        assert sorted(dungeon_state.levels) == sorted(expected)
+        for level in range(2, len(expected) + 1):
+            assert dungeon_state.levels[level].to_dict() == expected[level]
+        assert dungeon_state.levels[1].stairs_down_position == tuple(expected[1]['stairs_down_position'])
+        assert dungeon_state.player_position.level == 1
@@ -168,6 +168,164 @@ class TestRefactoredRenderer:
         assert config.raycast.step_size > 0, "レイキャストステップサイズが無効です"
         
         print("コンポーネント設定テスト成功")
+    
+    def test_backdrop_cache(self):
+        """床・天井背景キャッシュテスト"""
+        import pygame
+        
+        renderer = DungeonRendererPygame()
+        wall_renderer = renderer.wall_renderer
+        
+        # 同じ条件では同じサーフェスが再利用される
+        first = wall_renderer.get_backdrop_surface()
+        wall_renderer.render_floor_and_ceiling()
+        assert wall_renderer.get_backdrop_surface() is first, "背景が毎フレーム再生成されています"
+        
+        # キャッシュした背景は従来の床・天井の矩形描画と同一
+        width, height = renderer.screen.get_size()
+        ceiling_height = int(height * wall_renderer.wall_config.ceiling_ratio)
+        expected = pygame.Surface((width, height))
+        pygame.draw.rect(expected, renderer.config.colors.floor,
+                         pygame.Rect(0, ceiling_height, width, height - ceiling_height))
+        pygame.draw.rect(expected, renderer.config.colors.ceiling, pygame.Rect(0, 0, width, ceiling_height))
+        for y in (0, ceiling_height - 1, ceiling_height, height - 1):
+            assert first.get_at((0, y)) == expected.get_at((0, y)), "背景の色が従来の描画と異なります"
+        
+        # 描画先のサイズが変わると再生成される
+        wall_renderer.set_target(pygame.Surface((width // 2, height // 2)), 0.5)
+        assert wall_renderer.get_backdrop_surface().get_size() == (width // 2, height // 2)
+    
+    def test_prop_depth_culling(self):
+        """プロップ索引と深度バッファによる遮蔽判定テスト"""
+        from src.dungeon.dungeon_generator import DungeonLevel, DungeonCell, DungeonAttribute, CellFeature
+        
+        # 東向きの一直線の通路: (1,1) プレイヤー, (3,1) 壁, (4,1) 宝箱
+        level = DungeonLevel(level=1, width=6, height=3, attribute=DungeonAttribute.PHYSICAL)
+        for x in range(6):
+            for y in range(3):
+                level.set_cell(DungeonCell(x, y, CellType.WALL))
+        for x in (1, 2, 4):
+            level.get_cell(x, 1).cell_type = CellType.FLOOR
+        level.get_cell(4, 1).has_treasure = True
+        level.get_cell(2, 1).cell_type = CellType.STAIRS_DOWN
+        DungeonGenerator()._update_wall_info(level)
+        
+        renderer = DungeonRendererPygame()
+        prop_renderer = renderer.prop_renderer
+        player_pos = PlayerPosition(x=1, y=1, level=1, facing=Direction.EAST)
+        renderer.update_camera_position(player_pos)
+        
+        # プロップは階層の特徴索引から範囲検索される
+        assert level.find_features_in_range(CellFeature.STAIRS_DOWN, 1, 1, 5) == [(2, 1)]
+        assert level.find_features_in_range(CellFeature.TREASURE, 1, 1, 5) == [(4, 1)]
+        assert level.find_features_in_range(CellFeature.TREASURE, 1, 1, 2) == []
+        
+        renderer._render_walls_raycast(level, player_pos)
+        center_depth = renderer.depth_buffer[len(renderer.depth_buffer) // 2]
+        assert 1.0 < center_depth < 3.0, f"中央列の深度が不正です: {center_depth}"
+        
+        visible_stairs = prop_renderer._calculate_prop_position(2, 1, player_pos, renderer.camera, renderer.depth_buffer)
+        hidden_treasure = prop_renderer._calculate_prop_position(4, 1, player_pos, renderer.camera, renderer.depth_buffer)
+        assert visible_stairs['visible'], "手前の階段が除外されています"
+        assert not hidden_treasure['visible'], "壁の奥の宝箱が描画対象になっています"
+        
+        # 深度バッファなしでは視野内として扱われる
+        assert prop_renderer._calculate_prop_position(4, 1, player_pos, renderer.camera)['visible']
+    
+    def test_cell_render_mode(self):
+        """固定深度セル描画モードテスト"""
+        from src.dungeon.dungeon_generator import DungeonLevel, DungeonCell, DungeonAttribute
+        from src.rendering.renderer_config import RendererConfig, RENDER_MODE_CELL
+        from src.rendering.cell_renderer import FACE_FRONT, FACE_LEFT, FACE_RIGHT
+        
+        # 東向きの通路（x=1..3）、x=2 の北側に横道、x=4 は行き止まり
+        level = DungeonLevel(level=1, width=6, height=4, attribute=DungeonAttribute.PHYSICAL)
+        for x in range(6):
+            for y in range(4):
+                level.set_cell(DungeonCell(x, y, CellType.WALL))
+        for x in (1, 2, 3):
+            level.get_cell(x, 2).cell_type = CellType.FLOOR
+        level.get_cell(2, 1).cell_type = CellType.FLOOR
+        DungeonGenerator()._update_wall_info(level)
+        
+        player_pos = PlayerPosition(x=1, y=2, level=1, facing=Direction.EAST)
+        cell_renderer_instance = DungeonRendererPygame(config=RendererConfig(render_mode=RENDER_MODE_CELL))
+        raycast_renderer = DungeonRendererPygame()
+        for renderer in (cell_renderer_instance, raycast_renderer):
+            renderer.update_camera_position(player_pos)
+            renderer._render_walls(level, player_pos)
+        
+        faces = set(cell_renderer_instance.cell_renderer._collect_visible_faces(level, player_pos))
+        assert (2, 0, FACE_FRONT) in faces, "行き止まりの正面壁がありません"
+        assert (1, -1, FACE_FRONT) in faces, "横道の奥の壁がありません"
+        assert (1, 0, FACE_LEFT) not in faces, "横道の開口部に壁が描画されています"
+        assert (1, 0, FACE_RIGHT) in faces and (2, 0, FACE_LEFT) in faces
+        
+        # テンプレートは画面サイズごとに一度だけ計算される
+        templates = cell_renderer_instance.cell_renderer.get_templates()
+        assert cell_renderer_instance.cell_renderer.get_templates() is templates
+        
+        # 正面の壁までの距離・高さがレイキャスト描画と一致する
+        center = len(raycast_renderer.depth_buffer) // 2
+        assert abs(raycast_renderer.depth_buffer[center] - cell_renderer_instance.depth_buffer[center]) < 0.1
+        polygon, _ = templates[(2, 0, FACE_FRONT)]
+        wall_renderer = raycast_renderer.wall_renderer
+        raycast_height = wall_renderer.calculate_wall_height(raycast_renderer.depth_buffer[center])
+        assert abs((polygon[3][1] - polygon[0][1]) - raycast_height) <= 2
+        
+        # 深度バッファは描画した壁面から列ごとに求める（右端の列は手前の右側壁に当たる）
+        depth_buffer = cell_renderer_instance.depth_buffer
+        assert depth_buffer[-1] < 1.0 < depth_buffer[center]
+        prop_renderer = cell_renderer_instance.prop_renderer
+        assert not prop_renderer._calculate_prop_position(2, 3, player_pos, cell_renderer_instance.camera,
+                                                          depth_buffer)['visible'], "側壁の奥のプロップが描画されます"
+    
+    def test_cell_render_wide_side_range(self):
+        """左右2マス以上のセル描画テスト"""
+        from src.dungeon.dungeon_generator import DungeonLevel, DungeonCell, DungeonAttribute
+        from src.rendering.renderer_config import RendererConfig, CellViewConfig, RENDER_MODE_CELL
+        from src.rendering.cell_renderer import FACE_FRONT, FACE_LEFT, FACE_RIGHT
+        
+        # 5x5 の部屋の中央の列を東向きに見る
+        level = DungeonLevel(level=1, width=5, height=5, attribute=DungeonAttribute.PHYSICAL)
+        for x in range(5):
+            for y in range(5):
+                level.set_cell(DungeonCell(x, y, CellType.FLOOR))
+        DungeonGenerator()._update_wall_info(level)
+        player_pos = PlayerPosition(x=0, y=2, level=1, facing=Direction.EAST)
+        
+        config = RendererConfig(render_mode=RENDER_MODE_CELL, cell_view=CellViewConfig(side_cells=2))
+        renderer = DungeonRendererPygame(config=config)
+        renderer.update_camera_position(player_pos)
+        faces = renderer.cell_renderer.render_cells(level, player_pos)
+        
+        # 2マス先の部屋の壁まで描画される
+        assert (0, -2, FACE_LEFT) in faces and (0, 2, FACE_RIGHT) in faces
+        assert (4, -2, FACE_FRONT) in faces and (4, 0, FACE_FRONT) in faces
+        assert all(key in renderer.cell_renderer.get_templates() for key in faces)
+    
+    def test_internal_resolution_rendering(self):
+        """内部解像度描画テスト"""
+        from src.rendering.renderer_config import RendererConfig, ScreenConfig
+        
+        dungeon_manager = DungeonManager()
+        dungeon_manager.create_dungeon("internal_resolution_test", "internal_resolution_seed")
+        test_party = Party("内部解像度テストパーティ")
+        test_party.add_character(Character("内部解像度テストキャラ", "human", "fighter"))
+        dungeon_manager.enter_dungeon("internal_resolution_test", test_party)
+        
+        renderer = DungeonRendererPygame(config=RendererConfig(screen=ScreenConfig(render_scale=0.5)))
+        assert renderer.render_dungeon(dungeon_manager.current_dungeon), "レンダリングが失敗しました"
+        
+        # レイ数・描画先は内部解像度に従い、表示は画面サイズのまま
+        screen_width, screen_height = renderer.screen.get_size()
+        assert renderer.wall_renderer.screen.get_size() == (screen_width // 2, screen_height // 2)
+        assert len(renderer.depth_buffer) == renderer.config.raycast.calculate_ray_count(screen_width // 2)
+        assert renderer.wall_renderer.pixel_scale == 0.5
+        
+        # 壁の見かけの高さは表示解像度基準で変わらない
+        full_height = DungeonRendererPygame().wall_renderer.calculate_wall_height(3.0)
+        assert abs(renderer.wall_renderer.calculate_wall_height(3.0) * 2 - full_height) <= 1
 
 
 if __name__ == "__main__":
@@ -194,7 +352,7 @@ if __name__ == "__main__":
         
         print("\n=== すべてのテスト完了 ===")
         print("リファクタリングが正常に完了しました！")
-        
+    
     except Exception as e:
         print(f"テスト中にエラーが発生しました: {e}")
         import traceback
@@ -0,0 +1,53 @@
+"""魔法管理システムのテスト"""
+
+import pytest
+from src.magic.spells import SpellManager, SpellSchool
+
+
+class TestSpellManagerTables:
+    """SpellManagerの検索テーブルのテスト"""
+    
+    CLASSES = ["fighter", "mage", "priest", "thief", "bishop", "samurai", "lord", "ninja"]
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.manager = SpellManager()
+    
+    def test_level_and_school_tables_match_full_scan(self):
+        """レベル別・学派別テーブルが全件走査と一致することを確認"""
+        spells = list(self.manager.spells.values())
+        levels = {spell.level for spell in spells}
+        
+        for level in levels | {0, max(levels) + 1}:
+            expected = [spell for spell in spells if spell.level == level]
+            assert list(self.manager.get_spells_by_level(level)) == expected
+        
+        for school in SpellSchool:
+            expected = [spell for spell in spells if spell.school == school]
+            assert list(self.manager.get_spells_by_school(school)) == expected
+    
+    def test_class_tables_match_access_rules(self):
+        """クラス別テーブルがアクセス規則による判定と一致することを確認"""
+        spells = list(self.manager.spells.values())
+        
+        for character_class in self.CLASSES:
+            expected = [spell for spell in spells if spell.can_use_by_class(character_class)]
+            assert list(self.manager.get_spells_by_class(character_class)) == expected
+            
+            for character_level in range(-1, 12):
+                expected_learnable = [spell for spell in expected if spell.level <= character_level]
+                assert list(self.manager.get_learnable_spells(character_class, character_level)) == expected_learnable
+        
+        mage_spells = self.manager.get_spells_by_class("mage")
+        print(f"魔術師の使用可能魔法: {[spell.spell_id for spell in mage_spells]}")
+        assert len(mage_spells) > 0
+    
+    def test_tables_refreshed_on_reload(self):
+        """再読み込みでテーブルが作り直されることを確認"""
+        before = [spell.spell_id for spell in self.manager.get_spells_by_class("priest")]
+        
+        self.manager.reload_spells()
+        after = self.manager.get_spells_by_class("priest")
+        
+        assert [spell.spell_id for spell in after] == before
+        assert all(spell is self.manager.get_spell(spell.spell_id) for spell in after)
@@ -97,19 +97,19 @@ class TestSpellSlotManager:
     
     def test_get_available_spells_for_slot(self):
         """スロット用利用可能魔法取得のテスト"""
-        # 魔法書のlearned_spellsを設定
-        self.mock_spellbook.learned_spells = ["spell_1", "spell_2", "spell_3"]
+        # 魔法書のlearned_spellsを設定（fireball はレベル3、未定義の魔法は除外される）
+        self.mock_spellbook.learned_spells = ["fireball", "heal", "fire", "spell_unknown"]
         
         available_spells = self.slot_manager.get_available_spells_for_slot(
             self.mock_character, 2
         )
         
-        assert len(available_spells) == 3
+        # 習得順を保つ
+        assert [spell['spell_id'] for spell in available_spells] == ["heal", "fire"]
         for spell in available_spells:
-            assert 'spell_id' in spell
             assert 'name' in spell
-            assert 'level' in spell
-            assert 'can_equip' in spell
+            assert spell['level'] <= 2
+            assert spell['can_equip'] is True
     
     def test_add_operation_callback(self):
         """操作コールバック追加のテスト"""
@@ -1,5 +1,7 @@
 """ステータス効果システムのテスト"""
 
+import random
+
 import pytest
 from src.effects.status_effects import (
     StatusEffectType, StatusEffect, StatusEffectManager,
@@ -286,6 +288,70 @@ class TestStatusEffectManager:
         restored = StatusEffectManager.from_dict(data)
         assert restored.character_id == self.character.character_id
         assert restored.has_effect(StatusEffectType.POISON)
+    
+    def test_scheduler_matches_naive_processing(self):
+        """終了ヒープによるターン処理が全効果を毎ターン減算する素朴な処理と一致するテスト"""
+        rng = random.Random(36)
+        effect_classes = [PoisonEffect, ParalysisEffect, SleepEffect, RegenEffect,
+                          StrengthUpEffect, DefenseUpEffect]
+        # 効果種別 -> [残りターン, 強さ, 毎ターン処理の有無]
+        reference = {}
+        
+        for _ in range(400):
+            action = rng.random()
+            if action < 0.4:
+                effect = rng.choice(effect_classes)(duration=rng.randint(1, 6), strength=rng.randint(1, 4))
+                success, _ = self.manager.add_effect(effect, self.character)
+                existing = reference.get(effect.effect_type)
+                expected = existing is None or not (effect.duration <= existing[0] and effect.strength <= existing[1])
+                assert success == expected
+                if expected:
+                    reference[effect.effect_type] = [effect.duration, effect.strength, effect.has_turn_effect]
+            elif action < 0.5 and reference:
+                effect_type = rng.choice(list(reference))
+                success, _ = self.manager.remove_effect(effect_type, self.character)
+                assert success
+                del reference[effect_type]
+            elif action < 0.55 and reference:
+                # 残りターン数の直接変更も終了ターンに反映される
+                effect_type = rng.choice(list(reference))
+                new_duration = rng.randint(0, 4)
+                self.manager.get_effect(effect_type).duration = new_duration
+                reference[effect_type][0] = new_duration
+            else:
+                self.character.derived_stats.current_hp = self.character.derived_stats.max_hp
+                results = self.manager.process_turn(self.character)
+                expected_count = 0
+                for effect_type in list(reference):
+                    reference[effect_type][0] -= 1
+                    expected_count += reference[effect_type][2]
+                    if reference[effect_type][0] <= 0:
+                        expected_count += 1
+                        del reference[effect_type]
+                assert len(results) == expected_count
+            
+            assert {t: self.manager.get_effect(t).duration for t in self.manager.active_effects} == \
+                {t: values[0] for t, values in reference.items()}
+            
+            expected_modifiers = dict.fromkeys(self.manager.get_stat_modifiers(), 0)
+            if StatusEffectType.STRENGTH_UP in reference:
+                expected_modifiers['strength'] += reference[StatusEffectType.STRENGTH_UP][1]
+                expected_modifiers['attack'] += reference[StatusEffectType.STRENGTH_UP][1]
+            if StatusEffectType.DEFENSE_UP in reference:
+                expected_modifiers['defense'] += reference[StatusEffectType.DEFENSE_UP][1]
+            assert self.manager.get_stat_modifiers() == expected_modifiers
+    
+    def test_removed_effect_keeps_remaining_duration(self):
+        """除去後の効果は残りターン数を保持し、ターン経過の影響を受けないテスト"""
+        paralysis = ParalysisEffect(duration=3)
+        self.manager.add_effect(paralysis, self.character)
+        self.manager.process_turn(self.character)
+        self.manager.remove_effect(StatusEffectType.PARALYSIS, self.character)
+        
+        assert paralysis.duration == 2
+        assert self.manager.process_turn(self.character) == []
+        assert self.manager.process_turn(self.character) == []
+        assert paralysis.duration == 2
 
 
 class TestCharacterStatusEffectIntegration:
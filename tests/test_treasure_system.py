@@ -0,0 +1,101 @@
+"""宝箱システムのテスト"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.dungeon.treasure_system import TreasureSystem, TreasureType, LootDrop, get_loot_level_band
+from src.character.party import Party
+from src.items.item import ItemManager, ItemRarity
+
+
+class TestLootTables:
+    """戦利品テーブルのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.treasure_system = TreasureSystem()
+        self.item_manager = self.treasure_system.item_manager
+    
+    def test_loot_comes_from_catalog(self):
+        """戦利品がアイテム定義のIDと希少度を返すテスト"""
+        rng = random.Random(1)
+        for level in (1, 6, 12, 20):
+            for treasure_type in TreasureType:
+                drop = self.treasure_system.roll_loot(level, treasure_type, rng)
+                assert isinstance(drop, LootDrop)
+                item = self.item_manager.get_item(drop.item_id)
+                assert item is not None
+                assert drop.rarity == self.treasure_system.get_loot_rarity(item)
+    
+    def test_tables_compiled_once(self):
+        """戦利品テーブルが抽選ごとに作り直されないテスト"""
+        table = self.treasure_system.get_loot_table(1, TreasureType.WOODEN)
+        self.treasure_system.roll_loot(2, TreasureType.WOODEN)
+        
+        assert self.treasure_system.get_loot_table(4, TreasureType.WOODEN) is table
+        assert self.treasure_system.get_loot_table(5, TreasureType.WOODEN) is not table
+        assert len(self.treasure_system.loot_tables) == 5 * len(TreasureType)
+    
+    @pytest.mark.parametrize("level, treasure_type", [
+        (1, TreasureType.WOODEN), (1, TreasureType.MAGICAL), (10, TreasureType.METAL), (20, TreasureType.CURSED)
+    ])
+    def test_sampled_distribution_matches_weights(self, level, treasure_type):
+        """抽選した希少度・アイテムの頻度が設定された重みと一致するテスト"""
+        treasure_data = self.treasure_system.treasure_definitions[treasure_type]
+        rarity_weights = self.treasure_system.get_loot_rarity_weights(treasure_data, get_loot_level_band(level))
+        items_by_rarity = Counter(self.treasure_system.get_loot_rarity(item)
+                                  for item in self.item_manager.get_all_items())
+        available = {rarity: weight for rarity, weight in rarity_weights.items() if items_by_rarity[rarity]}
+        total = sum(available.values())
+        
+        rng = random.Random(2024)
+        samples = 60000
+        drops = [self.treasure_system.roll_loot(level, treasure_type, rng) for _ in range(samples)]
+        rarity_counts = Counter(drop.rarity for drop in drops)
+        item_counts = Counter(drop.item_id for drop in drops)
+        
+        assert set(rarity_counts) <= set(available)
+        for rarity, weight in available.items():
+            assert rarity_counts[rarity] / samples == pytest.approx(weight / total, abs=0.01)
+        
+        # 同じ希少度のアイテムは均等に選ばれる
+        for item in self.item_manager.get_all_items():
+            rarity = self.treasure_system.get_loot_rarity(item)
+            if rarity in available:
+                expected = available[rarity] / total / items_by_rarity[rarity]
+                assert item_counts[item.item_id] / samples == pytest.approx(expected, abs=0.01)
+    
+    def test_deeper_levels_favor_rarer_loot(self):
+        """深い階層帯ほど希少なアイテムの重みが増えるテスト"""
+        treasure_data = self.treasure_system.treasure_definitions[TreasureType.MAGICAL]
+        shallow = self.treasure_system.get_loot_rarity_weights(treasure_data, 0)
+        deep = self.treasure_system.get_loot_rarity_weights(treasure_data, 4)
+        
+        assert deep[ItemRarity.COMMON] == shallow[ItemRarity.COMMON]
+        assert deep[ItemRarity.RARE] > shallow[ItemRarity.RARE]
+    
+    def test_open_treasure_is_deterministic(self):
+        """同じ乱数生成器なら宝箱の中身が同じになるテスト"""
+        results = []
+        for _ in range(2):
+            party = Party(name="LootParty")
+            result = TreasureSystem().open_treasure(
+                "chest_1", TreasureType.METAL, party, dungeon_level=6, rng=random.Random(3)
+            )
+            assert result["success"]
+            results.append((result["gold"], result["loot"], party.gold))
+        
+        assert results[0] == results[1]
+        assert results[0][1]
+    
+    def test_tables_rebuilt_on_item_reload(self):
+        """アイテム定義の再読み込みで戦利品テーブルが構築し直されるテスト"""
+        items = ItemManager()
+        treasure_system = TreasureSystem(item_manager=items)
+        table = treasure_system.get_loot_table(1, TreasureType.WOODEN)
+        
+        items.reload_items()
+        
+        assert treasure_system.get_loot_table(1, TreasureType.WOODEN) is not table
@@ -0,0 +1,40 @@
+"""素集合データ構造のテスト"""
+
+import random
+
+from src.utils.union_find import UnionFind
+
+
+class TestUnionFind:
+    """素集合データ構造のテスト"""
+    
+    def test_union_and_find(self):
+        """併合した要素が同じ集合になるテスト"""
+        components = UnionFind(range(6))
+        
+        assert components.union(0, 1)
+        assert components.union(2, 3)
+        assert not components.union(1, 0)
+        assert components.connected(0, 1)
+        assert not components.connected(1, 2)
+        
+        components.union(1, 3)
+        assert components.connected(0, 2)
+        assert components.size(3) == 4
+        assert components.size(5) == 1
+        assert len(components) == 6
+    
+    def test_matches_naive_labels(self):
+        """ランダムな併合の結果が素朴なラベル付けと一致するテスト"""
+        rng = random.Random(5)
+        components = UnionFind()
+        labels = {item: item for item in range(50)}
+        for _ in range(40):
+            a, b = rng.randrange(50), rng.randrange(50)
+            components.union(a, b)
+            old_label, new_label = labels[a], labels[b]
+            labels = {item: new_label if label == old_label else label for item, label in labels.items()}
+        
+        for a in range(50):
+            for b in range(50):
+                assert components.connected(a, b) == (labels[a] == labels[b])
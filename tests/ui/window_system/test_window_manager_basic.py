@@ -266,4 +266,69 @@ class TestWindowManagerUtilities:
         self.window_manager.shutdown()
         
         # シングルトンインスタンスがクリアされることを確認
-        assert WindowManager._instance is None
\ No newline at end of file
+        assert WindowManager._instance is None
+
+class TestWindowManagerDirtyRects:
+    """WindowManagerの差分描画（ダーティ矩形）テスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前処理"""
+        import pygame
+        import pygame_gui
+        
+        WindowManager._instance = None
+        pygame.init()
+        self.screen = pygame.display.set_mode((320, 240))
+        self.window_manager = WindowManager()
+        self.window_manager.ui_manager = pygame_gui.UIManager((320, 240))
+    
+    def teardown_method(self):
+        """各テストメソッドの後処理"""
+        WindowManager._instance = None
+    
+    def test_first_frame_requires_full_redraw(self):
+        """初回描画は全画面更新になる"""
+        self.window_manager.draw(self.screen)
+        assert self.window_manager.consume_dirty_rects() is None
+    
+    def test_static_frame_has_no_dirty_rects(self):
+        """変化のないフレームでは転送領域がない"""
+        import pygame
+        import pygame_gui
+        
+        pygame_gui.elements.UIButton(pygame.Rect(10, 10, 100, 30), "OK", manager=self.window_manager.ui_manager)
+        self.window_manager.draw(self.screen)
+        self.window_manager.consume_dirty_rects()
+        
+        self.window_manager.draw(self.screen)
+        assert self.window_manager.consume_dirty_rects() == []
+    
+    def test_ui_element_change_marks_its_rect(self):
+        """UI要素の変化はその領域だけがダーティになる"""
+        import pygame
+        import pygame_gui
+        
+        button = pygame_gui.elements.UIButton(pygame.Rect(10, 10, 100, 30), "OK", manager=self.window_manager.ui_manager)
+        self.window_manager.draw(self.screen)
+        self.window_manager.consume_dirty_rects()
+        
+        button.set_text("Changed")
+        self.window_manager.ui_manager.update(0.01)
+        self.window_manager.draw(self.screen)
+        rects = self.window_manager.consume_dirty_rects()
+        assert rects, "変化した要素の領域が検出されていません"
+        assert all(button.rect.contains(rect) for rect in rects)
+    
+    def test_explicit_dirty_rect_and_full_redraw(self):
+        """明示的なダーティ指定と全画面更新要求"""
+        import pygame
+        
+        self.window_manager.draw(self.screen)
+        self.window_manager.consume_dirty_rects()
+        
+        self.window_manager.mark_dirty(pygame.Rect(0, 0, 20, 20))
+        assert self.window_manager.consume_dirty_rects() == [pygame.Rect(0, 0, 20, 20)]
+        
+        self.window_manager.mark_dirty(pygame.Rect(0, 0, 20, 20))
+        self.window_manager.request_full_redraw()
+        assert self.window_manager.consume_dirty_rects() is None